@@ -1,18 +1,45 @@
 import pygame
 import sys
 import random
-<<<<<<< HEAD
 import os
-=======
->>>>>>> 454549a (se cambio por el juego de mario)
+import argparse
+import zlib
+from bisect import bisect_left, bisect_right
+from array import array
 
-# Inicializar Pygame
-pygame.init()
+from src.core import entrada as ent
+from src.core import eventos as ev
+from src.core.almacen_entidades import AlmacenNivel
+from src.core.barrido import barrer, desplazamiento, solapa
+from src.core.capa_plataformas import CapaPlataformas
+from src.core.escenas import Escena
+from src.core.parallax import obtener_fondo
+from src.core.cargador_niveles import cargar_nivel, contar_niveles
+from src.core.rejilla import RejillaEspacial
+from src.core.streaming import GestorChunks
+from src.core.repeticion import DivergenciaRepeticion, Grabador, Repeticion, Reproductor, verificar
+from src.entities.entidad import Entidad
+from src.utils.cache_sprites import MARGEN_SPRITE, cache_sprites
+from src.utils.mascaras import cache_mascaras
+from src.utils.particulas import SistemaParticulas
+from src.utils.perfilador import Perfilador
+from src.utils.recursos import GestorRecursos
+from src.utils.fuentes import fuentes
+from src.utils.sonidos import BancoSonidos
+from src.utils.texto import BarraHUD, cache_texto
 
 # Constantes
 ANCHO = 800
 ALTO = 600
 FPS = 60
+# Duración de un tick de simulación en milisegundos
+PASO_MS = 1000 / FPS
+# Ticks máximos por frame para no entrar en espiral si el render se atrasa
+MAX_PASOS_FRAME = 5
+# Refresco de las pantallas estáticas (menú, pausa, game over) sin cambios
+FPS_REPOSO = 10
+# Pista de música de los niveles, en la carpeta de sonidos
+MUSICA_NIVEL = 'nivel.mp3'
 GRAVEDAD = 0.8
 VELOCIDAD_JUGADOR = 5
 FUERZA_SALTO = 15
@@ -29,13 +56,22 @@ VERDE = (0, 200, 0)
 NARANJA = (255, 140, 0)
 VERDE_TUBO = (0, 168, 0)
 
-# Configurar ventana
-pantalla = pygame.display.set_mode((ANCHO, ALTO))
-pygame.display.set_caption("Super Mario Bros 2005")
-reloj = pygame.time.Clock()
+def iniciar_video():
+    # Abre la ventana la primera vez y devuelve su superficie. Importar este
+    # módulo no inicializa pygame: la simulación y las herramientas sin ventana
+    # no lo necesitan, y el mezclador y las fuentes se inician al usarse
+    pantalla = pygame.display.get_surface()
+    if pantalla is None:
+        pygame.display.init()
+        pantalla = pygame.display.set_mode((ANCHO, ALTO))
+        pygame.display.set_caption("Super Mario Bros 2005")
+    return pantalla
 
 class Camara:
     def __init__(self, ancho_mapa):
+        self.reiniciar(ancho_mapa)
+        
+    def reiniciar(self, ancho_mapa):
         self.x = 0
         self.ancho_mapa = ancho_mapa
         
@@ -49,12 +85,19 @@ class Camara:
         if self.x > self.ancho_mapa - ANCHO:
             self.x = self.ancho_mapa - ANCHO
 
-class Mario(pygame.sprite.Sprite):
+class Mario(Entidad):
+    __slots__ = ('ancho', 'alto', 'velocidad_x', 'velocidad_y', 'saltando', 'direccion', 'vivo',
+                 'invencible', 'grande', 'tiene_flor', 'animacion_frame', 'animacion_contador')
+    
     def __init__(self, x, y):
-        super().__init__()
+        self.rect = pygame.Rect(x, y, 32, 32)
+        self.reiniciar(x, y)
+        
+    def reiniciar(self, x, y):
+        # Vuelve al estado inicial en el sitio, sin crear objetos nuevos
         self.ancho = 32
         self.alto = 32
-        self.rect = pygame.Rect(x, y, self.ancho, self.alto)
+        self.rect.update(x, y, self.ancho, self.alto)
         self.velocidad_x = 0
         self.velocidad_y = 0
         self.saltando = False
@@ -66,7 +109,7 @@ class Mario(pygame.sprite.Sprite):
         self.animacion_frame = 0
         self.animacion_contador = 0
         
-    def update(self, plataformas):
+    def update(self, rejilla, entrada, eventos=None):
         if not self.vivo:
             return
             
@@ -86,24 +129,37 @@ class Mario(pygame.sprite.Sprite):
             self.velocidad_y = 15
             
         # Movimiento horizontal
-        teclas = pygame.key.get_pressed()
         self.velocidad_x = 0
-        if teclas[pygame.K_LEFT] or teclas[pygame.K_a]:
+        if entrada & ent.IZQUIERDA:
             self.velocidad_x = -VELOCIDAD_JUGADOR
             self.direccion = 'izquierda'
-        elif teclas[pygame.K_RIGHT] or teclas[pygame.K_d]:
+        elif entrada & ent.DERECHA:
             self.velocidad_x = VELOCIDAD_JUGADOR
             self.direccion = 'derecha'
             
-        # Actualizar posición
-        self.rect.x += self.velocidad_x
-        self.colision_horizontal(plataformas)
+        # Sólo las plataformas que puede tocar durante este tick
+        plataformas = rejilla.consultar_barrido(self.rect, self.velocidad_x, self.velocidad_y)
+            
+        # Actualizar posición: cada eje se barre hasta el primer contacto, así
+        # que ninguna velocidad atraviesa una plataforma
+        if solapa(self.rect, plataformas):
+            # Ya estaba dentro (al crecer bajo un bloque, por ejemplo)
+            self.rect.x += self.velocidad_x
+            self.colision_horizontal(plataformas)
+        else:
+            barrer(self.rect, desplazamiento(self.rect.x, self.velocidad_x), 0, plataformas)
         
-        self.rect.y += self.velocidad_y
         self.saltando = True
-        self.colision_vertical(plataformas)
+        if solapa(self.rect, plataformas):
+            self.rect.y += self.velocidad_y
+            self.colision_vertical(plataformas, eventos)
+        else:
+            impacto = barrer(self.rect, 0, desplazamiento(self.rect.y, self.velocidad_y), plataformas)
+            if impacto is not None:
+                self.choque_vertical(impacto.obstaculo, eventos)
             
     def colision_horizontal(self, plataformas):
+        # Resolución discreta, sólo para cuando ya se empieza solapando
         for plataforma in plataformas:
             if self.rect.colliderect(plataforma.rect):
                 if self.velocidad_x > 0:
@@ -111,23 +167,30 @@ class Mario(pygame.sprite.Sprite):
                 elif self.velocidad_x < 0:
                     self.rect.left = plataforma.rect.right
                     
-    def colision_vertical(self, plataformas):
+    def colision_vertical(self, plataformas, eventos=None):
         for plataforma in plataformas:
             if self.rect.colliderect(plataforma.rect):
-                if self.velocidad_y > 0:
-                    self.rect.bottom = plataforma.rect.top
-                    self.velocidad_y = 0
-                    self.saltando = False
-                elif self.velocidad_y < 0:
-                    self.rect.top = plataforma.rect.bottom
-                    self.velocidad_y = 0
-                    if hasattr(plataforma, 'tipo') and plataforma.tipo == 'bloque':
-                        plataforma.golpeado = True
+                self.choque_vertical(plataforma, eventos)
+                        
+    def choque_vertical(self, plataforma, eventos=None):
+        if self.velocidad_y > 0:
+            self.rect.bottom = plataforma.rect.top
+            self.velocidad_y = 0
+            self.saltando = False
+        elif self.velocidad_y < 0:
+            self.rect.top = plataforma.rect.bottom
+            self.velocidad_y = 0
+            # El bloque se resuelve después, con el resto de eventos del tick
+            if eventos is not None and plataforma.tipo == 'bloque':
+                eventos.append((ev.BLOQUE_GOLPEADO, plataforma))
                         
     def saltar(self):
+        # Devuelve si ha empezado un salto (para emitir su evento)
         if not self.saltando and self.vivo:
             self.velocidad_y = -FUERZA_SALTO
             self.saltando = True
+            return True
+        return False
             
     def crecer(self):
         if not self.grande:
@@ -158,7 +221,14 @@ class Mario(pygame.sprite.Sprite):
             self.vivo = False
             return True
             
-    def dibujar(self, superficie):
+    def clave_sprite(self):
+        moviendo = self.velocidad_x != 0
+        # El fotograma y el salto sólo cambian el dibujo al caminar
+        frame = self.animacion_frame % 2 if moviendo else 0
+        return ('mario', self.direccion, self.grande, self.tiene_flor, self.rect.height,
+                moviendo, moviendo and self.saltando, frame)
+            
+    def dibujar(self, superficie, desplazamiento_x=0):
         if not self.vivo:
             return
             
@@ -166,6 +236,15 @@ class Mario(pygame.sprite.Sprite):
         if self.invencible > 0 and self.invencible % 10 < 5:
             return
             
+        sprite = cache_sprites.obtener(self.clave_sprite(),
+                                       (self.ancho + 2 * MARGEN_SPRITE, self.rect.height + 2 * MARGEN_SPRITE),
+                                       self.rasterizar)
+        return superficie.blit(sprite, (self.rect.x - desplazamiento_x - MARGEN_SPRITE, self.rect.y - MARGEN_SPRITE))
+        
+    def rasterizar(self, superficie):
+        # Dibuja el estado actual con la esquina del rect en (MARGEN_SPRITE, MARGEN_SPRITE)
+        x = y = MARGEN_SPRITE
+        abajo = y + self.rect.height
         alto_actual = self.alto
         
         # Color base
@@ -175,132 +254,145 @@ class Mario(pygame.sprite.Sprite):
             
         # Gorra
         pygame.draw.rect(superficie, color_ropa, 
-                        (self.rect.x + 4, self.rect.y, 24, 10))
+                        (x + 4, y, 24, 10))
         # Logo M
         pygame.draw.circle(superficie, BLANCO, 
-                          (self.rect.x + 16, self.rect.y + 5), 4)
+                          (x + 16, y + 5), 4)
         
         # Cabello
         pygame.draw.rect(superficie, MARRON, 
-                        (self.rect.x + 2, self.rect.y + 8, 28, 4))
+                        (x + 2, y + 8, 28, 4))
         
         # Cara
-        cara_y = self.rect.y + 12
+        cara_y = y + 12
         pygame.draw.rect(superficie, (255, 220, 177), 
-                        (self.rect.x + 4, cara_y, 24, 16))
+                        (x + 4, cara_y, 24, 16))
         
         # Ojos
         if self.direccion == 'derecha':
             pygame.draw.circle(superficie, NEGRO, 
-                             (self.rect.x + 18, cara_y + 6), 2)
+                             (x + 18, cara_y + 6), 2)
         else:
             pygame.draw.circle(superficie, NEGRO, 
-                             (self.rect.x + 14, cara_y + 6), 2)
+                             (x + 14, cara_y + 6), 2)
         
         # Bigote
         pygame.draw.rect(superficie, MARRON, 
-                        (self.rect.x + 8, cara_y + 10, 16, 4))
+                        (x + 8, cara_y + 10, 16, 4))
         
         # Camisa
-        cuerpo_y = self.rect.y + 28
+        cuerpo_y = y + 28
         pygame.draw.rect(superficie, color_ropa, 
-                        (self.rect.x + 4, cuerpo_y, 24, 12 if not self.grande else 20))
+                        (x + 4, cuerpo_y, 24, 12 if not self.grande else 20))
         
         # Botones
         for i in range(2 if not self.grande else 3):
             pygame.draw.circle(superficie, AMARILLO, 
-                             (self.rect.x + 16, cuerpo_y + 4 + i * 6), 2)
+                             (x + 16, cuerpo_y + 4 + i * 6), 2)
         
         # Overol
         overol_y = cuerpo_y + 8
         pygame.draw.rect(superficie, AZUL, 
-                        (self.rect.x + 8, overol_y, 16, 12 if not self.grande else 20))
+                        (x + 8, overol_y, 16, 12 if not self.grande else 20))
         
         # Brazos (animación de caminar)
         if abs(self.velocidad_x) > 0:
             offset = 2 if self.animacion_frame % 2 == 0 else -2
             pygame.draw.rect(superficie, (255, 220, 177), 
-                           (self.rect.x + 2, cuerpo_y + offset, 6, 12))
+                           (x + 2, cuerpo_y + offset, 6, 12))
             pygame.draw.rect(superficie, (255, 220, 177), 
-                           (self.rect.x + 24, cuerpo_y - offset, 6, 12))
+                           (x + 24, cuerpo_y - offset, 6, 12))
         else:
             pygame.draw.rect(superficie, (255, 220, 177), 
-                           (self.rect.x + 2, cuerpo_y, 6, 12))
+                           (x + 2, cuerpo_y, 6, 12))
             pygame.draw.rect(superficie, (255, 220, 177), 
-                           (self.rect.x + 24, cuerpo_y, 6, 12))
+                           (x + 24, cuerpo_y, 6, 12))
         
         # Piernas
-        piernas_y = self.rect.bottom - 12
+        piernas_y = abajo - 12
         if abs(self.velocidad_x) > 0 and not self.saltando:
             # Animación de caminar
             if self.animacion_frame % 2 == 0:
                 pygame.draw.rect(superficie, AZUL, 
-                               (self.rect.x + 8, piernas_y, 6, 12))
+                               (x + 8, piernas_y, 6, 12))
                 pygame.draw.rect(superficie, AZUL, 
-                               (self.rect.x + 18, piernas_y - 2, 6, 12))
+                               (x + 18, piernas_y - 2, 6, 12))
             else:
                 pygame.draw.rect(superficie, AZUL, 
-                               (self.rect.x + 8, piernas_y - 2, 6, 12))
+                               (x + 8, piernas_y - 2, 6, 12))
                 pygame.draw.rect(superficie, AZUL, 
-                               (self.rect.x + 18, piernas_y, 6, 12))
+                               (x + 18, piernas_y, 6, 12))
         else:
             pygame.draw.rect(superficie, AZUL, 
-                           (self.rect.x + 8, piernas_y, 6, 12))
+                           (x + 8, piernas_y, 6, 12))
             pygame.draw.rect(superficie, AZUL, 
-                           (self.rect.x + 18, piernas_y, 6, 12))
+                           (x + 18, piernas_y, 6, 12))
         
         # Zapatos
         pygame.draw.rect(superficie, MARRON, 
-                        (self.rect.x + 4, self.rect.bottom - 4, 10, 4))
+                        (x + 4, abajo - 4, 10, 4))
         pygame.draw.rect(superficie, MARRON, 
-                        (self.rect.x + 18, self.rect.bottom - 4, 10, 4))
+                        (x + 18, abajo - 4, 10, 4))
 
-class Plataforma(pygame.sprite.Sprite):
+class Plataforma(Entidad):
+    __slots__ = ('tipo', 'golpeado')
+    
     def __init__(self, x, y, ancho, alto, tipo='normal'):
-        super().__init__()
         self.rect = pygame.Rect(x, y, ancho, alto)
         self.tipo = tipo
         self.golpeado = False
         
-    def dibujar(self, superficie):
+    def dibujar(self, superficie, desplazamiento_x=0):
+        x = self.rect.x - desplazamiento_x
+        y = self.rect.y
+        ancho = self.rect.width
+        alto = self.rect.height
+        
         if self.tipo == 'suelo':
             # Césped
-            pygame.draw.rect(superficie, VERDE, self.rect)
+            pygame.draw.rect(superficie, VERDE, (x, y, ancho, alto))
             pygame.draw.rect(superficie, MARRON, 
-                           (self.rect.x, self.rect.y + 10, self.rect.width, self.rect.height - 10))
+                           (x, y + 10, ancho, alto - 10))
         elif self.tipo == 'bloque':
             # Bloque de ladrillos
             color = NARANJA if not self.golpeado else (150, 150, 150)
-            pygame.draw.rect(superficie, color, self.rect)
-            for i in range(0, self.rect.width, 20):
-                for j in range(0, self.rect.height, 20):
+            pygame.draw.rect(superficie, color, (x, y, ancho, alto))
+            for i in range(0, ancho, 20):
+                for j in range(0, alto, 20):
                     pygame.draw.rect(superficie, MARRON, 
-                                   (self.rect.x + i, self.rect.y + j, 20, 20), 1)
+                                   (x + i, y + j, 20, 20), 1)
         elif self.tipo == 'tubo':
             # Tubo
-            pygame.draw.rect(superficie, VERDE_TUBO, self.rect)
-            pygame.draw.rect(superficie, (0, 100, 0), self.rect, 3)
+            pygame.draw.rect(superficie, VERDE_TUBO, (x, y, ancho, alto))
+            pygame.draw.rect(superficie, (0, 100, 0), (x, y, ancho, alto), 3)
             # Borde superior
             pygame.draw.rect(superficie, VERDE_TUBO, 
-                           (self.rect.x - 4, self.rect.y - 4, self.rect.width + 8, 8))
+                           (x - 4, y - 4, ancho + 8, 8))
         else:
-            pygame.draw.rect(superficie, MARRON, self.rect)
-            pygame.draw.rect(superficie, (101, 67, 33), self.rect, 2)
+            pygame.draw.rect(superficie, MARRON, (x, y, ancho, alto))
+            pygame.draw.rect(superficie, (101, 67, 33), (x, y, ancho, alto), 2)
 
-class Enemigo(pygame.sprite.Sprite):
+class Enemigo(Entidad):
+    __slots__ = ('tipo', 'ancho', 'alto', 'velocidad_x', 'vivo', 'aplastado',
+                 'animacion_frame', 'animacion_contador')
+    
     def __init__(self, x, y, tipo='goomba'):
-        super().__init__()
         self.tipo = tipo
+        self.rect = pygame.Rect(x, y, 0, 0)
+        self.reiniciar(x, y)
+        
+    def reiniciar(self, x, y):
+        tipo = self.tipo
         self.ancho = 30 if tipo == 'goomba' else 32
         self.alto = 30 if tipo == 'goomba' else 40
-        self.rect = pygame.Rect(x, y, self.ancho, self.alto)
+        self.rect.update(x, y, self.ancho, self.alto)
         self.velocidad_x = -2 if tipo == 'goomba' else -1
         self.vivo = True
         self.aplastado = False
         self.animacion_frame = 0
         self.animacion_contador = 0
         
-    def update(self, plataformas):
+    def update(self, rejilla):
         if not self.vivo:
             return
             
@@ -312,6 +404,7 @@ class Enemigo(pygame.sprite.Sprite):
             self.animacion_frame = (self.animacion_frame + 1) % 2
             self.animacion_contador = 0
             
+        plataformas = rejilla.consultar_barrido(self.rect, self.velocidad_x, 0)
         self.rect.x += self.velocidad_x
         
         # Colisión con plataformas
@@ -329,85 +422,125 @@ class Enemigo(pygame.sprite.Sprite):
         self.alto = 10
         self.rect.height = 10
         
-    def dibujar(self, superficie):
+    def clave_sprite(self):
+        return ('enemigo', self.tipo, self.aplastado, self.animacion_frame,
+                self.rect.width, self.rect.height)
+        
+    def dibujar(self, superficie, desplazamiento_x=0):
         if not self.vivo:
             return
             
+        sprite = cache_sprites.obtener(self.clave_sprite(),
+                                       (self.rect.width + 2 * MARGEN_SPRITE, self.rect.height + 2 * MARGEN_SPRITE),
+                                       self.rasterizar)
+        return superficie.blit(sprite, (self.rect.x - desplazamiento_x - MARGEN_SPRITE, self.rect.y - MARGEN_SPRITE))
+        
+    def rasterizar(self, superficie):
+        x = y = MARGEN_SPRITE
+        abajo = y + self.rect.height
+        
         if self.tipo == 'goomba':
             if self.aplastado:
-                pygame.draw.ellipse(superficie, MARRON, self.rect)
+                pygame.draw.ellipse(superficie, MARRON, (x, y, self.rect.width, self.rect.height))
             else:
                 # Cuerpo
                 pygame.draw.rect(superficie, MARRON, 
-                               (self.rect.x, self.rect.y + 5, self.ancho, self.alto - 10))
+                               (x, y + 5, self.ancho, self.alto - 10))
                 # Cabeza
                 pygame.draw.ellipse(superficie, MARRON, 
-                                  (self.rect.x, self.rect.y, self.ancho, 15))
+                                  (x, y, self.ancho, 15))
                 # Ojos
                 pygame.draw.circle(superficie, BLANCO, 
-                                 (self.rect.x + 10, self.rect.y + 6), 4)
+                                 (x + 10, y + 6), 4)
                 pygame.draw.circle(superficie, BLANCO, 
-                                 (self.rect.x + 20, self.rect.y + 6), 4)
+                                 (x + 20, y + 6), 4)
                 pygame.draw.circle(superficie, NEGRO, 
-                                 (self.rect.x + 10, self.rect.y + 6), 2)
+                                 (x + 10, y + 6), 2)
                 pygame.draw.circle(superficie, NEGRO, 
-                                 (self.rect.x + 20, self.rect.y + 6), 2)
+                                 (x + 20, y + 6), 2)
                 # Ceño
                 pygame.draw.line(superficie, NEGRO, 
-                               (self.rect.x + 5, self.rect.y + 3),
-                               (self.rect.x + 25, self.rect.y + 3), 2)
+                               (x + 5, y + 3),
+                               (x + 25, y + 3), 2)
                 # Pies
                 offset = 2 if self.animacion_frame == 0 else -2
                 pygame.draw.ellipse(superficie, MARRON, 
-                                  (self.rect.x - 5 + offset, self.rect.bottom - 5, 12, 8))
+                                  (x - 5 + offset, abajo - 5, 12, 8))
                 pygame.draw.ellipse(superficie, MARRON, 
-                                  (self.rect.x + 23 - offset, self.rect.bottom - 5, 12, 8))
+                                  (x + 23 - offset, abajo - 5, 12, 8))
         
         elif self.tipo == 'koopa':
             # Caparazón
             pygame.draw.ellipse(superficie, VERDE, 
-                              (self.rect.x, self.rect.y + 15, self.ancho, 25))
+                              (x, y + 15, self.ancho, 25))
             # Patrón del caparazón
             for i in range(3):
                 pygame.draw.circle(superficie, AMARILLO, 
-                                 (self.rect.x + 8 + i * 8, self.rect.y + 27), 3)
+                                 (x + 8 + i * 8, y + 27), 3)
             # Cabeza
             pygame.draw.ellipse(superficie, AMARILLO, 
-                              (self.rect.x + 6, self.rect.y, 20, 20))
+                              (x + 6, y, 20, 20))
             # Ojos
             pygame.draw.circle(superficie, BLANCO, 
-                             (self.rect.x + 12, self.rect.y + 8), 3)
+                             (x + 12, y + 8), 3)
             pygame.draw.circle(superficie, BLANCO, 
-                             (self.rect.x + 20, self.rect.y + 8), 3)
+                             (x + 20, y + 8), 3)
             pygame.draw.circle(superficie, NEGRO, 
-                             (self.rect.x + 12, self.rect.y + 8), 1)
+                             (x + 12, y + 8), 1)
             pygame.draw.circle(superficie, NEGRO, 
-                             (self.rect.x + 20, self.rect.y + 8), 1)
+                             (x + 20, y + 8), 1)
             # Pies
             offset = 2 if self.animacion_frame == 0 else -2
             pygame.draw.rect(superficie, AMARILLO, 
-                           (self.rect.x + 4 + offset, self.rect.bottom - 8, 8, 8))
+                           (x + 4 + offset, abajo - 8, 8, 8))
             pygame.draw.rect(superficie, AMARILLO, 
-                           (self.rect.x + 20 - offset, self.rect.bottom - 8, 8, 8))
+                           (x + 20 - offset, abajo - 8, 8, 8))
 
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(Entidad):
+    __slots__ = ('tipo', 'velocidad_x', 'velocidad_y', 'activo')
+    
     def __init__(self, x, y, tipo='hongo'):
-        super().__init__()
         self.tipo = tipo
         self.rect = pygame.Rect(x, y, 24, 24)
+        self.reiniciar(x, y)
+        
+    def reiniciar(self, x, y):
+        self.rect.update(x, y, 24, 24)
         self.velocidad_x = 2
         self.velocidad_y = 0
         self.activo = False
         
-    def update(self, plataformas):
+    def update(self, rejilla):
         if not self.activo:
             return
             
         self.velocidad_y += GRAVEDAD
-        self.rect.x += self.velocidad_x
-        self.rect.y += self.velocidad_y
+        plataformas = rejilla.consultar_barrido(self.rect, self.velocidad_x, self.velocidad_y)
+        dx = desplazamiento(self.rect.x, self.velocidad_x)
+        dy = desplazamiento(self.rect.y, self.velocidad_y)
+        if solapa(self.rect, plataformas):
+            # Ya estaba dentro de una plataforma (al salir del bloque)
+            self.rect.move_ip(dx, dy)
+            self.colision_discreta(plataformas)
+            return
         
-        # Colisión con plataformas
+        # Primer contacto y, con lo que quede del movimiento, deslizamiento por
+        # la superficie; las dos pasadas usan las mismas candidatas
+        for _ in range(2):
+            x, y = self.rect.topleft
+            impacto = barrer(self.rect, dx, dy, plataformas)
+            if impacto is None:
+                break
+            dx -= self.rect.x - x
+            dy -= self.rect.y - y
+            if impacto.normal_y:
+                self.velocidad_y = 0
+                dy = 0
+            else:
+                self.velocidad_x *= -1
+                dx = 0
+                    
+    def colision_discreta(self, plataformas):
         for plataforma in plataformas:
             if self.rect.colliderect(plataforma.rect):
                 if self.velocidad_y > 0:
@@ -424,45 +557,61 @@ class PowerUp(pygame.sprite.Sprite):
         self.activo = True
         self.velocidad_y = -5
         
-    def dibujar(self, superficie):
+    def clave_sprite(self):
+        return ('powerup', self.tipo)
+        
+    def dibujar(self, superficie, desplazamiento_x=0):
         if not self.activo:
             return
             
+        sprite = cache_sprites.obtener(self.clave_sprite(),
+                                       (self.rect.width + 2 * MARGEN_SPRITE, self.rect.height + 2 * MARGEN_SPRITE),
+                                       self.rasterizar)
+        return superficie.blit(sprite, (self.rect.x - desplazamiento_x - MARGEN_SPRITE, self.rect.y - MARGEN_SPRITE))
+        
+    def rasterizar(self, superficie):
+        x = y = MARGEN_SPRITE
+        
         if self.tipo == 'hongo':
             # Tallo
             pygame.draw.rect(superficie, BLANCO, 
-                           (self.rect.x + 8, self.rect.y + 12, 8, 12))
+                           (x + 8, y + 12, 8, 12))
             # Cabeza
             pygame.draw.ellipse(superficie, ROJO, 
-                              (self.rect.x, self.rect.y, 24, 16))
+                              (x, y, 24, 16))
             # Puntos blancos
             pygame.draw.circle(superficie, BLANCO, 
-                             (self.rect.x + 6, self.rect.y + 6), 3)
+                             (x + 6, y + 6), 3)
             pygame.draw.circle(superficie, BLANCO, 
-                             (self.rect.x + 18, self.rect.y + 6), 3)
+                             (x + 18, y + 6), 3)
             pygame.draw.circle(superficie, BLANCO, 
-                             (self.rect.x + 12, self.rect.y + 10), 2)
+                             (x + 12, y + 10), 2)
         
         elif self.tipo == 'flor':
             # Tallo
             pygame.draw.rect(superficie, VERDE, 
-                           (self.rect.x + 10, self.rect.y + 8, 4, 16))
+                           (x + 10, y + 8, 4, 16))
             # Pétalos
             colores = [ROJO, AMARILLO, ROJO, AMARILLO]
             for i, color in enumerate(colores):
                 offset_x = [8, 0, -8, 0][i]
                 offset_y = [0, -8, 0, 8][i]
                 pygame.draw.circle(superficie, color, 
-                                 (self.rect.x + 12 + offset_x, 
-                                  self.rect.y + 8 + offset_y), 5)
+                                 (x + 12 + offset_x, 
+                                  y + 8 + offset_y), 5)
             # Centro
             pygame.draw.circle(superficie, NARANJA, 
-                             (self.rect.x + 12, self.rect.y + 8), 4)
+                             (x + 12, y + 8), 4)
 
-class Moneda(pygame.sprite.Sprite):
+class Moneda(Entidad):
+    __slots__ = ('animacion_frame', 'animacion_contador')
+    
     def __init__(self, x, y):
-        super().__init__()
         self.rect = pygame.Rect(x, y, 20, 20)
+        self.reiniciar(x, y)
+        
+    def reiniciar(self, x, y):
+        self.rect.update(x, y, 20, 20)
         self.animacion_frame = 0
         self.animacion_contador = 0
         
@@ -472,36 +621,71 @@ class Moneda(pygame.sprite.Sprite):
             self.animacion_frame = (self.animacion_frame + 1) % 4
             self.animacion_contador = 0
         
-    def dibujar(self, superficie):
+    def clave_sprite(self):
+        return ('moneda', self.animacion_frame)
+        
+    def dibujar(self, superficie, desplazamiento_x=0):
+        sprite = cache_sprites.obtener(self.clave_sprite(),
+                                       (self.rect.width + 2 * MARGEN_SPRITE, self.rect.height + 2 * MARGEN_SPRITE),
+                                       self.rasterizar)
+        return superficie.blit(sprite, (self.rect.x - desplazamiento_x - MARGEN_SPRITE, self.rect.y - MARGEN_SPRITE))
+        
+    def rasterizar(self, superficie):
+        x = y = MARGEN_SPRITE
+        
         # Efecto de rotación
         ancho = 20 - abs(self.animacion_frame - 2) * 5
         pygame.draw.ellipse(superficie, AMARILLO, 
-                          (self.rect.x + (20 - ancho) // 2, self.rect.y, ancho, 20))
+                          (x + (20 - ancho) // 2, y, ancho, 20))
         pygame.draw.ellipse(superficie, NARANJA, 
-                          (self.rect.x + (20 - ancho) // 2, self.rect.y, ancho, 20), 2)
+                          (x + (20 - ancho) // 2, y, ancho, 20), 2)
 
-class Bandera(pygame.sprite.Sprite):
+class Bandera(Entidad):
+    __slots__ = ()
+    
     def __init__(self, x, y):
-        super().__init__()
         self.rect = pygame.Rect(x, y, 40, 200)
         
-    def dibujar(self, superficie):
+    def dibujar(self, superficie, desplazamiento_x=0):
+        x = self.rect.x - desplazamiento_x
+        y = self.rect.y
+        
         # Asta
-        pygame.draw.rect(superficie, BLANCO, 
-                        (self.rect.x + 18, self.rect.y, 4, 200))
+        asta = pygame.draw.rect(superficie, BLANCO, 
+                                (x + 18, y, 4, 200))
         # Bandera
         puntos = [
-            (self.rect.x + 22, self.rect.y + 10),
-            (self.rect.x + 50, self.rect.y + 25),
-            (self.rect.x + 22, self.rect.y + 40)
+            (x + 22, y + 10),
+            (x + 50, y + 25),
+            (x + 22, y + 40)
         ]
-        pygame.draw.polygon(superficie, ROJO, puntos)
+        bandera = pygame.draw.polygon(superficie, ROJO, puntos)
         # Punta
-        pygame.draw.circle(superficie, AMARILLO, 
-                         (self.rect.x + 20, self.rect.y), 6)
+        punta = pygame.draw.circle(superficie, AMARILLO, 
+                                   (x + 20, y), 6)
+        return asta.union(bandera).union(punta)
+
+# Adaptador opcional para meter una entidad con clave_sprite y rasterizar en un
+# pygame.sprite.Group. El rect se amplía con el margen de los sprites para que
+# Group.draw la coloque igual que entidad.dibujar
+class SpriteEntidad(pygame.sprite.Sprite):
+    def __init__(self, entidad, *grupos):
+        self.entidad = entidad
+        super().__init__(*grupos)
+        
+    @property
+    def image(self):
+        rect = self.entidad.rect
+        return cache_sprites.obtener(self.entidad.clave_sprite(),
+                                     (rect.width + 2 * MARGEN_SPRITE, rect.height + 2 * MARGEN_SPRITE),
+                                     self.entidad.rasterizar)
+        
+    @property
+    def rect(self):
+        return self.entidad.rect.inflate(2 * MARGEN_SPRITE, 2 * MARGEN_SPRITE)
 
 class Nivel:
-    def __init__(self, numero):
+    def __init__(self, numero, radio_chunks=GestorChunks.RADIO):
         self.numero = numero
         self.plataformas = []
         self.enemigos = []
@@ -511,439 +695,187 @@ class Nivel:
         self.completado = False
         self.ancho_mapa = 3200
         self.crear_nivel()
+        # Índice de colisiones, se construye una sola vez por nivel
+        self.rejilla = RejillaEspacial(self.plataformas)
+        # Sólo los chunks cercanos a la cámara tienen entidades activas; desde
+        # aquí enemigos, monedas y powerups son las listas de esos chunks
+        self.chunks = GestorChunks(self.ancho_mapa, radio=radio_chunks)
+        self.enemigos = self.chunks.enemigos
+        self.monedas = self.chunks.monedas
+        self.powerups = self.chunks.powerups
+        self.reiniciar()
+        
+    def reiniciar(self):
+        # Devuelve el nivel a su estado inicial reutilizando las mismas entidades:
+        # reiniciar tras morir no vuelve a construir nada
+        datos = self.datos
+        for enemigo, (x, y, _) in zip(self.reserva_enemigos, datos.iter_enemigos()):
+            enemigo.reiniciar(x, y)
+        # Algunas monedas sólo aparecen con cierta probabilidad
+        monedas = []
+        for moneda, (x, y, probabilidad) in zip(self.reserva_monedas, datos.iter_monedas()):
+            if probabilidad >= 1 or random.random() < probabilidad:
+                moneda.reiniciar(x, y)
+                monedas.append(moneda)
+        for powerup, (x, y, _) in zip(self.reserva_powerups, datos.iter_powerups()):
+            powerup.reiniciar(x, y)
+        self.completado = False
+        self.chunks.distribuir(self.reserva_enemigos, monedas, self.reserva_powerups)
+        self.actualizar_chunks(0)
+        
+    def actualizar_chunks(self, camara_x):
+        return self.chunks.actualizar(camara_x + ANCHO // 2)
         
     def crear_nivel(self):
-        if self.numero == 1:
-            # Nivel 1: Tutorial extendido
-            self.ancho_mapa = 3200
-            
-            # Suelo base continuo
-            self.plataformas = [
-                Plataforma(0, 550, 3200, 50, 'suelo'),
-            ]
-            
-            # Primera sección
-            self.plataformas.extend([
-                Plataforma(200, 450, 100, 20, 'bloque'),
-                Plataforma(350, 400, 80, 20, 'bloque'),
-                Plataforma(150, 350, 60, 120, 'tubo'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(250, 520, 'goomba'),
-                Enemigo(400, 370, 'goomba'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(220, 430),
-                Moneda(250, 430),
-                Moneda(280, 430),
-                Moneda(370, 380),
-            ])
-            
-            self.powerups.append(PowerUp(240, 430, 'hongo'))
-            
-            # Segunda sección
-            self.plataformas.extend([
-                Plataforma(550, 450, 80, 20, 'bloque'),
-                Plataforma(680, 380, 80, 20, 'bloque'),
-                Plataforma(810, 310, 80, 20, 'bloque'),
-                Plataforma(500, 300, 60, 120, 'tubo'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(600, 420, 'goomba'),
-                Enemigo(730, 350, 'goomba'),
-                Enemigo(860, 280, 'goomba'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(580, 430),
-                Moneda(710, 360),
-                Moneda(840, 290),
-            ])
-            
-            # Tercera sección
-            self.plataformas.extend([
-                Plataforma(1000, 450, 60, 120, 'tubo'),
-                Plataforma(1150, 400, 60, 170, 'tubo'),
-                Plataforma(1300, 450, 60, 120, 'tubo'),
-                Plataforma(1100, 300, 100, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(1050, 520, 'goomba'),
-                Enemigo(1200, 520, 'koopa'),
-                Enemigo(1350, 520, 'goomba'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(1130, 280),
-                Moneda(1160, 280),
-            ])
-            
-            self.powerups.append(PowerUp(1140, 280, 'flor'))
-            
-            # Cuarta sección
-            self.plataformas.extend([
-                Plataforma(1500, 480, 80, 20, 'bloque'),
-                Plataforma(1630, 420, 80, 20, 'bloque'),
-                Plataforma(1760, 360, 80, 20, 'bloque'),
-                Plataforma(1890, 300, 80, 20, 'bloque'),
-                Plataforma(2020, 240, 100, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(1550, 450, 'goomba'),
-                Enemigo(1680, 390, 'goomba'),
-                Enemigo(1810, 330, 'koopa'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(1540, 460),
-                Moneda(1670, 400),
-                Moneda(1800, 340),
-                Moneda(1930, 280),
-                Moneda(2060, 220),
-            ])
-            
-            # Quinta sección
-            self.plataformas.extend([
-                Plataforma(2200, 450, 120, 20, 'bloque'),
-                Plataforma(2380, 380, 100, 20, 'bloque'),
-                Plataforma(2500, 450, 60, 120, 'tubo'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(2250, 420, 'koopa'),
-                Enemigo(2420, 350, 'goomba'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(2240, 430),
-                Moneda(2270, 430),
-                Moneda(2420, 360),
-            ])
-            
-            # Zona final
-            self.plataformas.extend([
-                Plataforma(2700, 480, 60, 20, 'bloque'),
-                Plataforma(2800, 420, 60, 20, 'bloque'),
-                Plataforma(2900, 360, 60, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(2750, 450, 'goomba'),
-                Enemigo(2850, 390, 'koopa'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(2730, 460),
-                Moneda(2830, 400),
-                Moneda(2930, 340),
-            ])
-            
-            self.bandera = Bandera(3100, 350)
-            
-        elif self.numero == 2:
-            # Nivel 2
-            self.ancho_mapa = 4000
-            
-            self.plataformas = [
-                Plataforma(0, 550, 4000, 50, 'suelo'),
-            ]
-            
-            # Sección 1
-            self.plataformas.extend([
-                Plataforma(150, 450, 60, 120, 'tubo'),
-                Plataforma(300, 400, 60, 170, 'tubo'),
-                Plataforma(450, 450, 60, 120, 'tubo'),
-                Plataforma(250, 320, 80, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(200, 520, 'goomba'),
-                Enemigo(350, 520, 'koopa'),
-                Enemigo(500, 520, 'goomba'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(270, 300),
-                Moneda(300, 300),
-            ])
-            
-            self.powerups.append(PowerUp(285, 300, 'hongo'))
-            
-            # Sección 2
-            for i in range(8):
-                x = 600 + i * 120
-                y = 450 - (i % 4) * 70
-                self.plataformas.append(Plataforma(x, y, 80, 20, 'bloque'))
-                
-                if i % 2 == 0:
-                    self.enemigos.append(Enemigo(x + 20, y - 30, 'goomba'))
-                    self.monedas.append(Moneda(x + 30, y - 30))
-                else:
-                    self.monedas.append(Moneda(x + 30, y - 30))
-            
-            # Sección 3
-            self.plataformas.extend([
-                Plataforma(1600, 400, 80, 170, 'tubo'),
-                Plataforma(1750, 350, 80, 220, 'tubo'),
-                Plataforma(1900, 400, 80, 170, 'tubo'),
-                Plataforma(1700, 250, 120, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(1650, 520, 'koopa'),
-                Enemigo(1800, 520, 'koopa'),
-                Enemigo(1950, 520, 'goomba'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(1730, 230),
-                Moneda(1760, 230),
-            ])
-            
-            self.powerups.append(PowerUp(1760, 230, 'flor'))
-            
-            # Sección 4
-            for i in range(10):
-                x = 2100 + i * 100
-                y = 450 - (i % 5) * 60
-                self.plataformas.append(Plataforma(x, y, 70, 20, 'bloque'))
-                
-                if i % 3 == 0:
-                    self.enemigos.append(Enemigo(x + 10, y - 30, 'goomba'))
-                if i % 2 == 0:
-                    self.monedas.append(Moneda(x + 20, y - 30))
-            
-            # Sección 5
-            self.plataformas.extend([
-                Plataforma(3000, 450, 60, 120, 'tubo'),
-                Plataforma(3120, 380, 60, 190, 'tubo'),
-                Plataforma(3240, 320, 60, 250, 'tubo'),
-                Plataforma(3360, 380, 60, 190, 'tubo'),
-                Plataforma(3480, 450, 60, 120, 'tubo'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(3050, 520, 'goomba'),
-                Enemigo(3170, 520, 'koopa'),
-                Enemigo(3290, 520, 'goomba'),
-            ])
-            
-            for i, x in enumerate([3030, 3150, 3270]):
-                altura = [420, 350, 290][i]
-                self.monedas.append(Moneda(x, altura))
-            
-            # Zona final
-            self.plataformas.extend([
-                Plataforma(3650, 450, 80, 20, 'bloque'),
-                Plataforma(3750, 380, 80, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(3700, 420, 'koopa'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(3690, 430),
-                Moneda(3790, 360),
-            ])
-            
-            self.bandera = Bandera(3920, 350)
-            
-        elif self.numero == 3:
-            # Nivel 3
-            self.ancho_mapa = 5000
-            
-            self.plataformas = [
-                Plataforma(0, 550, 5000, 50, 'suelo'),
-            ]
-            
-            # Sección 1
-            self.plataformas.extend([
-                Plataforma(100, 450, 60, 120, 'tubo'),
-                Plataforma(220, 380, 60, 190, 'tubo'),
-                Plataforma(340, 320, 60, 250, 'tubo'),
-                Plataforma(460, 380, 60, 190, 'tubo'),
-                Plataforma(580, 450, 60, 120, 'tubo'),
-                Plataforma(300, 240, 100, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(150, 520, 'goomba'),
-                Enemigo(270, 520, 'koopa'),
-                Enemigo(390, 520, 'goomba'),
-                Enemigo(510, 520, 'koopa'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(330, 220),
-                Moneda(360, 220),
-            ])
-            
-            self.powerups.append(PowerUp(345, 220, 'hongo'))
-            
-            # Sección 2
-            for i in range(12):
-                x = 750 + i * 100
-                y = 480 - (i % 5) * 60
-                self.plataformas.append(Plataforma(x, y, 70, 20, 'bloque'))
-                
-                if i % 2 == 0:
-                    self.enemigos.append(Enemigo(x + 15, y - 30, 'goomba'))
-                
-                if i % 3 == 0:
-                    self.monedas.append(Moneda(x + 20, y - 30))
-            
-            # Sección 3
-            tubos_x = [2000, 2140, 2280, 2420, 2560]
-            tubos_altura = [450, 350, 280, 350, 450]
-            
-            for x, altura_base in zip(tubos_x, tubos_altura):
-                altura_tubo = 550 - altura_base + 20
-                self.plataformas.append(Plataforma(x, altura_base, 70, altura_tubo, 'tubo'))
-                self.enemigos.append(Enemigo(x + 20, 520, 'goomba'))
-                
-                if random.random() < 0.6:
-                    self.monedas.append(Moneda(x + 20, altura_base - 30))
-            
-            self.plataformas.extend([
-                Plataforma(2100, 280, 80, 20, 'bloque'),
-                Plataforma(2240, 200, 80, 20, 'bloque'),
-                Plataforma(2380, 280, 80, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(2140, 250, 'goomba'),
-                Enemigo(2280, 170, 'koopa'),
-            ])
-            
-            self.powerups.append(PowerUp(2280, 180, 'flor'))
-            
-            # Sección 4
-            for i in range(14):
-                x = 2800 + i * 80
-                y = 450 - abs(i % 8 - 4) * 50
-                self.plataformas.append(Plataforma(x, y, 60, 20, 'bloque'))
-                
-                if i % 3 == 0:
-                    self.enemigos.append(Enemigo(x + 10, y - 30, 'goomba'))
-                
-                if i % 2 == 0:
-                    self.monedas.append(Moneda(x + 20, y - 30))
-            
-            # Sección 5
-            torres = [
-                (4000, 400, 170),
-                (4140, 320, 250),
-                (4280, 250, 320),
-                (4420, 320, 250),
-                (4560, 400, 170),
-            ]
-            
-            for x, y, altura in torres:
-                self.plataformas.append(Plataforma(x, y, 70, altura, 'tubo'))
-                self.enemigos.append(Enemigo(x + 15, 520, 'goomba'))
-                
-                for j in range(2):
-                    self.monedas.append(Moneda(x + 25, y - 30 - j * 30))
-            
-            self.plataformas.extend([
-                Plataforma(4100, 220, 80, 20, 'bloque'),
-                Plataforma(4240, 150, 120, 20, 'bloque'),
-                Plataforma(4380, 220, 80, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(4140, 190, 'koopa'),
-                Enemigo(4280, 120, 'goomba'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(4270, 130),
-                Moneda(4300, 130),
-            ])
-            
-            self.powerups.append(PowerUp(4300, 130, 'flor'))
-            
-            # Zona final
-            self.plataformas.extend([
-                Plataforma(4700, 480, 60, 20, 'bloque'),
-                Plataforma(4780, 420, 60, 20, 'bloque'),
-                Plataforma(4860, 360, 60, 20, 'bloque'),
-            ])
-            
-            self.enemigos.extend([
-                Enemigo(4730, 450, 'koopa'),
-                Enemigo(4810, 390, 'koopa'),
-            ])
-            
-            self.monedas.extend([
-                Moneda(4730, 460),
-                Moneda(4810, 400),
-            ])
-            
-            self.bandera = Bandera(4920, 350)
+        # La geometría del nivel viene de src/assets/niveles/nivel_N.json
+        datos = self.datos = cargar_nivel(self.numero)
+        self.ancho_mapa = datos.ancho_mapa
+        self.fondo = datos.fondo
+        self.plataformas = [Plataforma(x, y, ancho, alto, tipo)
+                            for x, y, ancho, alto, tipo in datos.iter_plataformas()]
+        # Reserva con todas las entidades posibles; ``reiniciar`` las coloca
+        self.reserva_enemigos = [Enemigo(x, y, tipo) for x, y, tipo in datos.iter_enemigos()]
+        self.reserva_monedas = [Moneda(x, y) for x, y, _ in datos.iter_monedas()]
+        self.reserva_powerups = [PowerUp(x, y, tipo) for x, y, tipo in datos.iter_powerups()]
+        self.enlazar_bloques()
+        if datos.bandera:
+            self.bandera = Bandera(*datos.bandera)
 
-class Juego:
-    def __init__(self):
+    def enlazar_bloques(self):
+        # Power-ups que suelta cada bloque (los que están a menos de 50px en x),
+        # calculados una vez por nivel en lugar de buscarlos en cada golpe
+        orden = {powerup: i for i, powerup in enumerate(self.reserva_powerups)}
+        powerups = sorted(self.reserva_powerups, key=lambda p: p.rect.x)
+        posiciones = [powerup.rect.x for powerup in powerups]
+        self.powerups_bloque = {}
+        for plataforma in self.plataformas:
+            if plataforma.tipo != 'bloque':
+                continue
+            inicio = bisect_right(posiciones, plataforma.rect.x - 50)
+            fin = bisect_left(posiciones, plataforma.rect.x + 50)
+            if inicio < fin:
+                # En el orden en que aparecen en el nivel
+                self.powerups_bloque[plataforma] = sorted(powerups[inicio:fin], key=orden.get)
+
+def precalentar_sprites(pantalla):
+    # Rasteriza de antemano todos los estados para evitar tirones en los primeros frames
+    mario = Mario(0, 0)
+    for grande in (False, True):
+        mario.grande = grande
+        mario.alto = mario.rect.height = 48 if grande else 32
+        for tiene_flor in (False, True):
+            mario.tiene_flor = tiene_flor
+            for direccion in ('derecha', 'izquierda'):
+                mario.direccion = direccion
+                for velocidad_x in (0, VELOCIDAD_JUGADOR):
+                    mario.velocidad_x = velocidad_x
+                    for saltando in (False, True):
+                        mario.saltando = saltando
+                        for frame in range(2):
+                            mario.animacion_frame = frame
+                            mario.dibujar(pantalla)
+                            
+    for tipo in ('goomba', 'koopa'):
+        enemigo = Enemigo(0, 0, tipo)
+        for frame in range(2):
+            enemigo.animacion_frame = frame
+            enemigo.dibujar(pantalla)
+    enemigo = Enemigo(0, 0, 'goomba')
+    enemigo.aplastar()
+    enemigo.dibujar(pantalla)
+    
+    moneda = Moneda(0, 0)
+    for frame in range(4):
+        moneda.animacion_frame = frame
+        moneda.dibujar(pantalla)
+        
+    for tipo in ('hongo', 'flor'):
+        powerup = PowerUp(0, 0, tipo)
+        powerup.activo = True
+        powerup.dibujar(pantalla)
+
+def efectos_nivel(nivel):
+    # Efectos de sonido que puede disparar un nivel, según lo que contiene
+    efectos = ['salto', 'muerte', 'nivel_completado']
+    if nivel.reserva_monedas:
+        efectos.append('moneda')
+    if nivel.reserva_enemigos:
+        efectos.append('aplastar')
+    if nivel.reserva_powerups:
+        efectos.append('powerup')
+    if any(plataforma.tipo == 'bloque' for plataforma in nivel.plataformas):
+        efectos.append('bloque')
+    return efectos
+
+class Simulacion:
+    # Estado completo de la partida y su avance tick a tick. No dibuja ni lee
+    # el teclado, así que puede ejecutarse sin ventana y más rápido que 60 FPS.
+    def __init__(self, semilla=None, nivel_inicial=1, mascaras=False, almacen=False):
+        # La semilla fija el azar de los niveles para poder reproducir partidas
+        self.semilla = semilla if semilla is not None else random.randrange(2 ** 32)
+        random.seed(self.semilla)
+        # Colisión por píxel con los enemigos tras la de rectángulos (opcional)
+        self.mascaras = mascaras
+        # Enemigos y monedas avanzados en arrays de NumPy (opcional, mismo
+        # resultado); un almacén por nivel, como los niveles
+        self.almacen = almacen
+        self.almacenes = {}
+        # Tiempos por fase; desactivado no cuesta nada (F3 en el juego)
+        self.perfilador = Perfilador()
+        # Eventos del tick en curso y entidades recogidas pendientes de retirar
+        self.eventos = []
+        self.retiradas = set()
         self.mario = Mario(50, 400)
-        self.nivel_actual = 1
-        self.nivel = Nivel(self.nivel_actual)
-        self.camara = Camara(self.nivel.ancho_mapa)
+        self.mario_y_anterior = self.mario.rect.y
+        self.camara = Camara(ANCHO)
+        # Niveles ya construidos: volver a uno sólo reinicia sus entidades
+        self.niveles = {}
+        self.nivel_actual = nivel_inicial
+        self.cargar_nivel()
         self.puntuacion = 0
         self.vidas = 3
         self.monedas_totales = 0
         self.tiempo = 400
         self.tiempo_contador = 0
-        self.fuente = pygame.font.Font(None, 36)
-        self.fuente_pequena = pygame.font.Font(None, 24)
-        self.fuente_grande = pygame.font.Font(None, 72)
         self.game_over = False
         self.pausa = False
         self.mensaje = ""
         self.mensaje_tiempo = 0
         
-<<<<<<< HEAD
-        # Agregar:
-        self.estado = "MENU"  # Estados: MENU, JUGANDO, PAUSA, GAMEOVER
-        # Inicializar sonidos de manera segura
-        try:
-            pygame.mixer.init()
-            self.sonido_salto = pygame.mixer.Sound(os.path.join("sonidos", "salto.wav"))
-            self.sonido_moneda = pygame.mixer.Sound(os.path.join("sonidos", "moneda.wav"))
-            self.musica_nivel = pygame.mixer.music.load(os.path.join("sonidos", "nivel.mp3"))
-        except:
-            print("No se pudieron cargar los archivos de sonido")
-            self.sonido_salto = None
-            self.sonido_moneda = None
-        
-=======
->>>>>>> 454549a (se cambio por el juego de mario)
+    def cargar_nivel(self):
+        nivel = self.niveles.get(self.nivel_actual)
+        if nivel is None:
+            nivel = self.niveles[self.nivel_actual] = Nivel(self.nivel_actual)
+        else:
+            nivel.reiniciar()
+        self.nivel = nivel
+        if self.almacen and self.nivel_actual not in self.almacenes:
+            self.almacenes[self.nivel_actual] = AlmacenNivel(
+                nivel.plataformas, nivel.reserva_enemigos, nivel.reserva_monedas)
+        self.camara.reiniciar(nivel.ancho_mapa)
+        
     def reiniciar_nivel(self):
-        self.mario = Mario(50, 400)
-        self.nivel = Nivel(self.nivel_actual)
-        self.camara = Camara(self.nivel.ancho_mapa)
+        self.mario.reiniciar(50, 400)
+        # Lo que quedara pendiente del tick pertenece a la vida anterior
+        self.eventos.clear()
+        self.retiradas.clear()
+        self.cargar_nivel()
         self.tiempo = 400
         self.tiempo_contador = 0
         self.mensaje = ""
         
     def siguiente_nivel(self):
         self.nivel_actual += 1
-        if self.nivel_actual > 3:
+        if self.nivel_actual > contar_niveles():
             self.mensaje = "¡FELICIDADES! ¡JUEGO COMPLETADO!"
             self.mensaje_tiempo = 180
             self.nivel_actual = 1
         self.reiniciar_nivel()
         
     def reiniciar_juego(self):
-        self.mario = Mario(50, 400)
+        self.mario.reiniciar(50, 400)
         self.nivel_actual = 1
-        self.nivel = Nivel(self.nivel_actual)
-        self.camara = Camara(self.nivel.ancho_mapa)
+        self.cargar_nivel()
         self.puntuacion = 0
         self.vidas = 3
         self.monedas_totales = 0
@@ -954,31 +886,46 @@ class Juego:
         self.mensaje_tiempo = 0
         
     def verificar_colisiones(self):
+        mario = self.mario
+        nivel = self.nivel
+        eventos = self.eventos
+        retiradas = self.retiradas
+        
         # Colisión con enemigos
-        for enemigo in self.nivel.enemigos[:]:
+        for enemigo in nivel.enemigos:
             if not enemigo.vivo:
                 continue
                 
-            if self.mario.rect.colliderect(enemigo.rect):
-                if self.mario.velocidad_y > 0 and self.mario.rect.bottom < enemigo.rect.centery + 5:
+            if mario.rect.colliderect(enemigo.rect):
+                if self.mascaras:
+                    # Fase estrecha: sólo cuentan los píxeles opacos. Aplasta si
+                    # cae y en su altura anterior todavía no lo tocaba
+                    if not cache_mascaras.solapan(mario, enemigo):
+                        continue
+                    aplasta = (mario.velocidad_y > 0 and
+                               not cache_mascaras.solapan(mario, enemigo, self.mario_y_anterior))
+                else:
+                    aplasta = mario.velocidad_y > 0 and mario.rect.bottom < enemigo.rect.centery + 5
+                if aplasta:
                     enemigo.aplastar()
                     enemigo.vivo = False
                     self.puntuacion += 100
-                    self.mario.velocidad_y = -8
+                    mario.velocidad_y = -8
                     self.mensaje = "+100"
                     self.mensaje_tiempo = 30
-                else:
-                    if self.mario.recibir_dano():
-                        self.vidas -= 1
-                        if self.vidas <= 0:
-                            self.game_over = True
-                        else:
-                            self.reiniciar_nivel()
+                    eventos.append((ev.ENEMIGO_APLASTADO, enemigo))
+                elif mario.recibir_dano():
+                    self.perder_vida(enemigo)
+                    if not self.game_over:
+                        # El nivel ha vuelto a empezar: el resto de enemigos
+                        # ya no está donde estaba
+                        break
                             
-        # Colisión con monedas
-        for moneda in self.nivel.monedas[:]:
-            if self.mario.rect.colliderect(moneda.rect):
-                self.nivel.monedas.remove(moneda)
+        # Colisión con monedas; las recogidas se retiran todas juntas al final
+        for moneda in nivel.monedas:
+            if mario.rect.colliderect(moneda.rect):
+                retiradas.add(moneda)
+                eventos.append((ev.MONEDA_RECOGIDA, moneda))
                 self.puntuacion += 50
                 self.monedas_totales += 1
                 self.mensaje = "+50"
@@ -990,50 +937,78 @@ class Juego:
                     self.mensaje_tiempo = 60
                     
         # Colisión con power-ups
-        for powerup in self.nivel.powerups[:]:
+        for powerup in nivel.powerups:
             if not powerup.activo:
                 continue
                 
-            if self.mario.rect.colliderect(powerup.rect):
+            if mario.rect.colliderect(powerup.rect):
                 if powerup.tipo == 'hongo':
-                    self.mario.crecer()
+                    mario.crecer()
                     self.puntuacion += 500
                     self.mensaje = "¡SUPER MARIO!"
                     self.mensaje_tiempo = 60
                 elif powerup.tipo == 'flor':
-                    self.mario.obtener_flor()
+                    mario.obtener_flor()
                     self.puntuacion += 1000
                     self.mensaje = "¡FIRE MARIO!"
                     self.mensaje_tiempo = 60
-                self.nivel.powerups.remove(powerup)
+                retiradas.add(powerup)
+                eventos.append((ev.POWERUP_RECOGIDO, powerup))
                 
-        # Activar power-ups al golpear bloques
-        for plataforma in self.nivel.plataformas:
-            if hasattr(plataforma, 'golpeado') and plataforma.golpeado:
-                plataforma.golpeado = False
-                for powerup in self.nivel.powerups:
-                    if not powerup.activo and abs(powerup.rect.x - plataforma.rect.x) < 50:
-                        powerup.activar()
-                        break
+        nivel.chunks.retirar(retiradas)
+        retiradas.clear()
+                
+        # Activar power-ups al golpear bloques: Mario emite el evento al chocar
+        for tipo, entidad in eventos:
+            if tipo == ev.BLOQUE_GOLPEADO:
+                self.bloque_golpeado(entidad)
                         
         # Colisión con bandera
-        if self.nivel.bandera and self.mario.rect.colliderect(self.nivel.bandera.rect):
-            if not self.nivel.completado:
-                self.nivel.completado = True
+        if nivel.bandera and mario.rect.colliderect(nivel.bandera.rect):
+            if not nivel.completado:
+                nivel.completado = True
                 bonus = self.tiempo * 10
                 self.puntuacion += bonus
                 self.mensaje = f"¡NIVEL COMPLETADO! +{bonus}"
                 self.mensaje_tiempo = 120
+                eventos.append((ev.NIVEL_COMPLETADO, nivel.bandera))
                 
         # Caída fuera del mapa
-        if self.mario.rect.y > ALTO:
-            self.vidas -= 1
-            if self.vidas <= 0:
-                self.game_over = True
+        if mario.rect.y > ALTO:
+            self.perder_vida()
+                
+    def perder_vida(self, causa=None):
+        self.vidas -= 1
+        if self.vidas <= 0:
+            self.game_over = True
+        else:
+            self.reiniciar_nivel()
+        # Después del reinicio, que descarta los eventos de la vida anterior
+        self.eventos.append((ev.MARIO_MUERTO, causa))
+                
+    def bloque_golpeado(self, plataforma):
+        # El bloque suelta el primero de sus power-ups sin activar
+        for powerup in self.nivel.powerups_bloque.get(plataforma, ()):
+            if not powerup.activo:
+                powerup.activar()
+                break
+                
+    def paso(self, entrada):
+        self.eventos.clear()
+        # Las acciones de pulsación se aplican antes de avanzar el tick
+        if entrada & ent.SALTO and self.mario.saltar():
+            self.eventos.append((ev.SALTO, self.mario))
+        if entrada & ent.REINICIAR:
+            if self.game_over:
+                self.reiniciar_juego()
             else:
                 self.reiniciar_nivel()
-                
-    def actualizar(self):
+        if entrada & ent.PAUSA:
+            self.pausa = not self.pausa
+        self.actualizar(entrada)
+        
+    def actualizar(self, entrada=0):
+        eventos = self.eventos
         if self.game_over or self.pausa:
             return
             
@@ -1043,11 +1018,7 @@ class Juego:
             self.tiempo_contador = 0
             
         if self.tiempo <= 0:
-            self.vidas -= 1
-            if self.vidas <= 0:
-                self.game_over = True
-            else:
-                self.reiniciar_nivel()
+            self.perder_vida()
                 
         if self.mensaje_tiempo > 0:
             self.mensaje_tiempo -= 1
@@ -1057,170 +1028,308 @@ class Juego:
         if self.nivel.completado and self.mensaje_tiempo == 0:
             self.siguiente_nivel()
             
-        self.mario.update(self.nivel.plataformas)
+        perfilador = self.perfilador
+        self.mario_y_anterior = self.mario.rect.y
+        self.mario.update(self.nivel.rejilla, entrada, eventos)
         self.camara.actualizar(self.mario)
+        self.nivel.actualizar_chunks(self.camara.x)
+        perfilador.marcar('mario')
         
-        for enemigo in self.nivel.enemigos:
-            enemigo.update(self.nivel.plataformas)
-            
-        for moneda in self.nivel.monedas:
-            moneda.update()
+        if self.almacen:
+            self.almacenes[self.nivel_actual].actualizar(self.nivel.enemigos, self.nivel.monedas)
+        else:
+            for enemigo in self.nivel.enemigos:
+                enemigo.update(self.nivel.rejilla)
+                
+            for moneda in self.nivel.monedas:
+                moneda.update()
             
         for powerup in self.nivel.powerups:
-            powerup.update(self.nivel.plataformas)
+            powerup.update(self.nivel.rejilla)
+        perfilador.marcar('enemigos')
             
         self.verificar_colisiones()
+        perfilador.marcar('colisiones')
         
-    def dibujar_hud(self):
-        pygame.draw.rect(pantalla, NEGRO, (0, 0, ANCHO, 40))
+    def hash_estado(self):
+        # CRC32 del estado relevante, para detectar divergencias al reproducir
+        mario = self.mario
+        valores = array('d', (
+            self.nivel_actual, self.puntuacion, self.vidas, self.monedas_totales,
+            self.tiempo, self.tiempo_contador, self.game_over, self.pausa,
+            mario.rect.x, mario.rect.y, mario.rect.height,
+            mario.velocidad_x, mario.velocidad_y, mario.invencible, mario.vivo,
+        ))
+        for enemigo in self.nivel.enemigos:
+            valores.extend((enemigo.rect.x, enemigo.rect.y, enemigo.velocidad_x, enemigo.vivo))
+        for moneda in self.nivel.monedas:
+            valores.extend((moneda.rect.x, moneda.rect.y))
+        for powerup in self.nivel.powerups:
+            valores.extend((powerup.rect.x, powerup.rect.y, powerup.activo))
+        return zlib.crc32(valores.tobytes())
         
-        texto_puntos = self.fuente_pequena.render(f"PUNTOS: {self.puntuacion:06d}", True, BLANCO)
-        pantalla.blit(texto_puntos, (10, 10))
+def step(estado, entrada):
+    # Avanza la simulación un tick con la máscara de entrada dada. El estado se
+    # actualiza en el sitio para no copiar el nivel entero en cada tick.
+    estado.paso(entrada)
+    return estado
+
+class Juego(Simulacion):
+    def __init__(self, semilla=None, nivel_inicial=1, grabador=None, reproductor=None,
+                 por_zonas=False, mascaras=False, almacen=False):
+        # Renderizado por zonas (display.update con rects) en lugar de flip completo
+        self.por_zonas = por_zonas
+        self.capas_plataformas = {}
+        self.pantalla = iniciar_video()
+        self.reloj = pygame.time.Clock()
+        self.fondo = pygame.Surface((ANCHO, ALTO)).convert()
+        self.camara_anterior = None
+        self.invalidar_fondo()
+        self.fuente = fuentes.obtener(36)
+        self.fuente_pequena = fuentes.obtener(24)
+        self.fuente_grande = fuentes.obtener(72)
+        self.crear_hud()
+        self.crear_escenas()
+        # Los recursos se cargan en segundo plano mientras se muestra el título
+        self.recursos = GestorRecursos()
+        self.recursos.solicitar_carpeta('imagen')
+        # Efectos decodificados una vez, con canales reservados por categoría
+        self.sonidos = BancoSonidos(recursos=self.recursos)
+        # Partículas de los eventos (aplastar, monedas, bloques); sólo visuales
+        self.particulas = SistemaParticulas(semilla=semilla)
+        super().__init__(semilla, nivel_inicial, mascaras, almacen)
+        self.perfilador.registrar('recursos', self.recursos.estadisticas)
+        self.perfilador.registrar('sonidos', self.sonidos.estadisticas)
+        self.perfilador.registrar('particulas', self.particulas.estadisticas)
+        # Grabación o reproducción de las entradas por tick (opcionales)
+        self.grabador = grabador
+        self.reproductor = reproductor
         
-        pygame.draw.circle(pantalla, AMARILLO, (250, 20), 8)
-        texto_monedas = self.fuente_pequena.render(f"x {self.monedas_totales:03d}", True, BLANCO)
-        pantalla.blit(texto_monedas, (265, 10))
+        # Agregar:
+        self.estado = "MENU"  # Estados: MENU, JUGANDO, PAUSA, GAMEOVER
         
-        texto_nivel = self.fuente_pequena.render(f"NIVEL: {self.nivel_actual}-1", True, BLANCO)
-        pantalla.blit(texto_nivel, (380, 10))
+    def cargar_nivel(self):
+        super().cargar_nivel()
+        self.particulas.vaciar()
+        # Las plataformas no se mueven: se renderizan una vez por nivel y la capa
+        # se conserva para los reinicios
+        self.capa_plataformas = self.capas_plataformas.get(self.nivel_actual)
+        if self.capa_plataformas is None:
+            self.capa_plataformas = CapaPlataformas(self.nivel.plataformas, self.nivel.ancho_mapa, ALTO)
+            self.capas_plataformas[self.nivel_actual] = self.capa_plataformas
+            precalentar_sprites(self.pantalla)
+        # Los efectos que puede necesitar el nivel se decodifican ya, no en su primer uso
+        self.sonidos.precargar(efectos_nivel(self.nivel))
+        # El cielo y las capas de parallax se comparten entre reinicios
+        self.parallax = obtener_fondo(self.nivel.fondo, (ANCHO, ALTO))
+        self.invalidar_fondo()
         
-        texto_vidas = self.fuente_pequena.render(f"VIDAS:", True, BLANCO)
-        pantalla.blit(texto_vidas, (530, 10))
-        for i in range(self.vidas):
-            pygame.draw.circle(pantalla, ROJO, (610 + i * 25, 20), 8)
-            
+    def crear_hud(self):
+        # La barra se compone una vez; cada campo se redibuja sólo al cambiar
+        self.hud = BarraHUD((ANCHO, 40), NEGRO)
+        self.hud.campo('icono_moneda', AMARILLO, (242, 12), self.componer_circulos)
+        self.hud.texto('etiqueta_vidas', self.fuente_pequena, "VIDAS:", BLANCO, (530, 10))
+        
+    def crear_escenas(self):
+        # Las pantallas estáticas se componen una vez y se reutilizan
+        self.escena_titulo = Escena((ANCHO, ALTO), AZUL_CIELO)
+        self.escena_titulo.texto(self.fuente_grande, "SUPER MARIO BROS", ROJO, (ANCHO // 2, 100))
+        self.escena_titulo.texto(self.fuente, "Edición 2005", BLANCO, (ANCHO // 2, 160))
+        controles = [
+            "CONTROLES:",
+            "",
+            "← → o A D - Mover",
+            "ESPACIO - Saltar",
+            "P - Pausa",
+            "R - Reiniciar Nivel",
+            "",
+            "OBJETIVOS:",
+            "",
+            "• Llega a la bandera para completar el nivel",
+            "• Recolecta monedas para sumar puntos",
+            "• Elimina enemigos saltando sobre ellos",
+            "• Recoge power-ups para hacerte más fuerte",
+            f"• ¡Completa los {contar_niveles()} niveles!",
+        ]
+        y = 220
+        for linea in controles:
+            if linea.startswith("CONTROLES") or linea.startswith("OBJETIVOS"):
+                color = AMARILLO
+            elif linea.startswith("•"):
+                color = VERDE
+            else:
+                color = BLANCO
+            self.escena_titulo.texto(self.fuente_pequena, linea, color, (ANCHO // 2, y))
+            y += 25
+        self.escena_titulo.texto(self.fuente, "Presiona ENTER para Empezar", AMARILLO, (ANCHO // 2, ALTO - 40))
+        
+        self.escena_pausa = Escena((ANCHO, ALTO), NEGRO, 128)
+        self.escena_pausa.texto(self.fuente_grande, "PAUSA", BLANCO, (ANCHO // 2, ALTO // 2 - 50))
+        self.escena_pausa.texto(self.fuente_pequena, "Presiona P para continuar", BLANCO, (ANCHO // 2, ALTO // 2 + 20))
+        
+        self.escena_game_over = Escena((ANCHO, ALTO), NEGRO, 180)
+        self.escena_game_over.texto(self.fuente_grande, "GAME OVER", ROJO, (ANCHO // 2, ALTO // 2 - 80))
+        self.escena_game_over.texto_dinamico('puntos', self.fuente, BLANCO, (ANCHO // 2, ALTO // 2 - 20))
+        self.escena_game_over.texto_dinamico('nivel', self.fuente_pequena, BLANCO, (ANCHO // 2, ALTO // 2 + 20))
+        self.escena_game_over.texto(self.fuente_pequena, "Presiona R para Reiniciar", AMARILLO, (ANCHO // 2, ALTO // 2 + 60))
+        self.escena_game_over.texto(self.fuente_pequena, "Presiona ESC para Salir", AMARILLO, (ANCHO // 2, ALTO // 2 + 90))
+        
+    def componer_circulos(self, color, cantidad=1):
+        # Iconos del HUD: círculos de radio 8 separados 25px
+        superficie = pygame.Surface((max(1, cantidad * 25), 16), pygame.SRCALPHA)
+        for i in range(cantidad):
+            pygame.draw.circle(superficie, color, (8 + i * 25, 8), 8)
+        return superficie
+        
+    def dibujar_hud(self, superficie, dibujados, cambios):
+        hud = self.hud
+        fuente = self.fuente_pequena
+        hud.texto('puntos', fuente, f"PUNTOS: {self.puntuacion:06d}", BLANCO, (10, 10))
+        hud.texto('monedas', fuente, f"x {self.monedas_totales:03d}", BLANCO, (265, 10))
+        hud.texto('nivel', fuente, f"NIVEL: {self.nivel_actual}-1", BLANCO, (380, 10))
+        hud.campo('vidas', self.vidas, (602, 12), lambda vidas: self.componer_circulos(ROJO, vidas))
         color_tiempo = ROJO if self.tiempo < 30 else BLANCO
-        texto_tiempo = self.fuente_pequena.render(f"TIEMPO: {self.tiempo:03d}", True, color_tiempo)
-        pantalla.blit(texto_tiempo, (680, 10))
+        hud.texto('tiempo', fuente, f"TIEMPO: {self.tiempo:03d}", color_tiempo, (680, 10))
+        # La barra es opaca y siempre está en el mismo sitio: basta con
+        # actualizar en pantalla los campos que han cambiado
+        cambios.extend(hud.cambios)
+        hud.dibujar(superficie)
         
         if self.mensaje_tiempo > 0:
-            texto_mensaje = self.fuente.render(self.mensaje, True, AMARILLO)
+            texto_mensaje = cache_texto.renderizar(self.fuente, self.mensaje, AMARILLO)
             rect_mensaje = texto_mensaje.get_rect(center=(ANCHO // 2, 80))
-            pantalla.blit(texto_mensaje, rect_mensaje)
+            dibujados.append(superficie.blit(texto_mensaje, rect_mensaje))
         
-    def dibujar(self):
-        pantalla.fill(AZUL_CIELO)
-        
-        # Nubes con parallax
-        for i in range(10):
-            x = 100 + i * 400 - int(self.camara.x * 0.5)
-            y = 80 + (i % 2) * 40
-            if -100 < x < ANCHO + 100:
-                pygame.draw.ellipse(pantalla, BLANCO, (x, y, 60, 30))
-                pygame.draw.ellipse(pantalla, BLANCO, (x + 20, y - 10, 50, 30))
-                pygame.draw.ellipse(pantalla, BLANCO, (x + 40, y, 60, 30))
-        
-        # Colinas con parallax
-        for i in range(20):
-            x = 200 * i - int(self.camara.x * 0.7)
-            if -200 < x < ANCHO + 200:
-                pygame.draw.ellipse(pantalla, VERDE, (x, 480, 200, 100))
+    def dibujar_fondo(self, superficie):
+        # Cielo, nubes y colinas: tiras pre-renderizadas, dos blits por capa
+        self.parallax.dibujar(superficie, self.camara.x)
         
         # Dibujar elementos del nivel
-        for plataforma in self.nivel.plataformas:
-            rect_camara = pygame.Rect(
-                plataforma.rect.x - self.camara.x,
-                plataforma.rect.y,
-                plataforma.rect.width,
-                plataforma.rect.height
-            )
-            if -100 < rect_camara.x < ANCHO + 100:
-                plataforma_temp = Plataforma(rect_camara.x, rect_camara.y, rect_camara.width, rect_camara.height, plataforma.tipo)
-                plataforma_temp.golpeado = plataforma.golpeado if hasattr(plataforma, 'golpeado') else False
-                plataforma_temp.dibujar(pantalla)
-            
+        self.capa_plataformas.dibujar(superficie, self.camara.x)
+        
+    def dibujar_primer_plano(self, superficie):
+        # Todo lo que va encima del fondo. Devuelve las zonas dibujadas (que hay
+        # que restaurar desde el fondo en el frame siguiente) y las zonas de la
+        # barra del HUD que han cambiado
+        dibujados = []
+        cambios = []
+        
+        # Cada entidad se dibuja desplazada por la cámara, sin copias temporales
+        camara_x = self.camara.x
+        
         for moneda in self.nivel.monedas:
-            if -100 < moneda.rect.x - self.camara.x < ANCHO + 100:
-                moneda_temp = Moneda(moneda.rect.x - self.camara.x, moneda.rect.y)
-                moneda_temp.animacion_frame = moneda.animacion_frame
-                moneda_temp.dibujar(pantalla)
+            if -100 < moneda.rect.x - camara_x < ANCHO + 100:
+                dibujados.append(moneda.dibujar(superficie, camara_x))
             
         for powerup in self.nivel.powerups:
-            if powerup.activo and -100 < powerup.rect.x - self.camara.x < ANCHO + 100:
-                powerup_temp = PowerUp(powerup.rect.x - self.camara.x, powerup.rect.y, powerup.tipo)
-                powerup_temp.activo = True
-                powerup_temp.dibujar(pantalla)
+            if powerup.activo and -100 < powerup.rect.x - camara_x < ANCHO + 100:
+                dibujados.append(powerup.dibujar(superficie, camara_x))
             
         for enemigo in self.nivel.enemigos:
-            if enemigo.vivo and -100 < enemigo.rect.x - self.camara.x < ANCHO + 100:
-                enemigo_temp = Enemigo(enemigo.rect.x - self.camara.x, enemigo.rect.y, enemigo.tipo)
-                enemigo_temp.animacion_frame = enemigo.animacion_frame
-                enemigo_temp.aplastado = enemigo.aplastado
-                enemigo_temp.rect.height = enemigo.rect.height
-                enemigo_temp.dibujar(pantalla)
+            if enemigo.vivo and -100 < enemigo.rect.x - camara_x < ANCHO + 100:
+                dibujados.append(enemigo.dibujar(superficie, camara_x))
+                
+        rect_particulas = self.particulas.dibujar(superficie, camara_x)
+        if rect_particulas is not None:
+            dibujados.append(rect_particulas)
             
         if self.nivel.bandera:
-            if -100 < self.nivel.bandera.rect.x - self.camara.x < ANCHO + 100:
-                bandera_temp = Bandera(self.nivel.bandera.rect.x - self.camara.x, self.nivel.bandera.rect.y)
-                bandera_temp.dibujar(pantalla)
-        
-        # Mario
-        mario_temp = Mario(self.mario.rect.x - self.camara.x, self.mario.rect.y)
-        mario_temp.direccion = self.mario.direccion
-        mario_temp.velocidad_x = self.mario.velocidad_x
-        mario_temp.animacion_frame = self.mario.animacion_frame
-        mario_temp.grande = self.mario.grande
-        mario_temp.tiene_flor = self.mario.tiene_flor
-        mario_temp.invencible = self.mario.invencible
-        mario_temp.vivo = self.mario.vivo
-        mario_temp.alto = self.mario.alto
-        mario_temp.rect.height = self.mario.rect.height
-        mario_temp.saltando = self.mario.saltando
-        mario_temp.dibujar(pantalla)
-        
-        self.dibujar_hud()
+            if -100 < self.nivel.bandera.rect.x - camara_x < ANCHO + 100:
+                dibujados.append(self.nivel.bandera.dibujar(superficie, camara_x))
+        
+        # Mario (no se dibuja en los frames de parpadeo)
+        rect_mario = self.mario.dibujar(superficie, camara_x)
+        if rect_mario is not None:
+            dibujados.append(rect_mario)
+        self.perfilador.marcar('entidades')
+        
+        self.dibujar_hud(superficie, dibujados, cambios)
         
         # Barra de progreso
         progreso = (self.mario.rect.x / self.nivel.ancho_mapa) * 100
-        pygame.draw.rect(pantalla, NEGRO, (ANCHO // 2 - 102, 42, 204, 14))
-        pygame.draw.rect(pantalla, VERDE, (ANCHO // 2 - 100, 44, int(200 * (progreso / 100)), 10))
-        pygame.draw.rect(pantalla, BLANCO, (ANCHO // 2 - 100, 44, 200, 10), 2)
+        dibujados.append(pygame.draw.rect(superficie, NEGRO, (ANCHO // 2 - 102, 42, 204, 14)))
+        pygame.draw.rect(superficie, VERDE, (ANCHO // 2 - 100, 44, int(200 * (progreso / 100)), 10))
+        pygame.draw.rect(superficie, BLANCO, (ANCHO // 2 - 100, 44, 200, 10), 2)
         
         if self.pausa:
-            overlay = pygame.Surface((ANCHO, ALTO))
-            overlay.set_alpha(128)
-            overlay.fill(NEGRO)
-            pantalla.blit(overlay, (0, 0))
-            
-            texto_pausa = self.fuente_grande.render("PAUSA", True, BLANCO)
-            rect_pausa = texto_pausa.get_rect(center=(ANCHO // 2, ALTO // 2 - 50))
-            pantalla.blit(texto_pausa, rect_pausa)
-            
-            texto_continuar = self.fuente_pequena.render("Presiona P para continuar", True, BLANCO)
-            rect_continuar = texto_continuar.get_rect(center=(ANCHO // 2, ALTO // 2 + 20))
-            pantalla.blit(texto_continuar, rect_continuar)
+            self.escena_pausa.dibujar(superficie)
             
         if self.game_over:
-            overlay = pygame.Surface((ANCHO, ALTO))
-            overlay.set_alpha(180)
-            overlay.fill(NEGRO)
-            pantalla.blit(overlay, (0, 0))
-            
-            texto_gameover = self.fuente_grande.render("GAME OVER", True, ROJO)
-            rect_gameover = texto_gameover.get_rect(center=(ANCHO // 2, ALTO // 2 - 80))
-            pantalla.blit(texto_gameover, rect_gameover)
-            
-            texto_puntos_final = self.fuente.render(f"Puntuación Final: {self.puntuacion}", True, BLANCO)
-            rect_puntos = texto_puntos_final.get_rect(center=(ANCHO // 2, ALTO // 2 - 20))
-            pantalla.blit(texto_puntos_final, rect_puntos)
-            
-            texto_nivel_final = self.fuente_pequena.render(f"Nivel Alcanzado: {self.nivel_actual}-1", True, BLANCO)
-            rect_nivel = texto_nivel_final.get_rect(center=(ANCHO // 2, ALTO // 2 + 20))
-            pantalla.blit(texto_nivel_final, rect_nivel)
-            
-            texto_reiniciar = self.fuente_pequena.render("Presiona R para Reiniciar", True, AMARILLO)
-            rect_reiniciar = texto_reiniciar.get_rect(center=(ANCHO // 2, ALTO // 2 + 60))
-            pantalla.blit(texto_reiniciar, rect_reiniciar)
-            
-            texto_salir = self.fuente_pequena.render("Presiona ESC para Salir", True, AMARILLO)
-            rect_salir = texto_salir.get_rect(center=(ANCHO // 2, ALTO // 2 + 90))
-            pantalla.blit(texto_salir, rect_salir)
+            self.escena_game_over.dibujar(superficie,
+                                          puntos=f"Puntuación Final: {self.puntuacion}",
+                                          nivel=f"Nivel Alcanzado: {self.nivel_actual}-1")
+        self.perfilador.marcar('hud')
+        
+        # El overlay del perfilador no cuenta como parte del frame
+        rect_perfilador = self.perfilador.dibujar(superficie)
+        if rect_perfilador is not None:
+            dibujados.append(rect_perfilador)
+        self.perfilador.descartar()
+        return dibujados, cambios
+        
+    def dibujar(self):
+        self.dibujar_fondo(self.pantalla)
+        self.perfilador.marcar('fondo')
+        self.dibujar_primer_plano(self.pantalla)
+        
+    def invalidar_fondo(self):
+        # Obliga al renderizado por zonas a recomponer el fondo y la pantalla
+        self.fondo_x = None
+        self.zonas_anteriores = None
+        
+    def dibujar_zonas(self):
+        # Renderizado por zonas: con la cámara quieta el fondo no cambia, así que
+        # se guarda en una superficie y cada frame sólo se restauran y redibujan
+        # las zonas ocupadas por lo que se mueve. Devuelve las zonas a actualizar
+        # en self.pantalla, o None si hay que actualizarla entera
+        camara_x = self.camara.x
+        if self.pausa or self.game_over or camara_x != self.camara_anterior:
+            # Con la cámara en movimiento o un velo encima cambia toda la pantalla
+            self.camara_anterior = camara_x
+            self.invalidar_fondo()
+            self.dibujar()
+            return None
+            
+        anteriores = self.zonas_anteriores
+        if self.fondo_x != camara_x:
+            self.dibujar_fondo(self.fondo)
+            self.fondo_x = camara_x
+            anteriores = None
+        if anteriores is None:
+            self.pantalla.blit(self.fondo, (0, 0))
+        else:
+            for zona in anteriores:
+                self.pantalla.blit(self.fondo, zona, zona)
+        self.perfilador.marcar('fondo')
+        
+        dibujados, cambios = self.dibujar_primer_plano(self.pantalla)
+        self.zonas_anteriores = dibujados
+        if anteriores is None:
+            return None
+        return anteriores + dibujados + cambios
+        
+    def dibujar_carga(self, superficie, progreso):
+        # Barra de progreso de la carga de recursos, al pie de la pantalla de título
+        marco = pygame.Rect(ANCHO // 4, ALTO - 40, ANCHO // 2, 12)
+        pygame.draw.rect(superficie, BLANCO, marco, 1)
+        relleno = pygame.Rect(marco.x + 2, marco.y + 2, round((marco.width - 4) * progreso), marco.height - 4)
+        pygame.draw.rect(superficie, BLANCO, relleno)
+        
+    def firma_pantalla(self):
+        # Todo lo que se ve en pantalla mientras la simulación está detenida
+        return (self.pausa, self.game_over, self.hash_estado(), self.mensaje, self.mensaje_tiempo)
         
     def ejecutar(self):
         ejecutando = True
         
-        # Pantalla de inicio
-        mostrar_inicio = True
+        # Pantalla de inicio (una repetición empieza directamente). Es estática:
+        # sólo se vuelve a dibujar si la ventana lo pide o avanza la carga de
+        # recursos, que sigue en segundo plano. ENTER durante la carga empieza
+        # la partida en cuanto termina.
+        mostrar_inicio = self.reproductor is None
+        empezar = False
+        redibujar = True
+        progreso_dibujado = None
         while mostrar_inicio:
             for evento in pygame.event.get():
                 if evento.type == pygame.QUIT:
@@ -1228,85 +1337,172 @@ class Juego:
                     sys.exit()
                 if evento.type == pygame.KEYDOWN:
                     if evento.key == pygame.K_RETURN:
-                        mostrar_inicio = False
+                        empezar = True
                     if evento.key == pygame.K_ESCAPE:
                         pygame.quit()
                         sys.exit()
-                        
-            pantalla.fill(AZUL_CIELO)
-            
-            texto_titulo = self.fuente_grande.render("SUPER MARIO BROS", True, ROJO)
-            rect_titulo = texto_titulo.get_rect(center=(ANCHO // 2, 100))
-            pantalla.blit(texto_titulo, rect_titulo)
-            
-            texto_subtitulo = self.fuente.render("Edición 2005", True, BLANCO)
-            rect_subtitulo = texto_subtitulo.get_rect(center=(ANCHO // 2, 160))
-            pantalla.blit(texto_subtitulo, rect_subtitulo)
-            
-            controles = [
-                "CONTROLES:",
-                "",
-                "← → o A D - Mover",
-                "ESPACIO - Saltar",
-                "P - Pausa",
-                "R - Reiniciar Nivel",
-                "",
-                "OBJETIVOS:",
-                "",
-                "• Llega a la bandera para completar el nivel",
-                "• Recolecta monedas para sumar puntos",
-                "• Elimina enemigos saltando sobre ellos",
-                "• Recoge power-ups para hacerte más fuerte",
-                "• ¡Completa los 3 niveles!",
-            ]
-            
-            y = 220
-            for linea in controles:
-                if linea.startswith("CONTROLES") or linea.startswith("OBJETIVOS"):
-                    texto = self.fuente_pequena.render(linea, True, AMARILLO)
-                elif linea.startswith("•"):
-                    texto = self.fuente_pequena.render(linea, True, VERDE)
-                else:
-                    texto = self.fuente_pequena.render(linea, True, BLANCO)
-                rect = texto.get_rect(center=(ANCHO // 2, y))
-                pantalla.blit(texto, rect)
-                y += 25
-                
-            texto_empezar = self.fuente.render("Presiona ENTER para Empezar", True, AMARILLO)
-            rect_empezar = texto_empezar.get_rect(center=(ANCHO // 2, ALTO - 40))
-            pantalla.blit(texto_empezar, rect_empezar)
-            
-            pygame.display.flip()
-            reloj.tick(FPS)
+                if evento.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    redibujar = True
+                    
+            cargando = not self.recursos.listo
+            progreso = self.recursos.progreso
+            if redibujar or progreso != progreso_dibujado:
+                self.escena_titulo.dibujar(self.pantalla)
+                if cargando:
+                    self.dibujar_carga(self.pantalla, progreso)
+                pygame.display.flip()
+                redibujar = False
+                progreso_dibujado = progreso
+            if empezar and not cargando:
+                mostrar_inicio = False
+            self.reloj.tick(FPS if cargando else FPS_REPOSO)
+        self.recursos.esperar()
         
-        # Loop principal
+        # Loop principal: la simulación avanza a paso fijo, independiente del render
+        self.sonidos.musica(MUSICA_NIVEL)
+        acumulado = 0.0
+        pendientes = 0
+        self.reloj.tick()
+        perfilador = self.perfilador
+        # En pausa o game over la pantalla no cambia hasta que llega una entrada:
+        # no se redibuja y el bucle baja a FPS_REPOSO
+        firma_dibujada = None
+        reposo = False
         while ejecutando:
+            perfilador.iniciar_frame()
             for evento in pygame.event.get():
                 if evento.type == pygame.QUIT:
                     ejecutando = False
                     
-                if evento.type == pygame.KEYDOWN:
-                    if evento.key == pygame.K_SPACE:
-                        self.mario.saltar()
-                    if evento.key == pygame.K_r:
-                        if self.game_over:
-                            self.reiniciar_juego()
-                        else:
-                            self.reiniciar_nivel()
-                    if evento.key == pygame.K_p:
-                        self.pausa = not self.pausa
-                    if evento.key == pygame.K_ESCAPE:
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE:
+                    ejecutando = False
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F3:
+                    perfilador.alternar()
+                    firma_dibujada = None
+                if evento.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    firma_dibujada = None
+                    self.invalidar_fondo()
+                # Las pulsaciones esperan al siguiente tick aunque este frame no avance
+                pendientes |= ent.bits_evento(evento)
+            perfilador.marcar('entrada')
+                
+            transcurrido = self.reloj.tick(FPS_REPOSO if reposo else FPS)
+            if reposo:
+                # La espera en reposo no es tiempo de juego atrasado: un solo
+                # tick, que atiende la entrada, y al salir no se salta nada
+                acumulado = PASO_MS
+            else:
+                acumulado = min(acumulado + transcurrido, MAX_PASOS_FRAME * PASO_MS)
+            # La espera del reloj no es trabajo del frame
+            perfilador.descartar()
+            while acumulado >= PASO_MS:
+                if self.reproductor is not None:
+                    if self.reproductor.terminado:
                         ejecutando = False
-                        
-            self.actualizar()
-            self.dibujar()
-            pygame.display.flip()
-            reloj.tick(FPS)
+                        break
+                    step(self, self.reproductor.siguiente_entrada())
+                    try:
+                        self.reproductor.comprobar(self)
+                    except DivergenciaRepeticion as error:
+                        print(error)
+                        ejecutando = False
+                        break
+                else:
+                    entrada = ent.leer_teclado() | pendientes
+                    perfilador.marcar('entrada')
+                    step(self, entrada)
+                    if self.grabador is not None:
+                        self.grabador.registrar(entrada, self)
+                self.sonidos.procesar(self.eventos)
+                perfilador.marcar('sonidos')
+                # En pausa o game over las partículas se congelan con el resto
+                if not (self.pausa or self.game_over):
+                    self.particulas.procesar(self.eventos)
+                    self.particulas.actualizar()
+                    perfilador.marcar('particulas')
+                pendientes = 0
+                acumulado -= PASO_MS
+                
+            firma = self.firma_pantalla() if self.pausa or self.game_over else None
+            reposo = firma is not None and firma == firma_dibujada
+            if not reposo:
+                if self.por_zonas:
+                    zonas = self.dibujar_zonas()
+                    if zonas is None:
+                        pygame.display.flip()
+                    else:
+                        pygame.display.update(zonas)
+                else:
+                    self.dibujar()
+                    pygame.display.flip()
+                perfilador.marcar('flip')
+            # Los frames en reposo también se cierran: cuentan su entrada y su tick
+            perfilador.terminar_frame()
+            firma_dibujada = firma
             
         pygame.quit()
         sys.exit()
 
+def verificar_repeticion(ruta):
+    # Reproduce una repetición sin render ni límite de FPS y comprueba sus hashes
+    repeticion = Repeticion.cargar(ruta)
+    estado = Simulacion(repeticion.semilla, repeticion.nivel_inicial, repeticion.mascaras)
+    try:
+        ticks = verificar(estado, repeticion, step)
+    except DivergenciaRepeticion as error:
+        print(error)
+        return False
+    print(f"Repetición correcta: {ticks} ticks verificados")
+    return True
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Super Mario Bros 2005")
+    parser.add_argument('--semilla', type=int, help="semilla aleatoria de la partida")
+    parser.add_argument('--grabar', metavar='RUTA', help="graba las entradas de la partida")
+    parser.add_argument('--reproducir', metavar='RUTA', help="reproduce una partida grabada")
+    parser.add_argument('--rapido', action='store_true',
+                        help="con --reproducir: verifica sin dibujar ni limitar la velocidad")
+    parser.add_argument('--por-zonas', action='store_true',
+                        help="actualiza sólo las zonas de pantalla que cambian (equipos lentos)")
+    parser.add_argument('--perfil', metavar='RUTA',
+                        help="activa el perfilador y exporta sus tiempos al salir (.csv o .json)")
+    parser.add_argument('--mascaras', action='store_true',
+                        help="colisión por píxel con los enemigos (aplastar más preciso)")
+    parser.add_argument('--almacen', action='store_true',
+                        help="actualiza enemigos y monedas en arrays de NumPy")
+    return parser.parse_args(argv)
+
 # Ejecutar el juego
 if __name__ == "__main__":
-    juego = Juego()
-    juego.ejecutar()
\ No newline at end of file
+    args = parsear_argumentos()
+    if args.reproducir and args.rapido:
+        sys.exit(0 if verificar_repeticion(args.reproducir) else 1)
+        
+    grabador = reproductor = None
+    semilla = args.semilla
+    nivel_inicial = 1
+    mascaras = args.mascaras
+    if args.reproducir:
+        repeticion = Repeticion.cargar(args.reproducir)
+        reproductor = Reproductor(repeticion)
+        semilla = repeticion.semilla
+        nivel_inicial = repeticion.nivel_inicial
+        mascaras = repeticion.mascaras
+    elif args.grabar:
+        if semilla is None:
+            semilla = random.randrange(2 ** 32)
+        grabador = Grabador(semilla, nivel_inicial, mascaras=mascaras)
+        
+    juego = Juego(semilla, nivel_inicial, grabador, reproductor, args.por_zonas, mascaras,
+                  args.almacen)
+    if args.perfil:
+        juego.perfilador.alternar()
+    try:
+        juego.ejecutar()
+    finally:
+        # Espera a las cargas en curso, libera sus hilos y guarda el manifiesto
+        juego.recursos.cerrar()
+        if grabador is not None:
+            grabador.repeticion.guardar(args.grabar)
+        if args.perfil:
+            juego.perfilador.exportar(args.perfil)
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Compara actualizar enemigos y monedas como objetos o en arrays de NumPy.
+
+Genera niveles sintéticos con cada vez más enemigos y mide el tick
+completo de ambos caminos: ``Enemigo.update``/``Moneda.update`` con la
+rejilla espacial y la comprobación de contacto con Mario, frente a
+``AlmacenEnemigos``/``AlmacenMonedas``. Antes de medir comprueba que los
+dos caminos dejan a los enemigos en el mismo estado.
+
+Uso:
+    python -m benchmarks.bench_almacen [--ticks N]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from Game1 import Enemigo, Moneda, Plataforma
+from src.core.almacen_entidades import (NUMPY_DISPONIBLE, AlmacenEnemigos,
+                                        AlmacenMonedas, TablaPlataformas)
+from src.core.rejilla import RejillaEspacial
+
+
+def generar(num_enemigos):
+    ancho_mapa = num_enemigos * 100
+    plataformas = [Plataforma(0, 550, ancho_mapa, 50, 'suelo')]
+    enemigos, monedas = [], []
+    for x in range(0, ancho_mapa, 100):
+        if x % 400 == 0:
+            plataformas.append(Plataforma(x, 490, 60, 60, 'tubo'))
+        if x % 200:
+            enemigos.append(Enemigo(x + 70, 520, 'goomba'))
+        else:
+            enemigos.append(Enemigo(x + 70, 510, 'koopa'))
+        monedas.append(Moneda(x + 40, 420))
+    return plataformas, enemigos, monedas
+
+
+def tick_objetos(enemigos, monedas, rejilla, mario):
+    for enemigo in enemigos:
+        enemigo.update(rejilla)
+    for moneda in monedas:
+        moneda.update()
+    return [enemigo for enemigo in enemigos if enemigo.vivo and mario.colliderect(enemigo.rect)]
+
+
+def tick_arrays(enemigos, monedas, tabla, mario):
+    enemigos.actualizar(tabla)
+    monedas.actualizar()
+    return enemigos.colisiones(mario)
+
+
+def comprobar(num_enemigos, ticks):
+    plataformas, enemigos, monedas = generar(num_enemigos)
+    rejilla = RejillaEspacial(plataformas)
+    almacen = AlmacenEnemigos.desde_entidades(enemigos)
+    tabla = TablaPlataformas(plataformas)
+    for _ in range(ticks):
+        for enemigo in enemigos:
+            enemigo.update(rejilla)
+        almacen.actualizar(tabla)
+    for i, enemigo in enumerate(enemigos):
+        estado = (tuple(enemigo.rect), enemigo.velocidad_x, enemigo.animacion_frame)
+        vectorizado = ((int(almacen.x[i]), int(almacen.y[i]), int(almacen.ancho[i]),
+                        int(almacen.alto[i])), int(almacen.velocidad_x[i]),
+                       int(almacen.animacion_frame[i]))
+        if estado != vectorizado:
+            sys.exit(f"El enemigo {i} diverge: {estado} != {vectorizado}")
+
+
+def medir(num_enemigos, ticks):
+    plataformas, enemigos, monedas = generar(num_enemigos)
+    mario = pygame.Rect(num_enemigos * 50, 510, 32, 40)
+
+    rejilla = RejillaEspacial(plataformas)
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        tick_objetos(enemigos, monedas, rejilla, mario)
+    objetos = (time.perf_counter() - inicio) / ticks
+
+    plataformas, enemigos, monedas = generar(num_enemigos)
+    tabla = TablaPlataformas(plataformas)
+    almacen_enemigos = AlmacenEnemigos.desde_entidades(enemigos)
+    almacen_monedas = AlmacenMonedas.desde_entidades(monedas)
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        tick_arrays(almacen_enemigos, almacen_monedas, tabla, mario)
+    arrays = (time.perf_counter() - inicio) / ticks
+    return objetos, arrays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=50)
+    args = parser.parse_args()
+    if not NUMPY_DISPONIBLE:
+        sys.exit("Este benchmark necesita NumPy")
+
+    comprobar(2000, 300)
+    print(f"{'enemigos':>9} {'objetos (ms)':>13} {'arrays (ms)':>12} {'mejora':>7}")
+    for num_enemigos in (1000, 5000, 20000, 50000):
+        objetos, arrays = medir(num_enemigos, args.ticks)
+        print(f"{num_enemigos:>9} {objetos * 1000:>13.3f} {arrays * 1000:>12.3f} "
+              f"{objetos / arrays:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Mide el arranque en frío: importar el juego y llegar al primer frame.
+
+Cada medida es un proceso nuevo de Python. La importación se mide con
+``-X importtime``, que da el tiempo de cada módulo; se separa lo que cuestan
+los módulos del proyecto de lo que cuestan sus dependencias (pygame, numpy)
+y se listan los módulos más lentos. El primer frame es el tiempo desde antes
+de importar hasta tener dibujada la pantalla de título, con la ventana en el
+driver ``dummy``.
+
+Cada ejecución añade una fila (fecha, commit y medianas) a un CSV de
+historial y la compara con la anterior, para seguir el arranque en el tiempo.
+
+Uso:
+    python -m benchmarks.bench_arranque [--repeticiones N] [--modulo Game1]
+                                        [--historial RUTA] [--sin-historial]
+"""
+import argparse
+import csv
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORIAL = os.path.join(RAIZ, 'benchmarks', 'historial_arranque.csv')
+COLUMNAS = ('fecha', 'commit', 'python', 'importacion_ms', 'propios_ms', 'primer_frame_ms')
+MAS_LENTOS = 8
+
+PRIMER_FRAME = """
+import time
+inicio = time.perf_counter()
+import pygame
+import Game1
+juego = Game1.Juego(semilla=0)
+juego.escena_titulo.dibujar(juego.pantalla)
+pygame.display.flip()
+print(time.perf_counter() - inicio)
+"""
+
+
+def entorno():
+    # Sin ventana real ni audio, y sin el saludo de pygame en la salida
+    variables = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+                     PYGAME_HIDE_SUPPORT_PROMPT='1')
+    variables.pop('PYTHONPROFILEIMPORTTIME', None)
+    return variables
+
+
+def modulos_propios():
+    # Nombres de primer nivel de los módulos y paquetes del proyecto
+    nombres = set()
+    for nombre in os.listdir(RAIZ):
+        if nombre.endswith('.py'):
+            nombres.add(nombre[:-3])
+        elif os.path.isfile(os.path.join(RAIZ, nombre, '__init__.py')):
+            nombres.add(nombre)
+    return nombres
+
+
+def medir_importacion(modulo):
+    # Devuelve {módulo: (propio, acumulado)} en microsegundos
+    salida = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+                            cwd=RAIZ, env=entorno(), capture_output=True, text=True, check=True)
+    tiempos = {}
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        tiempos[nombre.strip()] = (int(propio), int(acumulado))
+    return tiempos
+
+
+def medir_primer_frame():
+    salida = subprocess.run([sys.executable, '-c', PRIMER_FRAME], cwd=RAIZ, env=entorno(),
+                            capture_output=True, text=True, check=True)
+    return float(salida.stdout.split()[-1])
+
+
+def commit_actual():
+    try:
+        salida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+    return salida.stdout.strip()
+
+
+def anotar_historial(ruta, fila):
+    # Añade la fila y devuelve la anterior (o None si es la primera)
+    anterior = None
+    if os.path.exists(ruta):
+        with open(ruta, newline='', encoding='utf-8') as fichero:
+            filas = list(csv.DictReader(fichero))
+        if filas:
+            anterior = filas[-1]
+    nuevo = not os.path.exists(ruta)
+    with open(ruta, 'a', newline='', encoding='utf-8') as fichero:
+        escritor = csv.DictWriter(fichero, fieldnames=COLUMNAS)
+        if nuevo:
+            escritor.writeheader()
+        escritor.writerow(fila)
+    return anterior
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--modulo', default='Game1', help="módulo cuya importación se mide")
+    parser.add_argument('--historial', default=HISTORIAL, help="CSV al que se añade el resultado")
+    parser.add_argument('--sin-historial', action='store_true', help="no escribe el historial")
+    args = parser.parse_args()
+
+    propios = modulos_propios()
+    importaciones = []
+    suma_propios = []
+    por_modulo = {}
+    for _ in range(args.repeticiones):
+        tiempos = medir_importacion(args.modulo)
+        importaciones.append(tiempos[args.modulo][1] / 1000)
+        suma_propios.append(sum(propio for nombre, (propio, _) in tiempos.items()
+                                if nombre.split('.')[0] in propios) / 1000)
+        for nombre, (propio, _) in tiempos.items():
+            por_modulo.setdefault(nombre, []).append(propio / 1000)
+    primeros_frames = [medir_primer_frame() * 1000 for _ in range(args.repeticiones)]
+
+    importacion = statistics.median(importaciones)
+    propio = statistics.median(suma_propios)
+    primer_frame = statistics.median(primeros_frames)
+    print(f"importar {args.modulo}: {importacion:8.1f} ms "
+          f"(módulos del proyecto {propio:.1f} ms, dependencias {importacion - propio:.1f} ms)")
+    print(f"primer frame:    {primer_frame:8.1f} ms")
+    print(f"\nmódulos más lentos (tiempo propio, mediana de {args.repeticiones}):")
+    lentos = sorted(por_modulo.items(), key=lambda par: statistics.median(par[1]), reverse=True)
+    for nombre, muestras in lentos[:MAS_LENTOS]:
+        origen = 'proyecto' if nombre.split('.')[0] in propios else ''
+        print(f"  {statistics.median(muestras):7.2f} ms  {nombre:<45} {origen}")
+
+    if args.sin_historial:
+        return
+    fila = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_actual(),
+        'python': platform.python_version(),
+        'importacion_ms': f"{importacion:.1f}",
+        'propios_ms': f"{propio:.1f}",
+        'primer_frame_ms': f"{primer_frame:.1f}",
+    }
+    anterior = anotar_historial(args.historial, fila)
+    if anterior is not None:
+        print(f"\nrespecto a {anterior['commit'] or anterior['fecha']}:")
+        for columna in COLUMNAS[3:]:
+            diferencia = float(fila[columna]) - float(anterior[columna])
+            print(f"  {columna:<16} {diferencia:+8.1f} ms")
+    print(f"\nhistorial: {args.historial}")
+
+
+if __name__ == '__main__':
+    main()
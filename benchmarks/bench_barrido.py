@@ -0,0 +1,74 @@
+"""
+Compara la colisión discreta, la discreta con subpasos y el barrido.
+
+Deja caer un rectángulo de 24x24 sobre un bloque de 20 píxeles de alto a
+distintas velocidades y cuenta cuántas veces lo atraviesa cada método y
+cuánto cuesta cada tick.
+
+Uso:
+    python -m benchmarks.bench_barrido [--repeticiones N]
+"""
+import argparse
+import math
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from Game1 import Plataforma
+from src.core.barrido import barrer
+from src.core.rejilla import RejillaEspacial
+
+VELOCIDADES = (10, 30, 45, 60, 120)
+
+
+def discreto(rect, dy, plataformas, subpasos=1):
+    paso = dy / subpasos
+    for i in range(subpasos):
+        rect.y = round((i + 1) * paso) + rect.y - round(i * paso)
+        for plataforma in plataformas:
+            if rect.colliderect(plataforma.rect):
+                rect.bottom = plataforma.rect.top
+                return True
+    return False
+
+
+def medir(metodo, velocidad, rejilla, repeticiones):
+    atravesados = 0
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        # Alturas de salida distintas para que el bloque caiga en cada fase
+        rect = pygame.Rect(100, 300 - 24 - velocidad + 1 + i % velocidad, 24, 24)
+        plataformas = rejilla.consultar_barrido(rect, 0, velocidad)
+        if not metodo(rect, velocidad, plataformas):
+            atravesados += 1
+    return atravesados, (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeticiones', type=int, default=20000)
+    args = parser.parse_args()
+
+    rejilla = RejillaEspacial([Plataforma(0, 300, 400, 20, 'bloque'),
+                               Plataforma(0, 550, 3000, 50, 'suelo')])
+    metodos = {
+        'discreto': discreto,
+        'subpasos': lambda r, dy, p: discreto(r, dy, p, max(1, math.ceil(dy / 20))),
+        'barrido': lambda r, dy, p: barrer(r, 0, dy, p) is not None and r.bottom == 300,
+    }
+
+    print(f"{'vel':>5}" + ''.join(f" {nombre + ' fallos':>16} {'us':>6}" for nombre in metodos))
+    for velocidad in VELOCIDADES:
+        fila = f"{velocidad:>5}"
+        for metodo in metodos.values():
+            atravesados, segundos = medir(metodo, velocidad, rejilla, args.repeticiones)
+            fila += f" {atravesados / args.repeticiones:>16.1%} {segundos * 1e6:>6.2f}"
+        print(fila)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Mide con tracemalloc las asignaciones por frame al dibujar las entidades.
+
+Compara el método anterior (construir una copia temporal de cada entidad
+visible desplazada por la cámara) con el dibujo directo con
+desplazamiento. Los temporales del método anterior se retienen durante
+el frame para que tracemalloc contabilice todo lo que se crea, no sólo
+el pico momentáneo.
+
+Uso:
+    python -m benchmarks.bench_dibujo [--frames N]
+"""
+import argparse
+import os
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+import Game1
+from Game1 import ANCHO, Bandera, Enemigo, Mario, Moneda, Nivel, PowerUp
+
+
+def visibles(nivel, camara_x):
+    def en_pantalla(entidad):
+        return -100 < entidad.rect.x - camara_x < ANCHO + 100
+    return ([m for m in nivel.monedas if en_pantalla(m)],
+            [p for p in nivel.powerups if en_pantalla(p)],
+            [e for e in nivel.enemigos if e.vivo and en_pantalla(e)])
+
+
+def dibujar_con_temporales(superficie, nivel, mario, camara_x, retener):
+    monedas, powerups, enemigos = visibles(nivel, camara_x)
+    for moneda in monedas:
+        temp = Moneda(moneda.rect.x - camara_x, moneda.rect.y)
+        temp.animacion_frame = moneda.animacion_frame
+        temp.dibujar(superficie)
+        retener.append(temp)
+    for powerup in powerups:
+        temp = PowerUp(powerup.rect.x - camara_x, powerup.rect.y, powerup.tipo)
+        temp.activo = True
+        temp.dibujar(superficie)
+        retener.append(temp)
+    for enemigo in enemigos:
+        temp = Enemigo(enemigo.rect.x - camara_x, enemigo.rect.y, enemigo.tipo)
+        temp.animacion_frame = enemigo.animacion_frame
+        temp.dibujar(superficie)
+        retener.append(temp)
+    temp = Bandera(nivel.bandera.rect.x - camara_x, nivel.bandera.rect.y)
+    temp.dibujar(superficie)
+    retener.append(temp)
+    temp = Mario(mario.rect.x - camara_x, mario.rect.y)
+    temp.dibujar(superficie)
+    retener.append(temp)
+
+
+def dibujar_con_desplazamiento(superficie, nivel, mario, camara_x, retener):
+    monedas, powerups, enemigos = visibles(nivel, camara_x)
+    for moneda in monedas:
+        moneda.dibujar(superficie, camara_x)
+    for powerup in powerups:
+        powerup.dibujar(superficie, camara_x)
+    for enemigo in enemigos:
+        enemigo.dibujar(superficie, camara_x)
+    nivel.bandera.dibujar(superficie, camara_x)
+    mario.dibujar(superficie, camara_x)
+
+
+def medir(funcion, nivel, mario, frames):
+    superficie = pygame.Surface((ANCHO, Game1.ALTO))
+    posiciones = range(0, nivel.ancho_mapa - ANCHO, 50)
+    for powerup in nivel.powerups:
+        powerup.activo = True
+
+    tracemalloc.start()
+    bloques = bytes_totales = 0
+    for frame in range(frames):
+        camara_x = posiciones[frame % len(posiciones)]
+        retener = []
+        antes = tracemalloc.take_snapshot()
+        funcion(superficie, nivel, mario, camara_x, retener)
+        despues = tracemalloc.take_snapshot()
+        for estadistica in despues.compare_to(antes, 'filename'):
+            if estadistica.size_diff > 0:
+                bytes_totales += estadistica.size_diff
+                bloques += estadistica.count_diff
+        del retener
+    tracemalloc.stop()
+    return bytes_totales / frames, bloques / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=60)
+    args = parser.parse_args()
+
+    nivel = Nivel(3)
+    mario = Mario(50, 400)
+    for nombre, funcion in (('Copias temporales', dibujar_con_temporales),
+                            ('Desplazamiento de cámara', dibujar_con_desplazamiento)):
+        bytes_frame, bloques_frame = medir(funcion, nivel, mario, args.frames)
+        print(f"{nombre:26s} {bytes_frame:10.0f} bytes/frame  {bloques_frame:7.1f} bloques/frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Mide la memoria que ocupa cada entidad.
+
+Compara las entidades actuales, con ``__slots__`` y sin heredar de
+``pygame.sprite.Sprite``, con las mismas clases tal y como eran antes (el
+mismo código colgado de ``Sprite``, con ``__dict__`` y el diccionario de
+grupos). Cuenta con ``tracemalloc`` los bytes reservados al crear N
+instancias, incluido su ``pygame.Rect``.
+
+Uso:
+    python -m benchmarks.bench_memoria [--cantidad N]
+"""
+import argparse
+import os
+import tracemalloc
+import types
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from Game1 import Enemigo, Mario, Moneda, Plataforma, PowerUp
+
+ENTIDADES = (
+    ('Moneda', Moneda, lambda i: (i * 30, 300)),
+    ('Plataforma', Plataforma, lambda i: (i * 40, 400, 40, 40, 'ladrillo')),
+    ('Enemigo', Enemigo, lambda i: (i * 40, 500, 'goomba')),
+    ('PowerUp', PowerUp, lambda i: (i * 40, 300, 'hongo')),
+    ('Mario', Mario, lambda i: (i * 40, 400)),
+)
+
+
+def clase_sprite(clase):
+    """Reconstruye una entidad como subclase de ``Sprite`` y sin slots."""
+    atributos = {nombre: valor for nombre, valor in vars(clase).items()
+                 if nombre not in ('__slots__', '__dict__', '__weakref__')
+                 and not isinstance(valor, types.MemberDescriptorType)}
+    iniciar = clase.__init__
+
+    def __init__(self, *args):
+        pygame.sprite.Sprite.__init__(self)
+        iniciar(self, *args)
+
+    atributos['__init__'] = __init__
+    return type(clase.__name__ + 'Sprite', (pygame.sprite.Sprite,), atributos)
+
+
+def medir(clase, argumentos, cantidad):
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    instancias = [clase(*argumentos(i)) for i in range(cantidad)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # La propia lista no cuenta como memoria de las entidades
+    return (despues - antes - instancias.__sizeof__()) / cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cantidad', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{'entidad':>12} {'Sprite (B)':>11} {'slots (B)':>10} {'ahorro':>7}")
+    for nombre, clase, argumentos in ENTIDADES:
+        antes = medir(clase_sprite(clase), argumentos, args.cantidad)
+        ahora = medir(clase, argumentos, args.cantidad)
+        print(f"{nombre:>12} {antes:>11.1f} {ahora:>10.1f} {1 - ahora / antes:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
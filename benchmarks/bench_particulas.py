@@ -0,0 +1,105 @@
+"""
+Mide el coste por frame del sistema de partículas.
+
+Mantiene el pool con N partículas vivas (reponiendo las que mueren) y mide
+por separado la integración vectorizada y el dibujo con el presupuesto por
+defecto y sin presupuesto. Como referencia mide también la versión ingenua:
+un objeto de Python por partícula, actualizado y dibujado uno a uno.
+
+Uso:
+    python -m benchmarks.bench_particulas [--frames N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from src.utils.particulas import NUMPY_DISPONIBLE, Emisor, SistemaParticulas
+
+CANTIDADES = (1000, 5000, 10000)
+# Vida larga para que el pool se mantenga lleno reponiendo poco
+EMISOR = Emisor('destello', 100, (0.5, 2.0), (0, 360), (200, 400), 0.01)
+
+
+class Particula:
+    __slots__ = ('x', 'y', 'vx', 'vy', 'vida')
+
+    def __init__(self, x, y, vx, vy, vida):
+        self.x, self.y, self.vx, self.vy, self.vida = x, y, vx, vy, vida
+
+
+def ingenuo(pantalla, sprite, cantidad, frames):
+    rng = random.Random(0)
+    particulas = []
+    actualizar = dibujar = 0.0
+    for _ in range(frames):
+        while len(particulas) < cantidad:
+            particulas.append(Particula(rng.uniform(0, 800), rng.uniform(0, 600),
+                                        rng.uniform(-2, 2), rng.uniform(-2, 2), rng.randint(200, 400)))
+        inicio = time.perf_counter()
+        for particula in particulas:
+            particula.vy += 0.01
+            particula.x += particula.vx
+            particula.y += particula.vy
+            particula.vida -= 1
+        particulas = [p for p in particulas if p.vida > 0]
+        medio = time.perf_counter()
+        for particula in particulas:
+            pantalla.blit(sprite, (int(particula.x), int(particula.y)))
+        dibujar += time.perf_counter() - medio
+        actualizar += medio - inicio
+    return actualizar / frames, dibujar / frames
+
+
+def pool(pantalla, cantidad, frames, presupuesto_dibujo):
+    sistema = SistemaParticulas(capacidad=cantidad, presupuesto_emision=cantidad,
+                                presupuesto_dibujo=presupuesto_dibujo, semilla=0)
+    rng = random.Random(0)
+    actualizar = dibujar = 0.0
+    for _ in range(frames):
+        while len(sistema) < cantidad:
+            sistema.emitir(EMISOR, rng.uniform(0, 800), rng.uniform(0, 600))
+        inicio = time.perf_counter()
+        sistema.actualizar()
+        medio = time.perf_counter()
+        sistema.dibujar(pantalla)
+        dibujar += time.perf_counter() - medio
+        actualizar += medio - inicio
+    return actualizar / frames, dibujar / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+    if not NUMPY_DISPONIBLE:
+        print("NumPy no está instalado")
+        sys.exit(1)
+
+    pygame.display.init()
+    pantalla = pygame.display.set_mode((800, 600))
+    sprite = pygame.Surface((4, 4), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (255, 215, 0), (2, 2), 2)
+    sprite = sprite.convert_alpha()
+
+    print(f"{'partículas':>10} {'método':<22} {'actualizar (ms)':>16} {'dibujar (ms)':>13} {'total (ms)':>11}")
+    for cantidad in CANTIDADES:
+        filas = {
+            'objetos': ingenuo(pantalla, sprite, cantidad, args.frames),
+            'pool sin presupuesto': pool(pantalla, cantidad, args.frames, cantidad),
+            f'pool, dibuja {SistemaParticulas.PRESUPUESTO_DIBUJO}': pool(
+                pantalla, cantidad, args.frames, SistemaParticulas.PRESUPUESTO_DIBUJO),
+        }
+        for metodo, (actualizar, dibujar) in filas.items():
+            print(f"{cantidad:>10} {metodo:<22} {actualizar * 1000:>16.3f} {dibujar * 1000:>13.3f} "
+                  f"{(actualizar + dibujar) * 1000:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compara preparar rondas del quiz con el banco indexado y filtrando palabras.
+
+Genera un vocabulario sintético (por defecto 100k palabras en 5 niveles y
+20 categorías) y mide, para un alumno que juega rondas seguidas del mismo
+nivel, cuánto tarda cada ronda en media y en el peor caso:
+
+- ``filtrar``: la forma directa, que en cada ronda vuelve a filtrar las
+  palabras del nivel quitando las ya usadas y sortea los distractores entre
+  las que quedan.
+- ``banco``: ``GestorQuiz`` sobre ``BancoPreguntas`` (cursor de permutación
+  perezoso y distractores precalculados).
+
+También mide lo que cuesta construir el banco y lo que cuesta agotar un
+nivel entero. Que no se repitan palabras lo comprueba
+``tests/test_preguntas.py``.
+
+Uso:
+    python -m benchmarks.bench_quiz [--palabras N] [--rondas N]
+"""
+import argparse
+import random
+import time
+
+from src.utils.preguntas import BancoPreguntas, Palabra
+from src.utils.quiz_manager import NIVELES, GestorQuiz
+
+CATEGORIAS = 20
+
+
+def generar(cantidad):
+    return [Palabra(f"palabra{i}", chr(0x1F300 + i % 512), f"categoria{i % CATEGORIAS}",
+                    i % len(NIVELES) + 1) for i in range(cantidad)]
+
+
+def filtrar(palabras, nivel, rondas, rng):
+    usadas = set()
+    tiempos = []
+    for _ in range(rondas):
+        inicio = time.perf_counter()
+        disponibles = [p for p in palabras if p.nivel == nivel and p.ingles not in usadas]
+        correcta = rng.choice(disponibles)
+        usadas.add(correcta.ingles)
+        candidatas = [p for p in palabras if p.nivel == nivel and p is not correcta]
+        opciones = rng.sample(candidatas, NIVELES[nivel].opciones - 1) + [correcta]
+        rng.shuffle(opciones)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def banco(gestor, rondas):
+    tiempos = []
+    for _ in range(rondas):
+        inicio = time.perf_counter()
+        gestor.nueva_pregunta()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def resumen(tiempos):
+    return sum(tiempos) / len(tiempos) * 1e6, max(tiempos) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--palabras', type=int, default=100_000)
+    parser.add_argument('--rondas', type=int, default=200)
+    args = parser.parse_args()
+
+    palabras = generar(args.palabras)
+    inicio = time.perf_counter()
+    banco_preguntas = BancoPreguntas(palabras, semilla=0)
+    print(f"construir el banco de {len(banco_preguntas)} palabras: "
+          f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    nivel = max(NIVELES)
+    print(f"\n{'método':<10} {'media (us)':>12} {'peor (us)':>12}   ({args.rondas} rondas, nivel {nivel})")
+    for nombre, tiempos in (
+            ('filtrar', filtrar(palabras, nivel, args.rondas, random.Random(0))),
+            ('banco', banco(GestorQuiz(banco_preguntas, nivel, semilla=0), args.rondas))):
+        media, peor = resumen(tiempos)
+        print(f"{nombre:<10} {media:>12.1f} {peor:>12.1f}")
+
+    # Un nivel entero hasta agotarlo y la primera ronda de la vuelta siguiente
+    gestor = GestorQuiz(banco_preguntas, nivel, semilla=1)
+    total = len(banco_preguntas.grupo(nivel))
+    media, peor = resumen(banco(gestor, total))
+    gestor.nueva_pregunta()
+    print(f"\nagotar el nivel ({total} rondas): media {media:.1f} us, peor {peor:.1f} us; "
+          f"vuelta siguiente: {gestor.restantes()} restantes")
+
+
+if __name__ == '__main__':
+    main()
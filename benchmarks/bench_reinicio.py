@@ -0,0 +1,47 @@
+"""
+Mide cuánto cuesta reiniciar un nivel al morir.
+
+Compara construir el nivel de nuevo (un ``Nivel`` y todas sus entidades)
+con reiniciar en el sitio el ya construido, para cada nivel del juego.
+
+Uso:
+    python -m benchmarks.bench_reinicio [--repeticiones N]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from Game1 import Nivel, Simulacion
+from src.core.cargador_niveles import contar_niveles
+
+
+def medir(numero, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        Nivel(numero)
+    construir = (time.perf_counter() - inicio) / repeticiones
+
+    simulacion = Simulacion(semilla=0, nivel_inicial=numero)
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        simulacion.reiniciar_nivel()
+    reiniciar = (time.perf_counter() - inicio) / repeticiones
+    return construir, reiniciar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeticiones', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'nivel':>6} {'construir (ms)':>15} {'reiniciar (ms)':>15}")
+    for numero in range(1, contar_niveles() + 1):
+        construir, reiniciar = medir(numero, args.repeticiones)
+        print(f"{numero:>6} {construir * 1000:>15.3f} {reiniciar * 1000:>15.3f}")
+
+
+if __name__ == '__main__':
+    main()
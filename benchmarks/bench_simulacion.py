@@ -0,0 +1,52 @@
+"""
+Mide cuántos ticks por segundo avanza la simulación sin ventana.
+
+Ejecuta Simulacion con el driver de vídeo dummy de SDL y entradas
+aleatorias reproducibles, sin dibujar nada.
+
+Uso:
+    python -m benchmarks.bench_simulacion [--ticks N] [--nivel N]
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from Game1 import Simulacion, step
+from src.core import entrada as ent
+
+
+def entradas_aleatorias(ticks, semilla=0):
+    rng = random.Random(semilla)
+    for _ in range(ticks):
+        entrada = ent.DERECHA if rng.random() < 0.8 else ent.IZQUIERDA
+        if rng.random() < 0.05:
+            entrada |= ent.SALTO
+        yield entrada
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=20000)
+    parser.add_argument('--nivel', type=int, default=1)
+    args = parser.parse_args()
+
+    estado = Simulacion()
+    estado.nivel_actual = args.nivel
+    estado.reiniciar_nivel()
+
+    inicio = time.perf_counter()
+    for entrada in entradas_aleatorias(args.ticks):
+        estado = step(estado, entrada)
+        if estado.game_over:
+            estado.reiniciar_juego()
+    duracion = time.perf_counter() - inicio
+
+    print(f"{args.ticks} ticks en {duracion:.2f} s -> {args.ticks / duracion:,.0f} ticks/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Mide el coste por tick de actualizar entidades según el largo del mapa.
+
+Compara actualizar todas las entidades del nivel con actualizar sólo las
+de los chunks activos alrededor de la cámara (GestorChunks), en mapas
+sintéticos cada vez más largos con la misma densidad de entidades.
+
+Uso:
+    python -m benchmarks.bench_streaming [--ticks N]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from Game1 import ANCHO, Enemigo, Moneda, Plataforma
+from src.core.rejilla import RejillaEspacial
+from src.core.streaming import GestorChunks
+
+
+def generar(ancho_mapa):
+    plataformas = [Plataforma(0, 550, ancho_mapa, 50, 'suelo')]
+    enemigos, monedas = [], []
+    for x in range(300, ancho_mapa, 300):
+        plataformas.append(Plataforma(x, 450, 80, 20, 'bloque'))
+        enemigos.append(Enemigo(x + 100, 520, 'goomba'))
+        monedas.append(Moneda(x + 20, 420))
+    return plataformas, enemigos, monedas
+
+
+def tick(enemigos, monedas, rejilla):
+    for enemigo in enemigos:
+        enemigo.update(rejilla)
+    for moneda in monedas:
+        moneda.update()
+
+
+def medir(ancho_mapa, ticks):
+    plataformas, enemigos, monedas = generar(ancho_mapa)
+    rejilla = RejillaEspacial(plataformas)
+
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        tick(enemigos, monedas, rejilla)
+    todas = (time.perf_counter() - inicio) / ticks
+
+    chunks = GestorChunks(ancho_mapa)
+    chunks.distribuir(enemigos, monedas, [])
+    camara_x = ancho_mapa // 2
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        chunks.actualizar(camara_x + ANCHO // 2)
+        tick(chunks.enemigos, chunks.monedas, rejilla)
+        camara_x += 5
+    activas = (time.perf_counter() - inicio) / ticks
+    return len(enemigos) + len(monedas), todas, activas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'ancho (px)':>10} {'entidades':>10} {'todas (ms)':>11} {'chunks (ms)':>12}")
+    for ancho_mapa in (5000, 20000, 100000, 400000):
+        entidades, todas, activas = medir(ancho_mapa, args.ticks)
+        print(f"{ancho_mapa:>10} {entidades:>10} {todas * 1000:>11.3f} {activas * 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+"""
+Almacén opcional de enemigos y monedas en arrays de NumPy (estructura de arrays).
+
+``Enemigo.update`` y ``Moneda.update`` hacen aritmética trivial por objeto.
+Con miles de entidades ese coste es sobre todo el de llamar a métodos de
+Python, así que aquí posiciones, velocidades, contadores de animación y
+estado viven en arrays y cada tick se resuelve con unas pocas operaciones
+vectorizadas. NumPy no es obligatorio: si no está instalado
+``NUMPY_DISPONIBLE`` es False y el juego sigue usando los objetos.
+
+En el juego se activa con ``Simulacion(almacen=True)`` (``--almacen`` en la
+línea de comandos), que actualiza las entidades activas con ``AlmacenNivel``.
+"""
+from typing import Optional, Sequence
+
+import pygame
+
+from src.entities.entidad import Entidad
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy es una dependencia opcional
+    np = None
+
+NUMPY_DISPONIBLE = np is not None
+
+TIPOS_ENEMIGO = ('goomba', 'koopa')
+
+
+def _requiere_numpy() -> None:
+    if np is None:
+        raise RuntimeError("El almacén vectorizado necesita NumPy instalado")
+
+
+class TablaPlataformas:
+    """
+    Plataformas estáticas agrupadas por columnas en una tabla densa.
+
+    Cada fila corresponde a una columna de ``tam_celda`` píxeles y contiene
+    los índices de las plataformas que la tocan, en su orden original y
+    rellenados con -1. Así se pueden buscar las candidatas de miles de
+    entidades con una sola indexación.
+
+    Attributes:
+        tam_celda (int): Ancho de cada columna
+        x, y, ancho, alto (ndarray): Rectángulos de las plataformas
+        tabla (ndarray): Índices de plataforma por columna
+    """
+
+    TAM_CELDA: int = 128
+
+    def __init__(self, plataformas: Sequence[Entidad],
+                 tam_celda: int = TAM_CELDA) -> None:
+        _requiere_numpy()
+        self.tam_celda = tam_celda
+        rects = np.array([tuple(p.rect) for p in plataformas], dtype=np.int32).reshape(-1, 4)
+        self.x, self.y, self.ancho, self.alto = (rects[:, i].copy() for i in range(4))
+
+        num_columnas = int((self.x + self.ancho).max(initial=0)) // tam_celda + 2
+        columnas = [[] for _ in range(num_columnas)]
+        for indice in range(len(rects)):
+            inicio = max(0, int(self.x[indice]) // tam_celda)
+            fin = int(self.x[indice] + self.ancho[indice]) // tam_celda
+            for columna in range(inicio, fin + 1):
+                columnas[columna].append(indice)
+
+        ancho_tabla = max(1, max(len(c) for c in columnas))
+        self.tabla = np.full((num_columnas, ancho_tabla), -1, dtype=np.int32)
+        for columna, indices in enumerate(columnas):
+            self.tabla[columna, :len(indices)] = indices
+
+    def primera_colision(self, x, y, ancho, alto):
+        """
+        Busca, para cada rectángulo, la primera plataforma que lo solapa.
+
+        Args:
+            x, y, ancho, alto: Arrays con los rectángulos a comprobar
+
+        Returns:
+            ndarray: Índice de la plataforma (en orden original) o -1
+        """
+        ultima = len(self.tabla) - 1
+        columna = np.clip(x // self.tam_celda, 0, ultima)
+        siguiente = np.clip((x + ancho) // self.tam_celda, 0, ultima)
+        # Las entidades son más estrechas que una columna: como mucho tocan dos
+        candidatas = np.concatenate((self.tabla[columna], self.tabla[siguiente]), axis=1)
+
+        validas = candidatas >= 0
+        px = self.x[candidatas]
+        py = self.y[candidatas]
+        solapa = (validas
+                  & (x[:, None] < px + self.ancho[candidatas])
+                  & (px < (x + ancho)[:, None])
+                  & (y[:, None] < py + self.alto[candidatas])
+                  & (py < (y + alto)[:, None]))
+
+        sin_choque = np.iinfo(np.int32).max
+        indices = np.where(solapa, candidatas, sin_choque).min(axis=1)
+        return np.where(indices == sin_choque, -1, indices)
+
+
+class AlmacenEnemigos:
+    """
+    Enemigos en arrays paralelos con actualización vectorizada.
+
+    Reproduce ``Enemigo.update``: animación, avance horizontal y rebote
+    contra las plataformas. A diferencia del bucle por objeto, cada enemigo
+    se resuelve contra la primera plataforma que solapa; en el juego no
+    hay enemigos que choquen con dos a la vez en el mismo tick.
+    """
+
+    def __init__(self, capacidad: int = 0) -> None:
+        _requiere_numpy()
+        self.x = np.zeros(capacidad, dtype=np.int32)
+        self.y = np.zeros(capacidad, dtype=np.int32)
+        self.ancho = np.zeros(capacidad, dtype=np.int32)
+        self.alto = np.zeros(capacidad, dtype=np.int32)
+        self.velocidad_x = np.zeros(capacidad, dtype=np.int32)
+        self.animacion_frame = np.zeros(capacidad, dtype=np.int8)
+        self.animacion_contador = np.zeros(capacidad, dtype=np.int16)
+        self.vivo = np.zeros(capacidad, dtype=bool)
+        self.aplastado = np.zeros(capacidad, dtype=bool)
+        self.tipo = np.zeros(capacidad, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @classmethod
+    def desde_entidades(cls, enemigos: Sequence) -> 'AlmacenEnemigos':
+        """Crea el almacén copiando el estado de una lista de ``Enemigo``."""
+        almacen = cls(len(enemigos))
+        almacen.cargar(enemigos)
+        return almacen
+
+    def cargar(self, enemigos: Sequence, filas: Optional[Sequence[int]] = None) -> None:
+        """
+        Copia el estado de objetos ``Enemigo`` en los arrays.
+
+        Args:
+            enemigos: Enemigos a copiar
+            filas: Fila de cada enemigo en el almacén (por defecto, su posición)
+        """
+        for i, enemigo in zip(range(len(enemigos)) if filas is None else filas, enemigos):
+            self.x[i], self.y[i], self.ancho[i], self.alto[i] = enemigo.rect
+            self.velocidad_x[i] = enemigo.velocidad_x
+            self.animacion_frame[i] = enemigo.animacion_frame
+            self.animacion_contador[i] = enemigo.animacion_contador
+            self.vivo[i] = enemigo.vivo
+            self.aplastado[i] = enemigo.aplastado
+            self.tipo[i] = TIPOS_ENEMIGO.index(enemigo.tipo)
+
+    def aplicar_a(self, enemigos: Sequence, filas: Optional[Sequence[int]] = None) -> None:
+        """
+        Vuelca el estado de los arrays en los objetos ``Enemigo`` originales.
+
+        Args:
+            enemigos: Enemigos a actualizar
+            filas: Fila de cada enemigo en el almacén (por defecto, su posición)
+        """
+        for i, enemigo in zip(range(len(enemigos)) if filas is None else filas, enemigos):
+            enemigo.rect.update(int(self.x[i]), int(self.y[i]),
+                                int(self.ancho[i]), int(self.alto[i]))
+            enemigo.velocidad_x = int(self.velocidad_x[i])
+            enemigo.animacion_frame = int(self.animacion_frame[i])
+            enemigo.animacion_contador = int(self.animacion_contador[i])
+            enemigo.vivo = bool(self.vivo[i])
+            enemigo.aplastado = bool(self.aplastado[i])
+
+    def actualizar(self, plataformas: TablaPlataformas, filas=None) -> None:
+        """
+        Avanza un tick los enemigos vivos y sin aplastar.
+
+        Args:
+            plataformas: Tabla de plataformas del nivel
+            filas: Array de filas a actualizar, o None para todo el almacén
+        """
+        if filas is None:
+            activos = np.flatnonzero(self.vivo & ~self.aplastado)
+        else:
+            activos = filas[self.vivo[filas] & ~self.aplastado[filas]]
+
+        contador = self.animacion_contador[activos] + 1
+        cambia = contador > 10
+        self.animacion_frame[activos[cambia]] ^= 1
+        contador[cambia] = 0
+        self.animacion_contador[activos] = contador
+
+        x = self.x[activos] + self.velocidad_x[activos]
+        choque = plataformas.primera_colision(x, self.y[activos],
+                                              self.ancho[activos], self.alto[activos])
+        hay = choque >= 0
+        indices = activos[hay]
+        plataforma = choque[hay]
+        velocidad = self.velocidad_x[indices]
+        x[hay] = np.where(velocidad > 0,
+                          plataformas.x[plataforma] - self.ancho[indices],
+                          np.where(velocidad < 0,
+                                   plataformas.x[plataforma] + plataformas.ancho[plataforma],
+                                   x[hay]))
+        self.velocidad_x[indices] = -velocidad
+        self.x[activos] = x
+
+    def colisiones(self, rect: pygame.Rect):
+        """
+        Devuelve los índices de los enemigos vivos que solapan un rectángulo.
+
+        Args:
+            rect: Rectángulo a comprobar (normalmente el de Mario)
+
+        Returns:
+            ndarray: Índices de los enemigos en contacto
+        """
+        return np.flatnonzero(self.vivo
+                              & (self.x < rect.right) & (rect.left < self.x + self.ancho)
+                              & (self.y < rect.bottom) & (rect.top < self.y + self.alto))
+
+
+class AlmacenMonedas:
+    """Monedas en arrays paralelos: animación y recogida vectorizadas."""
+
+    def __init__(self, capacidad: int = 0) -> None:
+        _requiere_numpy()
+        self.x = np.zeros(capacidad, dtype=np.int32)
+        self.y = np.zeros(capacidad, dtype=np.int32)
+        self.animacion_frame = np.zeros(capacidad, dtype=np.int8)
+        self.animacion_contador = np.zeros(capacidad, dtype=np.int16)
+        self.viva = np.ones(capacidad, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @classmethod
+    def desde_entidades(cls, monedas: Sequence) -> 'AlmacenMonedas':
+        """Crea el almacén copiando el estado de una lista de ``Moneda``."""
+        almacen = cls(len(monedas))
+        almacen.cargar(monedas)
+        return almacen
+
+    def cargar(self, monedas: Sequence, filas: Optional[Sequence[int]] = None) -> None:
+        """
+        Copia la posición y la animación de objetos ``Moneda`` en los arrays.
+
+        Args:
+            monedas: Monedas a copiar
+            filas: Fila de cada moneda en el almacén (por defecto, su posición)
+        """
+        for i, moneda in zip(range(len(monedas)) if filas is None else filas, monedas):
+            self.x[i] = moneda.rect.x
+            self.y[i] = moneda.rect.y
+            self.animacion_frame[i] = moneda.animacion_frame
+            self.animacion_contador[i] = moneda.animacion_contador
+
+    def aplicar_a(self, monedas: Sequence, filas: Optional[Sequence[int]] = None) -> None:
+        """
+        Vuelca la animación de los arrays en los objetos ``Moneda`` originales.
+
+        Args:
+            monedas: Monedas a actualizar
+            filas: Fila de cada moneda en el almacén (por defecto, su posición)
+        """
+        for i, moneda in zip(range(len(monedas)) if filas is None else filas, monedas):
+            moneda.animacion_frame = int(self.animacion_frame[i])
+            moneda.animacion_contador = int(self.animacion_contador[i])
+
+    def actualizar(self, filas=None) -> None:
+        """
+        Avanza un tick la animación de las monedas.
+
+        Args:
+            filas: Array de filas a actualizar, o None para todo el almacén
+        """
+        if filas is None:
+            filas = slice(None)
+        contador = self.animacion_contador[filas] + 1
+        frame = self.animacion_frame[filas]
+        cambia = contador > 5
+        frame[cambia] = (frame[cambia] + 1) % 4
+        contador[cambia] = 0
+        self.animacion_contador[filas] = contador
+        self.animacion_frame[filas] = frame
+
+    def recoger(self, rect: pygame.Rect):
+        """
+        Marca como recogidas las monedas que solapan un rectángulo.
+
+        Args:
+            rect: Rectángulo del jugador
+
+        Returns:
+            ndarray: Índices de las monedas recogidas en este tick
+        """
+        # Las monedas miden siempre 20x20
+        indices = np.flatnonzero(self.viva
+                                 & (self.x < rect.right) & (rect.left < self.x + 20)
+                                 & (self.y < rect.bottom) & (rect.top < self.y + 20))
+        self.viva[indices] = False
+        return indices
+
+
+class AlmacenNivel:
+    """
+    Actualiza con los almacenes las entidades activas de un nivel.
+
+    Se crea una vez por nivel con todas sus reservas; cada entidad ocupa
+    siempre la misma fila. Los objetos siguen siendo el estado del juego (las
+    colisiones, el dibujo y los reinicios trabajan con ellos), así que en
+    cada tick se copian al almacén las entidades activas, se avanzan en
+    bloque y se vuelcan de vuelta. Con las pocas decenas de entidades de una
+    ventana de chunks la copia cuesta lo mismo que ``update`` por objeto; la
+    ventaja aparece con miles de entidades activas (ver
+    ``benchmarks/bench_almacen.py``).
+
+    Attributes:
+        tabla (TablaPlataformas): Plataformas del nivel
+        enemigos (AlmacenEnemigos): Una fila por enemigo de la reserva
+        monedas (AlmacenMonedas): Una fila por moneda de la reserva
+    """
+
+    def __init__(self, plataformas: Sequence[Entidad], enemigos: Sequence,
+                 monedas: Sequence) -> None:
+        self.tabla = TablaPlataformas(plataformas)
+        self.enemigos = AlmacenEnemigos.desde_entidades(enemigos)
+        self.monedas = AlmacenMonedas.desde_entidades(monedas)
+        self._fila_enemigo = {enemigo: i for i, enemigo in enumerate(enemigos)}
+        self._fila_moneda = {moneda: i for i, moneda in enumerate(monedas)}
+
+    def actualizar(self, enemigos: Sequence, monedas: Sequence) -> None:
+        """
+        Avanza un tick los enemigos y las monedas dados, como sus ``update``.
+
+        Args:
+            enemigos: Enemigos activos (de la reserva con que se creó)
+            monedas: Monedas activas (de la reserva con que se creó)
+        """
+        filas = np.fromiter(map(self._fila_enemigo.__getitem__, enemigos),
+                            dtype=np.intp, count=len(enemigos))
+        self.enemigos.cargar(enemigos, filas)
+        self.enemigos.actualizar(self.tabla, filas)
+        self.enemigos.aplicar_a(enemigos, filas)
+
+        filas = np.fromiter(map(self._fila_moneda.__getitem__, monedas),
+                            dtype=np.intp, count=len(monedas))
+        self.monedas.cargar(monedas, filas)
+        self.monedas.actualizar(filas)
+        self.monedas.aplicar_a(monedas, filas)
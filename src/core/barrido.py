@@ -0,0 +1,184 @@
+"""
+Colisión continua (AABB barrido) contra las plataformas candidatas.
+
+La resolución discreta mueve el rectángulo y después busca solapes, así que
+un objeto que en un tick avanza más que su tamaño más el del obstáculo lo
+atraviesa sin tocarlo. Aquí se calcula el instante de impacto de todo el
+desplazamiento del tick contra cada candidata de la consulta de la rejilla y
+el rectángulo se detiene en el primer contacto, sin subpasos: una consulta y
+una pasada por objeto y tick, sea cual sea la velocidad.
+
+Los rectángulos son los de pygame (enteros, semiabiertos): tocarse borde con
+borde no es colisión. Si el rectángulo ya empieza dentro de una plataforma no
+hay instante de impacto que calcular y el llamador debe resolverlo con la
+comprobación discreta de siempre (ver ``solapa``).
+"""
+import math
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import pygame
+
+from src.entities.entidad import Entidad
+
+
+class Impacto(NamedTuple):
+    """
+    Primer contacto de un desplazamiento.
+
+    Attributes:
+        tiempo (float): Fracción del desplazamiento recorrida hasta el contacto (0-1)
+        normal_x (int): -1, 0 o 1; distinto de 0 si el choque es contra un lado
+        normal_y (int): -1, 0 o 1; distinto de 0 si el choque es por arriba o por abajo
+        obstaculo (Entidad): Plataforma contra la que se choca
+    """
+    tiempo: float
+    normal_x: int
+    normal_y: int
+    obstaculo: Entidad
+
+
+def desplazamiento(posicion: int, velocidad: float) -> int:
+    """
+    Devuelve cuántos píxeles se mueve una coordenada al sumarle una velocidad.
+
+    Reproduce el redondeo de ``pygame.Rect`` al asignarle un float (al entero
+    más cercano, los medios alejándose de cero), para que el barrido acabe
+    exactamente donde acabaría ``rect.y += velocidad``.
+
+    Args:
+        posicion: Coordenada actual del rectángulo
+        velocidad: Velocidad en píxeles por tick
+
+    Returns:
+        int: Desplazamiento entero del tick
+    """
+    destino = posicion + velocidad
+    return int(math.copysign(math.floor(abs(destino) + 0.5), destino)) - posicion
+
+
+def tiempo_impacto(rect: pygame.Rect, dx: int, dy: int,
+                   obstaculo: pygame.Rect) -> Optional[Tuple[float, int, int]]:
+    """
+    Calcula cuándo un rectángulo en movimiento empieza a solapar a otro fijo.
+
+    Args:
+        rect: Rectángulo al principio del tick
+        dx: Desplazamiento horizontal del tick
+        dy: Desplazamiento vertical del tick
+        obstaculo: Rectángulo fijo
+
+    Returns:
+        tuple: Tiempo de impacto en [0, 1) y normal del choque, o None si no
+        chocan durante el tick (o si ya se solapaban al empezar)
+    """
+    if dx > 0:
+        entrada_x = (obstaculo.left - rect.right) / dx
+        salida_x = (obstaculo.right - rect.left) / dx
+    elif dx < 0:
+        entrada_x = (obstaculo.right - rect.left) / dx
+        salida_x = (obstaculo.left - rect.right) / dx
+    elif rect.right <= obstaculo.left or obstaculo.right <= rect.left:
+        return None
+    else:
+        entrada_x, salida_x = -math.inf, math.inf
+
+    if dy > 0:
+        entrada_y = (obstaculo.top - rect.bottom) / dy
+        salida_y = (obstaculo.bottom - rect.top) / dy
+    elif dy < 0:
+        entrada_y = (obstaculo.bottom - rect.top) / dy
+        salida_y = (obstaculo.top - rect.bottom) / dy
+    elif rect.bottom <= obstaculo.top or obstaculo.bottom <= rect.top:
+        return None
+    else:
+        entrada_y, salida_y = -math.inf, math.inf
+
+    # En una esquina exacta gana el choque vertical: se aterriza en vez de rebotar
+    if entrada_x > entrada_y:
+        entrada, normal_x, normal_y = entrada_x, (-1 if dx > 0 else 1), 0
+    else:
+        entrada, normal_x, normal_y = entrada_y, 0, (-1 if dy > 0 else 1)
+
+    if entrada < 0 or entrada >= 1 or entrada >= min(salida_x, salida_y):
+        return None
+    return entrada, normal_x, normal_y
+
+
+def primer_impacto(rect: pygame.Rect, dx: int, dy: int,
+                   candidatas: Sequence[Entidad]) -> Optional[Impacto]:
+    """
+    Busca el primer contacto de un desplazamiento entre las candidatas.
+
+    A igual tiempo gana la primera candidata, que es la que también
+    resolvería primero el recorrido discreto.
+
+    Args:
+        rect: Rectángulo al principio del tick
+        dx: Desplazamiento horizontal del tick
+        dy: Desplazamiento vertical del tick
+        candidatas: Plataformas devueltas por ``RejillaEspacial.consultar_barrido``
+
+    Returns:
+        Impacto: El primer contacto, o None si el camino está libre
+    """
+    primero = None
+    for candidata in candidatas:
+        impacto = tiempo_impacto(rect, dx, dy, candidata.rect)
+        if impacto is not None and (primero is None or impacto[0] < primero.tiempo):
+            primero = Impacto(impacto[0], impacto[1], impacto[2], candidata)
+    return primero
+
+
+def barrer(rect: pygame.Rect, dx: int, dy: int,
+           candidatas: Sequence[Entidad]) -> Optional[Impacto]:
+    """
+    Mueve el rectángulo en el sitio hasta el primer contacto o hasta el final.
+
+    En el eje del choque el rectángulo queda pegado al obstáculo; en el otro
+    avanza la parte entera de lo que le corresponde hasta ese instante.
+
+    Args:
+        rect: Rectángulo a mover; se modifica
+        dx: Desplazamiento horizontal del tick
+        dy: Desplazamiento vertical del tick
+        candidatas: Plataformas devueltas por ``RejillaEspacial.consultar_barrido``
+
+    Returns:
+        Impacto: El contacto que ha detenido el movimiento, o None
+    """
+    impacto = primer_impacto(rect, dx, dy, candidatas)
+    if impacto is None:
+        rect.move_ip(dx, dy)
+        return None
+
+    obstaculo = impacto.obstaculo.rect
+    if impacto.normal_x:
+        rect.y += int(dy * impacto.tiempo)
+        if impacto.normal_x < 0:
+            rect.right = obstaculo.left
+        else:
+            rect.left = obstaculo.right
+    else:
+        rect.x += int(dx * impacto.tiempo)
+        if impacto.normal_y < 0:
+            rect.bottom = obstaculo.top
+        else:
+            rect.top = obstaculo.bottom
+    return impacto
+
+
+def solapa(rect: pygame.Rect, candidatas: Sequence[Entidad]) -> bool:
+    """
+    Indica si el rectángulo ya solapa alguna candidata antes de moverse.
+
+    Args:
+        rect: Rectángulo al principio del tick
+        candidatas: Plataformas a comprobar
+
+    Returns:
+        bool: True si hay que recurrir a la resolución discreta
+    """
+    for candidata in candidatas:
+        if rect.colliderect(candidata.rect):
+            return True
+    return False
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from typing import List, Sequence, Set
+
+import pygame
+
+from src.entities.entidad import Entidad
+
+
+class CapaPlataformas:
+    """
+    Capa pre-renderizada con la geometría estática de un nivel.
+
+    Las plataformas no se mueven, así que se dibujan una sola vez en
+    superficies fuera de pantalla de ancho fijo (tiles). Cada frame sólo se
+    copian los 2-3 tiles que quedan bajo la cámara. Cuando cambia el aspecto
+    de un bloque basta con invalidar los tiles que lo contienen.
+
+    Al cargar se renderizan los primeros ``max_tiles`` tiles. En mapas más
+    largos el resto se renderiza al acercarse la cámara y los menos usados
+    se descartan, para que la memoria no crezca con el largo del mapa.
+
+    Attributes:
+        ancho_tile (int): Ancho en píxeles de cada tile
+        alto (int): Alto de los tiles (el alto de la pantalla)
+        max_tiles (int): Máximo de tiles renderizados en memoria
+    """
+
+    ANCHO_TILE: int = 512
+    MAX_TILES: int = 16
+    # El borde superior de los tubos sobresale 4px por cada lado
+    MARGEN: int = 4
+
+    def __init__(self, plataformas: Sequence[Entidad], ancho_mapa: int,
+                 alto: int, ancho_tile: int = ANCHO_TILE,
+                 max_tiles: int = MAX_TILES) -> None:
+        self.ancho_tile = ancho_tile
+        self.alto = alto
+        self.max_tiles = max_tiles
+        self.num_tiles = max(1, -(-ancho_mapa // ancho_tile))
+        self._plataformas_tile: List[List[Entidad]] = [
+            [] for _ in range(self.num_tiles)
+        ]
+        self._tiles: "OrderedDict[int, pygame.Surface]" = OrderedDict()
+        self._sucios: Set[int] = set()
+
+        for plataforma in plataformas:
+            for indice in self._indices(plataforma.rect):
+                self._plataformas_tile[indice].append(plataforma)
+
+        for indice in range(min(self.num_tiles, max_tiles)):
+            self._renderizar(indice)
+
+    def _indices(self, rect: pygame.Rect) -> range:
+        inicio = max(0, (rect.left - self.MARGEN) // self.ancho_tile)
+        fin = min(self.num_tiles - 1, (rect.right + self.MARGEN) // self.ancho_tile)
+        return range(inicio, fin + 1)
+
+    def _renderizar(self, indice: int) -> None:
+        tile = self._tiles.get(indice)
+        if tile is None:
+            if len(self._tiles) >= self.max_tiles:
+                # Se reutiliza la superficie del tile usado hace más tiempo
+                _, tile = self._tiles.popitem(last=False)
+            else:
+                tile = pygame.Surface((self.ancho_tile, self.alto), pygame.SRCALPHA)
+                if pygame.display.get_surface() is not None:
+                    tile = tile.convert_alpha()
+            self._tiles[indice] = tile
+        tile.fill((0, 0, 0, 0))
+
+        desplazamiento_x = indice * self.ancho_tile
+        for plataforma in self._plataformas_tile[indice]:
+            plataforma.dibujar(tile, desplazamiento_x)
+        self._sucios.discard(indice)
+
+    def invalidar(self, plataforma: Entidad) -> None:
+        """
+        Marca para redibujar los tiles que contienen la plataforma.
+
+        Args:
+            plataforma: Plataforma cuyo aspecto ha cambiado
+        """
+        self._sucios.update(self._indices(plataforma.rect))
+
+    def dibujar(self, superficie: pygame.Surface, camara_x: int) -> None:
+        """
+        Copia en la superficie los tiles visibles desde la cámara.
+
+        Args:
+            superficie: Superficie de destino (la pantalla)
+            camara_x: Posición horizontal de la cámara en el mapa
+        """
+        inicio = max(0, camara_x // self.ancho_tile)
+        fin = min(self.num_tiles - 1, (camara_x + superficie.get_width()) // self.ancho_tile)
+        for indice in range(inicio, fin + 1):
+            if indice in self._sucios or indice not in self._tiles:
+                self._renderizar(indice)
+            else:
+                self._tiles.move_to_end(indice)
+            superficie.blit(self._tiles[indice], (indice * self.ancho_tile - camara_x, 0))
@@ -0,0 +1,270 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Sequence, Tuple
+
+from src.utils.constantes import AZUL_CIELO, NIVELES_CACHE_DIR, NIVELES_DIR, VERDE
+
+# Los tipos se guardan en la caché como su índice en estas tuplas
+TIPOS_PLATAFORMA = ('normal', 'suelo', 'bloque', 'tubo')
+TIPOS_ENEMIGO = ('goomba', 'koopa')
+TIPOS_POWERUP = ('hongo', 'flor')
+
+# Cabecera de la caché binaria: firma, versión, mtime y tamaño del JSON de
+# origen, CRC32 de los registros, ancho del mapa, bandera (presente, x, y) y
+# número de registros de cada sección. Detrás van los registros como enteros
+# de 32 bits.
+FIRMA = b'MNIV'
+VERSION = 3
+_CABECERA = struct.Struct('<4sHqqIiBiiIIIII')
+
+# Probabilidad de aparición de las monedas y factores de parallax en milésimas
+_ESCALA_PROBABILIDAD = 1000
+_ESCALA_FACTOR = 1000
+# Factor guardado en la caché para una capa desactivada
+_SIN_CAPA = -1
+
+
+@dataclass(frozen=True)
+class ConfigFondo:
+    """
+    Aspecto del fondo de un nivel: cielo y capas de parallax.
+
+    En el JSON es la clave opcional ``fondo``, por ejemplo
+    ``{"cielo": [[60, 90, 200], [150, 180, 255]], "nubes": 0.4, "colinas": null}``.
+    ``cielo`` admite un color o dos (degradado de arriba a abajo), y cada capa
+    indica su factor de desplazamiento respecto a la cámara o ``null`` para
+    quitarla.
+    """
+    cielo_arriba: Tuple[int, int, int] = AZUL_CIELO
+    cielo_abajo: Tuple[int, int, int] = AZUL_CIELO
+    factor_nubes: Optional[float] = 0.5
+    factor_colinas: Optional[float] = 0.7
+    color_colinas: Tuple[int, int, int] = VERDE
+
+    def a_array(self) -> array:
+        """Codifica la configuración como la sección ``fondo`` de la caché."""
+        factores = (_SIN_CAPA if factor is None else round(factor * _ESCALA_FACTOR)
+                    for factor in (self.factor_nubes, self.factor_colinas))
+        return array('i', (*self.cielo_arriba, *self.cielo_abajo, *factores, *self.color_colinas))
+
+    @classmethod
+    def desde_array(cls, datos: Sequence[int]) -> 'ConfigFondo':
+        """Decodifica la sección ``fondo`` de la caché (vacía = por defecto)."""
+        if not datos:
+            return cls()
+        factor_nubes, factor_colinas = (None if factor == _SIN_CAPA else factor / _ESCALA_FACTOR
+                                        for factor in datos[6:8])
+        return cls(tuple(datos[0:3]), tuple(datos[3:6]), factor_nubes, factor_colinas,
+                   tuple(datos[8:11]))
+
+    @classmethod
+    def desde_json(cls, fondo: dict) -> 'ConfigFondo':
+        """Crea la configuración a partir de la clave ``fondo`` del JSON."""
+        defecto = cls()
+        cielo = fondo.get('cielo')
+        if cielo is None:
+            arriba, abajo = defecto.cielo_arriba, defecto.cielo_abajo
+        elif isinstance(cielo[0], (list, tuple)):
+            arriba, abajo = (tuple(int(c) for c in color) for color in cielo)
+        else:
+            arriba = abajo = tuple(int(c) for c in cielo)
+        return cls(arriba, abajo,
+                   fondo.get('nubes', defecto.factor_nubes),
+                   fondo.get('colinas', defecto.factor_colinas),
+                   tuple(int(c) for c in fondo.get('color_colinas', defecto.color_colinas)))
+
+
+@dataclass
+class DatosNivel:
+    """
+    Descripción compacta de un nivel tal y como se guarda en la caché.
+
+    Cada sección es un ``array('i')`` plano con registros de ancho fijo:
+    plataformas (x, y, ancho, alto, tipo), enemigos (x, y, tipo), monedas
+    (x, y, probabilidad en milésimas) y powerups (x, y, tipo). El fondo se
+    guarda aparte como ``ConfigFondo``.
+    """
+    ancho_mapa: int
+    plataformas: array = field(default_factory=lambda: array('i'))
+    enemigos: array = field(default_factory=lambda: array('i'))
+    monedas: array = field(default_factory=lambda: array('i'))
+    powerups: array = field(default_factory=lambda: array('i'))
+    bandera: Optional[Tuple[int, int]] = None
+    fondo: ConfigFondo = field(default_factory=ConfigFondo)
+
+    def iter_plataformas(self) -> Iterator[Tuple[int, int, int, int, str]]:
+        datos = iter(self.plataformas)
+        for x, y, ancho, alto, tipo in zip(datos, datos, datos, datos, datos):
+            yield x, y, ancho, alto, TIPOS_PLATAFORMA[tipo]
+
+    def iter_enemigos(self) -> Iterator[Tuple[int, int, str]]:
+        datos = iter(self.enemigos)
+        for x, y, tipo in zip(datos, datos, datos):
+            yield x, y, TIPOS_ENEMIGO[tipo]
+
+    def iter_monedas(self) -> Iterator[Tuple[int, int, float]]:
+        datos = iter(self.monedas)
+        for x, y, probabilidad in zip(datos, datos, datos):
+            yield x, y, probabilidad / _ESCALA_PROBABILIDAD
+
+    def iter_powerups(self) -> Iterator[Tuple[int, int, str]]:
+        datos = iter(self.powerups)
+        for x, y, tipo in zip(datos, datos, datos):
+            yield x, y, TIPOS_POWERUP[tipo]
+
+
+def ruta_nivel(numero: int, directorio: str = NIVELES_DIR) -> str:
+    """Devuelve la ruta del fichero JSON de un nivel."""
+    return os.path.join(directorio, f"nivel_{numero}.json")
+
+
+def contar_niveles(directorio: str = NIVELES_DIR) -> int:
+    """
+    Cuenta los niveles consecutivos disponibles empezando por el 1.
+
+    Args:
+        directorio: Carpeta con los ficheros ``nivel_N.json``
+
+    Returns:
+        int: Número del último nivel sin huecos
+    """
+    numero = 0
+    while os.path.exists(ruta_nivel(numero + 1, directorio)):
+        numero += 1
+    return numero
+
+
+def _tipo(tabla: Tuple[str, ...], tipo: str) -> int:
+    try:
+        return tabla.index(tipo)
+    except ValueError:
+        raise ValueError(f"tipo desconocido {tipo!r}") from None
+
+
+def leer_json(ruta: str) -> DatosNivel:
+    """
+    Lee y valida la descripción declarativa de un nivel.
+
+    Args:
+        ruta: Ruta del fichero JSON
+
+    Returns:
+        DatosNivel: El nivel en formato compacto
+
+    Raises:
+        ValueError: Si el fichero no tiene el formato esperado
+    """
+    with open(ruta, encoding='utf-8') as fichero:
+        nivel = json.load(fichero)
+
+    try:
+        datos = DatosNivel(int(nivel['ancho_mapa']))
+        for x, y, ancho, alto, tipo in nivel.get('plataformas', ()):
+            datos.plataformas.extend((x, y, ancho, alto, _tipo(TIPOS_PLATAFORMA, tipo)))
+        for x, y, tipo in nivel.get('enemigos', ()):
+            datos.enemigos.extend((x, y, _tipo(TIPOS_ENEMIGO, tipo)))
+        for moneda in nivel.get('monedas', ()):
+            x, y = moneda[:2]
+            probabilidad = moneda[2] if len(moneda) > 2 else 1
+            datos.monedas.extend((x, y, round(probabilidad * _ESCALA_PROBABILIDAD)))
+        for x, y, tipo in nivel.get('powerups', ()):
+            datos.powerups.extend((x, y, _tipo(TIPOS_POWERUP, tipo)))
+        if nivel.get('bandera'):
+            x, y = nivel['bandera']
+            datos.bandera = (int(x), int(y))
+        if nivel.get('fondo'):
+            datos.fondo = ConfigFondo.desde_json(nivel['fondo'])
+    except (AttributeError, KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"{ruta}: formato de nivel no válido ({error})") from error
+    return datos
+
+
+def _escribir_cache(ruta: str, datos: DatosNivel, estado: os.stat_result) -> None:
+    secciones = [datos.plataformas, datos.enemigos, datos.monedas, datos.powerups,
+                 datos.fondo.a_array()]
+    registros = bytearray()
+    for seccion in secciones:
+        if sys.byteorder == 'big':
+            seccion = array('i', seccion)
+            seccion.byteswap()
+        registros += seccion.tobytes()
+    bandera_x, bandera_y = datos.bandera or (0, 0)
+    cabecera = _CABECERA.pack(FIRMA, VERSION, estado.st_mtime_ns, estado.st_size,
+                              zlib.crc32(registros), datos.ancho_mapa, datos.bandera is not None,
+                              bandera_x, bandera_y, *(len(s) for s in secciones))
+
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as fichero:
+        fichero.write(cabecera)
+        fichero.write(registros)
+    os.replace(temporal, ruta)
+
+
+def _leer_cache(ruta: str, estado: os.stat_result) -> Optional[DatosNivel]:
+    try:
+        with open(ruta, 'rb') as fichero:
+            contenido = fichero.read()
+    except OSError:
+        return None
+    if len(contenido) < _CABECERA.size:
+        return None
+
+    (firma, version, mtime, tamano, crc, ancho_mapa, hay_bandera, bandera_x, bandera_y,
+     *longitudes) = _CABECERA.unpack_from(contenido)
+    # La caché sólo vale si el JSON no ha cambiado desde que se compiló
+    if (firma, version, mtime, tamano) != (FIRMA, VERSION, estado.st_mtime_ns, estado.st_size):
+        return None
+    # Un fichero truncado o dañado se descarta y se recompila el JSON
+    if (len(contenido) != _CABECERA.size + array('i').itemsize * sum(longitudes)
+            or zlib.crc32(memoryview(contenido)[_CABECERA.size:]) != crc):
+        return None
+
+    datos = DatosNivel(ancho_mapa, bandera=(bandera_x, bandera_y) if hay_bandera else None)
+    fondo = array('i')
+    posicion = _CABECERA.size
+    for seccion, longitud in zip((datos.plataformas, datos.enemigos,
+                                  datos.monedas, datos.powerups, fondo), longitudes):
+        fin = posicion + longitud * seccion.itemsize
+        seccion.frombytes(contenido[posicion:fin])
+        if sys.byteorder == 'big':
+            seccion.byteswap()
+        posicion = fin
+    datos.fondo = ConfigFondo.desde_array(fondo)
+    return datos
+
+
+def cargar_nivel(numero: int, directorio: str = NIVELES_DIR,
+                 directorio_cache: str = NIVELES_CACHE_DIR) -> DatosNivel:
+    """
+    Carga un nivel, usando la caché binaria si sigue siendo válida.
+
+    Si el JSON es más reciente que la caché (o ésta no existe) se vuelve a
+    compilar y se guarda para las siguientes cargas.
+
+    Args:
+        numero: Número del nivel
+        directorio: Carpeta con los JSON de los niveles
+        directorio_cache: Carpeta donde se guardan los niveles compilados
+
+    Returns:
+        DatosNivel: El nivel listo para instanciar sus entidades
+    """
+    ruta = ruta_nivel(numero, directorio)
+    estado = os.stat(ruta)
+    ruta_cache = os.path.join(directorio_cache, f"nivel_{numero}.bin")
+
+    datos = _leer_cache(ruta_cache, estado)
+    if datos is None:
+        datos = leer_json(ruta)
+        try:
+            _escribir_cache(ruta_cache, datos, estado)
+        except OSError:
+            # Sin permisos de escritura se sigue funcionando sin caché
+            pass
+    return datos
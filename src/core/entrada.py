@@ -0,0 +1,46 @@
+import pygame
+
+# Bits de la máscara de entrada de un tick de simulación
+IZQUIERDA = 1
+DERECHA = 2
+SALTO = 4
+PAUSA = 8
+REINICIAR = 16
+
+# Teclas que disparan una acción una sola vez al pulsarse
+TECLAS_EVENTO = {
+    pygame.K_SPACE: SALTO,
+    pygame.K_p: PAUSA,
+    pygame.K_r: REINICIAR,
+}
+
+
+def leer_teclado() -> int:
+    """
+    Lee las teclas de movimiento mantenidas en este momento.
+
+    Returns:
+        int: Máscara con los bits IZQUIERDA y/o DERECHA
+    """
+    teclas = pygame.key.get_pressed()
+    entrada = 0
+    if teclas[pygame.K_LEFT] or teclas[pygame.K_a]:
+        entrada |= IZQUIERDA
+    if teclas[pygame.K_RIGHT] or teclas[pygame.K_d]:
+        entrada |= DERECHA
+    return entrada
+
+
+def bits_evento(evento: pygame.event.Event) -> int:
+    """
+    Traduce una pulsación de tecla a los bits de acción correspondientes.
+
+    Args:
+        evento: Evento de pygame
+
+    Returns:
+        int: Bits de SALTO, PAUSA o REINICIAR, o 0 si no aplica
+    """
+    if evento.type == pygame.KEYDOWN:
+        return TECLAS_EVENTO.get(evento.key, 0)
+    return 0
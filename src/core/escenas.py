@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from src.utils.texto import CacheTexto, Color, cache_texto
+
+
+class Escena:
+    """
+    Pantalla estática (menú, pausa, game over) compuesta una sola vez.
+
+    Los textos fijos se renderizan al componer la escena y cada frame se
+    copian con un único ``blits``. Los textos dinámicos (la puntuación
+    final, por ejemplo) tienen un hueco con nombre y se pasan al dibujar;
+    salen de la caché de textos, así que sólo se renderizan al cambiar.
+
+    Una escena con fondo opaco se aplana en una sola superficie. Con
+    ``alfa_fondo`` el fondo es un velo semitransparente sobre el juego y los
+    textos se copian encima, igual que si se dibujara todo cada frame.
+
+    Attributes:
+        tamano (tuple): Ancho y alto de la escena
+        color_fondo (tuple): Color del fondo, o None para no tener fondo
+        alfa_fondo (int): Opacidad del fondo, o None si es opaco
+    """
+
+    def __init__(self, tamano: Tuple[int, int], color_fondo: Optional[Color] = None,
+                 alfa_fondo: Optional[int] = None, cache: CacheTexto = cache_texto) -> None:
+        self.tamano = tamano
+        self.color_fondo = color_fondo
+        self.alfa_fondo = alfa_fondo
+        self.cache = cache
+        self._textos: List[Tuple[pygame.font.Font, str, Color, Tuple[int, int]]] = []
+        self._dinamicos: Dict[str, Tuple[pygame.font.Font, Color, Tuple[int, int]]] = {}
+        self._blits: Optional[List[Tuple[pygame.Surface, pygame.Rect]]] = None
+
+    def texto(self, fuente: pygame.font.Font, texto: str, color: Color,
+              centro: Tuple[int, int]) -> None:
+        """
+        Añade un texto fijo centrado en un punto.
+
+        Args:
+            fuente: Fuente del texto
+            texto: Texto a mostrar
+            color: Color del texto
+            centro: Centro del texto en la escena
+        """
+        self._textos.append((fuente, texto, color, centro))
+        self._blits = None
+
+    def texto_dinamico(self, nombre: str, fuente: pygame.font.Font, color: Color,
+                       centro: Tuple[int, int]) -> None:
+        """
+        Reserva un hueco para un texto que se indica al dibujar.
+
+        Args:
+            nombre: Nombre del argumento de ``dibujar`` con el texto
+            fuente: Fuente del texto
+            color: Color del texto
+            centro: Centro del texto en la escena
+        """
+        self._dinamicos[nombre] = (fuente, color, centro)
+
+    def _componer(self) -> List[Tuple[pygame.Surface, pygame.Rect]]:
+        blits = []
+        fondo = None
+        if self.color_fondo is not None:
+            fondo = pygame.Surface(self.tamano)
+            if pygame.display.get_surface() is not None:
+                fondo = fondo.convert()
+            fondo.fill(self.color_fondo)
+            if self.alfa_fondo is not None:
+                fondo.set_alpha(self.alfa_fondo)
+            blits.append((fondo, fondo.get_rect()))
+
+        for fuente, texto, color, centro in self._textos:
+            superficie = fuente.render(texto, True, color)
+            rect = superficie.get_rect(center=centro)
+            if fondo is not None and self.alfa_fondo is None:
+                # Fondo opaco: el texto queda horneado en él
+                fondo.blit(superficie, rect)
+            else:
+                blits.append((superficie, rect))
+        return blits
+
+    def dibujar(self, superficie: pygame.Surface, **dinamicos: str) -> None:
+        """
+        Copia la escena en la superficie de destino.
+
+        Args:
+            superficie: Superficie de destino (la pantalla)
+            **dinamicos: Texto de cada hueco dinámico, por nombre
+        """
+        if self._blits is None:
+            self._blits = self._componer()
+        superficie.blits(self._blits, doreturn=False)
+        for nombre, texto in dinamicos.items():
+            fuente, color, centro = self._dinamicos[nombre]
+            renderizado = self.cache.renderizar(fuente, texto, color)
+            superficie.blit(renderizado, renderizado.get_rect(center=centro))
@@ -0,0 +1,19 @@
+"""
+Eventos que la simulación emite durante un tick.
+
+Las colisiones no se descubren recorriendo todas las entidades en busca de
+banderas: quien detecta algo (Mario al chocar con un bloque, la simulación al
+resolver colisiones) añade un evento ``(tipo, entidad)`` a la lista del tick y
+después se consumen en orden. La lista se vacía al empezar cada tick, así que
+tras ``Simulacion.paso`` contiene lo ocurrido en ese tick (para sonidos,
+efectos o estadísticas).
+"""
+
+# Tipos de evento
+BLOQUE_GOLPEADO = 1
+ENEMIGO_APLASTADO = 2
+MONEDA_RECOGIDA = 3
+POWERUP_RECOGIDO = 4
+MARIO_MUERTO = 5
+NIVEL_COMPLETADO = 6
+SALTO = 7
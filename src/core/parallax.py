@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from src.core.cargador_niveles import ConfigFondo
+from src.utils.constantes import BLANCO
+
+# Las nubes se repiten cada 800px (dos alturas alternas separadas 400px) y
+# las colinas cada 200px, así que una tira de 800px contiene el patrón entero
+ANCHO_TIRA = 800
+
+
+class CapaParallax:
+    """
+    Tira horizontal pre-renderizada que se repite al desplazarse.
+
+    La tira es al menos tan ancha como la pantalla, así que cualquier
+    desplazamiento se cubre con dos ``blit`` como mucho.
+
+    Attributes:
+        tira (pygame.Surface): Contenido de la capa, con color transparente
+        factor (float): Desplazamiento de la capa por píxel de cámara
+        y (int): Altura de la pantalla a la que se dibuja la tira
+    """
+
+    def __init__(self, tira: pygame.Surface, factor: float, y: int) -> None:
+        self.tira = tira
+        self.factor = factor
+        self.y = y
+
+    def dibujar(self, superficie: pygame.Surface, camara_x: int) -> None:
+        """
+        Dibuja la capa desplazada según la cámara.
+
+        Args:
+            superficie: Superficie de destino (la pantalla)
+            camara_x: Posición horizontal de la cámara en el mapa
+        """
+        ancho = self.tira.get_width()
+        x = -(int(camara_x * self.factor) % ancho)
+        superficie.blit(self.tira, (x, self.y))
+        if x + ancho < superficie.get_width():
+            superficie.blit(self.tira, (x + ancho, self.y))
+
+
+# Color transparente de las tiras: con colorkey y RLE el blit sólo copia
+# los tramos opacos, mucho más barato que mezclar alfa por píxel
+COLOR_TRANSPARENTE = (255, 0, 255)
+
+
+def _tira(ancho: int, alto: int) -> pygame.Surface:
+    tira = pygame.Surface((ancho, alto))
+    if pygame.display.get_surface() is not None:
+        tira = tira.convert()
+    tira.fill(COLOR_TRANSPARENTE)
+    tira.set_colorkey(COLOR_TRANSPARENTE, pygame.RLEACCEL)
+    return tira
+
+
+def _capa_nubes(factor: float) -> CapaParallax:
+    # Las nubes ocupan de y=70 a y=150
+    tira = _tira(ANCHO_TIRA, 80)
+    for x, y in ((100, 10), (500, 50)):
+        pygame.draw.ellipse(tira, BLANCO, (x, y, 60, 30))
+        pygame.draw.ellipse(tira, BLANCO, (x + 20, y - 10, 50, 30))
+        pygame.draw.ellipse(tira, BLANCO, (x + 40, y, 60, 30))
+    return CapaParallax(tira, factor, 70)
+
+
+def _capa_colinas(factor: float, color: Tuple[int, int, int]) -> CapaParallax:
+    # Una colina de 200x100 cada 200px a partir de y=480
+    tira = _tira(ANCHO_TIRA, 100)
+    for x in range(0, ANCHO_TIRA, 200):
+        pygame.draw.ellipse(tira, color, (x, 0, 200, 100))
+    return CapaParallax(tira, factor, 480)
+
+
+class FondoParallax:
+    """
+    Fondo de un nivel: cielo fijo y capas de parallax, todo pre-renderizado.
+
+    Attributes:
+        cielo (pygame.Surface): Cielo a pantalla completa (color o degradado)
+        capas (list): Capas de parallax de atrás hacia delante
+    """
+
+    def __init__(self, config: ConfigFondo, tamano: Tuple[int, int]) -> None:
+        self.cielo = pygame.Surface(tamano)
+        if pygame.display.get_surface() is not None:
+            self.cielo = self.cielo.convert()
+        if config.cielo_arriba == config.cielo_abajo:
+            self.cielo.fill(config.cielo_arriba)
+        else:
+            ancho, alto = tamano
+            for y in range(alto):
+                t = y / max(1, alto - 1)
+                color = [round(a + (b - a) * t)
+                         for a, b in zip(config.cielo_arriba, config.cielo_abajo)]
+                self.cielo.fill(color, (0, y, ancho, 1))
+
+        self.capas: List[CapaParallax] = []
+        if config.factor_nubes is not None:
+            self.capas.append(_capa_nubes(config.factor_nubes))
+        if config.factor_colinas is not None:
+            self.capas.append(_capa_colinas(config.factor_colinas, config.color_colinas))
+
+    def dibujar(self, superficie: pygame.Surface, camara_x: int) -> None:
+        """
+        Dibuja el cielo y todas las capas.
+
+        Args:
+            superficie: Superficie de destino (la pantalla)
+            camara_x: Posición horizontal de la cámara en el mapa
+        """
+        superficie.blit(self.cielo, (0, 0))
+        for capa in self.capas:
+            capa.dibujar(superficie, camara_x)
+
+
+# Los fondos se conservan entre reinicios y entre niveles con el mismo aspecto
+_fondos: Dict[Tuple[ConfigFondo, Tuple[int, int]], FondoParallax] = {}
+
+
+def obtener_fondo(config: ConfigFondo, tamano: Tuple[int, int]) -> FondoParallax:
+    """
+    Devuelve el fondo para una configuración, creándolo sólo la primera vez.
+
+    Args:
+        config: Configuración del fondo del nivel
+        tamano: Ancho y alto de la pantalla
+
+    Returns:
+        FondoParallax: Fondo listo para dibujar
+    """
+    fondo: Optional[FondoParallax] = _fondos.get((config, tamano))
+    if fondo is None:
+        fondo = _fondos[(config, tamano)] = FondoParallax(config, tamano)
+    return fondo
@@ -0,0 +1,84 @@
+from typing import Dict, List, Sequence
+
+import pygame
+
+from src.entities.entidad import Entidad
+
+
+class RejillaEspacial:
+    """
+    Índice espacial estático (broad-phase) para las plataformas de un nivel.
+
+    Las plataformas se reparten en columnas de ancho fijo según su posición
+    en x. Como los niveles son largos y bajos, basta con indexar por columna
+    para que cada consulta devuelva sólo un puñado de candidatas en lugar de
+    recorrer la lista completa.
+
+    Attributes:
+        tam_celda (int): Ancho en píxeles de cada columna
+        plataformas (list): Plataformas indexadas, en su orden original
+    """
+
+    TAM_CELDA: int = 128
+
+    def __init__(self, plataformas: Sequence[Entidad],
+                 tam_celda: int = TAM_CELDA) -> None:
+        self.tam_celda = tam_celda
+        self.plataformas = list(plataformas)
+        self._orden: Dict[int, int] = {}
+        self._columnas: Dict[int, List[Entidad]] = {}
+
+        for indice, plataforma in enumerate(self.plataformas):
+            self._orden[id(plataforma)] = indice
+            # Se incluye el borde del tubo, que sobresale 4px
+            inicio = (plataforma.rect.left - 4) // tam_celda
+            fin = (plataforma.rect.right + 4) // tam_celda
+            for columna in range(inicio, fin + 1):
+                self._columnas.setdefault(columna, []).append(plataforma)
+
+    def consultar(self, rect: pygame.Rect) -> List[Entidad]:
+        """
+        Devuelve las plataformas cuyas columnas se solapan con el rectángulo.
+
+        El resultado conserva el orden original de la lista de plataformas,
+        de modo que la resolución de colisiones es idéntica a la del
+        recorrido lineal.
+
+        Args:
+            rect: Rectángulo de búsqueda (normalmente el barrido del movimiento)
+
+        Returns:
+            list: Plataformas candidatas; no debe modificarse
+        """
+        inicio = rect.left // self.tam_celda
+        fin = rect.right // self.tam_celda
+
+        if inicio == fin:
+            return self._columnas.get(inicio, [])
+
+        vistas = {}
+        for columna in range(inicio, fin + 1):
+            for plataforma in self._columnas.get(columna, ()):
+                vistas[id(plataforma)] = plataforma
+
+        orden = self._orden
+        return sorted(vistas.values(), key=lambda p: orden[id(p)])
+
+    def consultar_barrido(self, rect: pygame.Rect, velocidad_x: float,
+                          velocidad_y: float) -> List[Entidad]:
+        """
+        Devuelve las candidatas para un movimiento completo de un tick.
+
+        Args:
+            rect: Rectángulo antes de moverse
+            velocidad_x: Desplazamiento horizontal previsto
+            velocidad_y: Desplazamiento vertical previsto
+
+        Returns:
+            list: Plataformas que pueden tocar al rectángulo durante el tick
+        """
+        barrido = rect.union(rect.move(int(velocidad_x), int(velocidad_y)))
+        return self.consultar(barrido.inflate(2, 2))
+
+    def __len__(self) -> int:
+        return len(self.plataformas)
@@ -0,0 +1,185 @@
+import struct
+import sys
+from array import array
+
+# Cabecera: firma, versión, nivel inicial, opciones de la simulación,
+# semilla, número de ticks e intervalo de hash. Le siguen un byte de entrada
+# por tick y un CRC32 del estado cada ``intervalo_hash`` ticks. El byte de
+# opciones era relleno a cero, así que las repeticiones antiguas se leen como
+# grabadas sin opciones.
+FIRMA = b'MREP'
+VERSION = 1
+_CABECERA = struct.Struct('<4sHBBIIH')
+
+# Bits del byte de opciones
+OPCION_MASCARAS = 1
+
+
+class DivergenciaRepeticion(Exception):
+    """La simulación reproducida no coincide con la grabada."""
+
+    def __init__(self, tick: int, esperado: int, obtenido: int) -> None:
+        super().__init__(f"La repetición diverge en el tick {tick}: "
+                         f"hash {obtenido:08x}, se esperaba {esperado:08x}")
+        self.tick = tick
+        self.esperado = esperado
+        self.obtenido = obtenido
+
+
+class Repeticion:
+    """
+    Entradas por tick de una partida y hashes de control de su estado.
+
+    Attributes:
+        semilla (int): Semilla aleatoria con la que empezó la partida
+        nivel_inicial (int): Nivel en el que empezó la partida
+        intervalo_hash (int): Cada cuántos ticks se guarda un hash
+        mascaras (bool): Si la partida usaba colisión por píxel
+        entradas (bytearray): Máscara de entrada de cada tick
+        hashes (array): CRC32 del estado tras cada intervalo
+    """
+
+    INTERVALO_HASH: int = 60
+
+    def __init__(self, semilla: int, nivel_inicial: int = 1,
+                 intervalo_hash: int = INTERVALO_HASH, mascaras: bool = False) -> None:
+        if intervalo_hash < 1:
+            raise ValueError(f"intervalo de hash no válido: {intervalo_hash}")
+        self.semilla = semilla
+        self.nivel_inicial = nivel_inicial
+        self.intervalo_hash = intervalo_hash
+        self.mascaras = mascaras
+        self.entradas = bytearray()
+        self.hashes = array('I')
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def guardar(self, ruta: str) -> None:
+        """
+        Escribe la repetición en un fichero binario compacto.
+
+        Args:
+            ruta: Ruta del fichero de destino
+        """
+        hashes = array('I', self.hashes)
+        if sys.byteorder == 'big':
+            hashes.byteswap()
+        with open(ruta, 'wb') as fichero:
+            opciones = OPCION_MASCARAS if self.mascaras else 0
+            fichero.write(_CABECERA.pack(FIRMA, VERSION, self.nivel_inicial, opciones,
+                                         self.semilla, len(self.entradas), self.intervalo_hash))
+            fichero.write(self.entradas)
+            fichero.write(hashes.tobytes())
+
+    @classmethod
+    def cargar(cls, ruta: str) -> 'Repeticion':
+        """
+        Lee una repetición guardada con ``guardar``.
+
+        Args:
+            ruta: Ruta del fichero
+
+        Returns:
+            Repeticion: La repetición cargada
+
+        Raises:
+            ValueError: Si el fichero no es una repetición válida
+        """
+        with open(ruta, 'rb') as fichero:
+            datos = fichero.read()
+
+        if len(datos) < _CABECERA.size:
+            raise ValueError(f"{ruta}: fichero de repetición truncado")
+        firma, version, nivel, opciones, semilla, ticks, intervalo = _CABECERA.unpack_from(datos)
+        if firma != FIRMA or version != VERSION:
+            raise ValueError(f"{ruta}: no es una repetición compatible")
+        if intervalo < 1:
+            raise ValueError(f"{ruta}: intervalo de hash no válido ({intervalo})")
+
+        repeticion = cls(semilla, nivel, intervalo, bool(opciones & OPCION_MASCARAS))
+        inicio = _CABECERA.size
+        repeticion.entradas = bytearray(datos[inicio:inicio + ticks])
+        repeticion.hashes.frombytes(datos[inicio + ticks:])
+        if sys.byteorder == 'big':
+            repeticion.hashes.byteswap()
+        if len(repeticion.entradas) != ticks or len(repeticion.hashes) != ticks // intervalo:
+            raise ValueError(f"{ruta}: fichero de repetición truncado")
+        return repeticion
+
+
+class Grabador:
+    """Va acumulando en una Repeticion las entradas de cada tick jugado."""
+
+    def __init__(self, semilla: int, nivel_inicial: int = 1,
+                 intervalo_hash: int = Repeticion.INTERVALO_HASH, mascaras: bool = False) -> None:
+        self.repeticion = Repeticion(semilla, nivel_inicial, intervalo_hash, mascaras)
+
+    def registrar(self, entrada: int, estado) -> None:
+        """
+        Anota la entrada de un tick ya simulado.
+
+        Args:
+            entrada: Máscara de entrada usada en el tick
+            estado: Simulación tras el tick (se usa su ``hash_estado``)
+        """
+        repeticion = self.repeticion
+        repeticion.entradas.append(entrada)
+        if len(repeticion.entradas) % repeticion.intervalo_hash == 0:
+            repeticion.hashes.append(estado.hash_estado())
+
+
+class Reproductor:
+    """Entrega las entradas grabadas tick a tick y verifica los hashes."""
+
+    def __init__(self, repeticion: Repeticion) -> None:
+        self.repeticion = repeticion
+        self.tick = 0
+
+    @property
+    def terminado(self) -> bool:
+        return self.tick >= len(self.repeticion.entradas)
+
+    def siguiente_entrada(self) -> int:
+        """Devuelve la entrada del siguiente tick a simular."""
+        return self.repeticion.entradas[self.tick]
+
+    def comprobar(self, estado) -> None:
+        """
+        Cierra el tick recién simulado y compara el hash si toca.
+
+        Args:
+            estado: Simulación tras aplicar ``siguiente_entrada``
+
+        Raises:
+            DivergenciaRepeticion: Si el estado no coincide con el grabado
+        """
+        self.tick += 1
+        intervalo = self.repeticion.intervalo_hash
+        if self.tick % intervalo == 0:
+            esperado = self.repeticion.hashes[self.tick // intervalo - 1]
+            obtenido = estado.hash_estado()
+            if obtenido != esperado:
+                raise DivergenciaRepeticion(self.tick, esperado, obtenido)
+
+
+def verificar(estado, repeticion: Repeticion, step) -> int:
+    """
+    Reproduce la repetición entera sin límite de velocidad ni render.
+
+    Args:
+        estado: Simulación recién creada con la semilla de la repetición
+        repeticion: Repetición a verificar
+        step: Función ``step(estado, entrada) -> estado`` de la simulación
+
+    Returns:
+        int: Número de ticks reproducidos
+
+    Raises:
+        DivergenciaRepeticion: En el primer hash que no coincida
+    """
+    reproductor = Reproductor(repeticion)
+    while not reproductor.terminado:
+        estado = step(estado, reproductor.siguiente_entrada())
+        reproductor.comprobar(estado)
+    return reproductor.tick
@@ -0,0 +1,122 @@
+from typing import List, Sequence, Set
+
+import pygame
+
+from src.entities.entidad import Entidad
+
+
+class GestorChunks:
+    """
+    Reparte las entidades de un nivel en chunks horizontales.
+
+    Sólo los chunks dentro de un radio alrededor de la cámara están
+    activos: sus entidades forman las listas ``enemigos``, ``monedas`` y
+    ``powerups`` que se actualizan, colisionan y dibujan cada tick. El
+    resto quedan dormidas en su chunk, con su estado intacto, hasta que la
+    cámara se acerca. Así el coste por tick depende del radio y no del
+    largo del mapa.
+
+    Las listas activas se modifican en el sitio, de modo que quien guarde
+    una referencia a ellas (por ejemplo ``Nivel.enemigos``) ve siempre el
+    conjunto activo actual. Para quitar entidades se usa ``retirar``.
+
+    Attributes:
+        ancho_chunk (int): Ancho en píxeles de cada chunk
+        radio (int): Chunks activos a cada lado del chunk central
+        enemigos (list): Enemigos de los chunks activos
+        monedas (list): Monedas de los chunks activos
+        powerups (list): Power-ups de los chunks activos
+    """
+
+    ANCHO_CHUNK: int = 1024
+    RADIO: int = 1
+
+    def __init__(self, ancho_mapa: int, ancho_chunk: int = ANCHO_CHUNK,
+                 radio: int = RADIO) -> None:
+        self.ancho_chunk = ancho_chunk
+        self.radio = radio
+        self.num_chunks = max(1, -(-ancho_mapa // ancho_chunk))
+        self.enemigos: List[Entidad] = []
+        self.monedas: List[Entidad] = []
+        self.powerups: List[Entidad] = []
+        self._activas = (self.enemigos, self.monedas, self.powerups)
+        # Una lista de entidades por chunk para cada tipo
+        self._dormidas = tuple([[] for _ in range(self.num_chunks)] for _ in self._activas)
+        self._inicio = 0
+        self._fin = -1
+        self._centro = None
+
+    def indice(self, x: int) -> int:
+        """Devuelve el chunk que contiene la coordenada x del mapa."""
+        return min(self.num_chunks - 1, max(0, x // self.ancho_chunk))
+
+    def distribuir(self, enemigos: Sequence[Entidad],
+                   monedas: Sequence[Entidad],
+                   powerups: Sequence[Entidad]) -> None:
+        """
+        Coloca todas las entidades del nivel en su chunk. Quedan dormidas
+        hasta la siguiente llamada a ``actualizar``.
+        """
+        for activas, chunks, entidades in zip(self._activas, self._dormidas,
+                                              (enemigos, monedas, powerups)):
+            activas.clear()
+            for chunk in chunks:
+                chunk.clear()
+            for entidad in entidades:
+                chunks[self.indice(entidad.rect.x)].append(entidad)
+        self._inicio = 0
+        self._fin = -1
+        self._centro = None
+
+    def actualizar(self, x: int) -> bool:
+        """
+        Activa los chunks alrededor de una posición y duerme el resto.
+
+        Sólo trabaja cuando la posición cambia de chunk. Las entidades
+        activas vuelven antes al chunk en el que se encuentran ahora, por si
+        se han movido de uno a otro.
+
+        Args:
+            x: Coordenada del mapa en torno a la que activar (centro de la cámara)
+
+        Returns:
+            bool: True si ha cambiado el conjunto activo
+        """
+        centro = self.indice(x)
+        if centro == self._centro:
+            return False
+        self._centro = centro
+        inicio = max(0, centro - self.radio)
+        fin = min(self.num_chunks - 1, centro + self.radio)
+
+        for activas, chunks in zip(self._activas, self._dormidas):
+            for indice in range(self._inicio, self._fin + 1):
+                chunks[indice].clear()
+            for entidad in activas:
+                chunks[self.indice(entidad.rect.x)].append(entidad)
+            activas.clear()
+            for indice in range(inicio, fin + 1):
+                activas.extend(chunks[indice])
+
+        self._inicio = inicio
+        self._fin = fin
+        return True
+
+    def retirar(self, retiradas: Set[Entidad]) -> None:
+        """
+        Quita de las listas activas las entidades retiradas del nivel.
+
+        Pensado para llamarse una vez por tick con todo lo recogido en él:
+        cada lista se compacta en una sola pasada y conserva su orden, en
+        lugar de pagar un ``list.remove`` por entidad.
+
+        Args:
+            retiradas: Entidades a quitar (monedas o power-ups recogidos)
+        """
+        if not retiradas:
+            return
+        for activas in self._activas:
+            activas[:] = [entidad for entidad in activas if entidad not in retiradas]
+
+    def __len__(self) -> int:
+        return self.num_chunks
@@ -1,26 +1,36 @@
 import pygame
 from typing import List, Tuple
 from src.utils.constantes import BLANCO, ROJO, AMARILLO
+from src.entities.entidad import Entidad
 
-class Bandera(pygame.sprite.Sprite):
+class Bandera(Entidad):
     """Clase que representa la bandera de meta al final del nivel."""
     
+    __slots__ = ()
+    
     def __init__(self, x: int, y: int):
-        super().__init__()
         self.rect = pygame.Rect(x, y, 40, 200)
         
-    def dibujar(self, superficie: pygame.Surface) -> None:
-        """Dibuja la bandera con su asta y decoraciones."""
+    def dibujar(self, superficie: pygame.Surface, desplazamiento_x: int = 0) -> None:
+        """
+        Dibuja la bandera con su asta y decoraciones.
+
+        Args:
+            superficie: Superficie de pygame donde se dibujará
+            desplazamiento_x: Posición de la cámara, se resta a la x del mapa
+        """
+        x = self.rect.x - desplazamiento_x
+        y = self.rect.y
         # Asta
         pygame.draw.rect(superficie, BLANCO, 
-                        (self.rect.x + 18, self.rect.y, 4, 200))
+                        (x + 18, y, 4, 200))
         # Bandera
         puntos: List[Tuple[int, int]] = [
-            (self.rect.x + 22, self.rect.y + 10),
-            (self.rect.x + 50, self.rect.y + 25),
-            (self.rect.x + 22, self.rect.y + 40)
+            (x + 22, y + 10),
+            (x + 50, y + 25),
+            (x + 22, y + 40)
         ]
         pygame.draw.polygon(superficie, ROJO, puntos)
         # Punta
         pygame.draw.circle(superficie, AMARILLO, 
-                         (self.rect.x + 20, self.rect.y), 6)
+                         (x + 20, y), 6)
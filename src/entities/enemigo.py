@@ -1,9 +1,12 @@
 import pygame
 from src.utils.constantes import *
+from src.entities.entidad import Entidad
+
+class Enemigo(Entidad):
+    __slots__ = ('tipo', 'ancho', 'alto', 'velocidad_x', 'vivo', 'aplastado',
+                 'animacion_frame', 'animacion_contador')
 
-class Enemigo(pygame.sprite.Sprite):
     def __init__(self, x, y, tipo='goomba'):
-        super().__init__()
         self.tipo = tipo
         self.ancho = 30 if tipo == 'goomba' else 32
         self.alto = 30 if tipo == 'goomba' else 40
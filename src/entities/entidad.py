@@ -0,0 +1,19 @@
+class Entidad:
+    """
+    Base ligera de todas las entidades del juego.
+
+    Las entidades no heredan de ``Sprite``: el juego las dibuja y las
+    colisiona directamente, sin ``pygame.sprite.Group``. Cada subclase declara
+    sus atributos en ``__slots__``: las instancias no llevan ``__dict__`` ni
+    el diccionario de grupos de ``Sprite``, lo que importa en niveles con
+    decenas de miles de monedas y plataformas. Por la misma razón no hace
+    falta (ni se debe) llamar a ``Sprite.__init__`` desde las subclases. Para
+    meter una entidad en un ``Group`` está el adaptador ``SpriteEntidad`` de
+    ``Game1.py``.
+
+    Attributes:
+        rect (pygame.Rect): Rectángulo de colisión en coordenadas del mapa
+    """
+
+    __slots__ = ('rect',)
+
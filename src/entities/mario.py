@@ -1,8 +1,9 @@
 import pygame
 from typing import List, Optional
 from src.utils.constantes import *
+from src.entities.entidad import Entidad
 
-class Mario(pygame.sprite.Sprite):
+class Mario(Entidad):
     """
     Clase que representa al personaje principal Mario.
     
@@ -20,6 +21,9 @@ class Mario(pygame.sprite.Sprite):
         tiene_flor (bool): Estado de fire mario
     """
     
+    __slots__ = ('ancho', 'alto', 'velocidad_x', 'velocidad_y', 'saltando', 'direccion', 'vivo',
+                 'invencible', 'grande', 'tiene_flor', 'animacion_frame', 'animacion_contador')
+    
     # Constantes específicas de Mario
     VELOCIDAD_BASE: float = 5.0
     ALTO_NORMAL: int = 32
@@ -27,7 +31,6 @@ class Mario(pygame.sprite.Sprite):
     TIEMPO_INVENCIBLE: int = 120
     
     def __init__(self, x: int, y: int) -> None:
-        super().__init__()
         self.ancho = 32
         self.alto = self.ALTO_NORMAL
         self.rect = pygame.Rect(x, y, self.ancho, self.alto)
@@ -130,6 +133,13 @@ class Mario(pygame.sprite.Sprite):
         self.crecer()
         self.tiene_flor = True
 
-    def dibujar(self, superficie):
+    def dibujar(self, superficie: pygame.Surface, desplazamiento_x: int = 0) -> None:
+        """
+        Dibuja a Mario.
+
+        Args:
+            superficie: Superficie de pygame donde se dibujará
+            desplazamiento_x: Posición de la cámara, se resta a la x del mapa
+        """
         # ...código existente...
         pass
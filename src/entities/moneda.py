@@ -1,12 +1,14 @@
 import pygame
 from typing import Tuple
 from src.utils.constantes import AMARILLO, NARANJA
+from src.entities.entidad import Entidad
 
-class Moneda(pygame.sprite.Sprite):
+class Moneda(Entidad):
     """Clase que representa una moneda coleccionable en el juego."""
     
+    __slots__ = ('animacion_frame', 'animacion_contador')
+    
     def __init__(self, x: int, y: int):
-        super().__init__()
         self.rect = pygame.Rect(x, y, 20, 20)
         self.animacion_frame = 0
         self.animacion_contador = 0
@@ -18,10 +20,18 @@ class Moneda(pygame.sprite.Sprite):
             self.animacion_frame = (self.animacion_frame + 1) % 4
             self.animacion_contador = 0
     
-    def dibujar(self, superficie: pygame.Surface) -> None:
-        """Dibuja la moneda con efecto de rotación."""
+    def dibujar(self, superficie: pygame.Surface, desplazamiento_x: int = 0) -> None:
+        """
+        Dibuja la moneda con efecto de rotación.
+
+        Args:
+            superficie: Superficie de pygame donde se dibujará
+            desplazamiento_x: Posición de la cámara, se resta a la x del mapa
+        """
+        x = self.rect.x - desplazamiento_x
+        y = self.rect.y
         ancho = 20 - abs(self.animacion_frame - 2) * 5
         pygame.draw.ellipse(superficie, AMARILLO, 
-                          (self.rect.x + (20 - ancho) // 2, self.rect.y, ancho, 20))
+                          (x + (20 - ancho) // 2, y, ancho, 20))
         pygame.draw.ellipse(superficie, NARANJA, 
-                          (self.rect.x + (20 - ancho) // 2, self.rect.y, ancho, 20), 2)
+                          (x + (20 - ancho) // 2, y, ancho, 20), 2)
@@ -1,9 +1,11 @@
 import pygame
 from src.utils.constantes import *
+from src.entities.entidad import Entidad
+
+class PowerUp(Entidad):
+    __slots__ = ('tipo', 'velocidad_x', 'velocidad_y', 'activo')
 
-class PowerUp(pygame.sprite.Sprite):
     def __init__(self, x, y, tipo='hongo'):
-        super().__init__()
         self.tipo = tipo
         self.rect = pygame.Rect(x, y, 24, 24)
         self.velocidad_x = 2
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+import pygame
+
+# Margen alrededor del rect para los detalles que sobresalen (pies, brazos...)
+MARGEN_SPRITE = 16
+
+
+class CacheSprites:
+    """
+    Caché LRU de sprites rasterizados a partir de primitivas de dibujo.
+
+    Las entidades se dibujan con decenas de llamadas a ``pygame.draw`` pero
+    su aspecto sólo depende de una tupla pequeña de estado. Cada estado
+    distinto se rasteriza una vez en una superficie con alfa y a partir de
+    ahí dibujar la entidad es un único ``blit``.
+
+    Attributes:
+        tamano_maximo (int): Número máximo de sprites en memoria
+    """
+
+    TAMANO_MAXIMO: int = 256
+
+    def __init__(self, tamano_maximo: int = TAMANO_MAXIMO) -> None:
+        self.tamano_maximo = tamano_maximo
+        self._sprites: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+
+    def obtener(self, clave: Hashable, tamano: Tuple[int, int],
+                rasterizar: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        """
+        Devuelve el sprite de un estado, rasterizándolo si no está en caché.
+
+        Args:
+            clave: Tupla con todo el estado que afecta al dibujo
+            tamano: Ancho y alto de la superficie a crear
+            rasterizar: Función que dibuja el estado en la superficie dada
+
+        Returns:
+            pygame.Surface: Sprite listo para hacer blit
+        """
+        sprite = self._sprites.get(clave)
+        if sprite is not None:
+            self._sprites.move_to_end(clave)
+            return sprite
+
+        sprite = pygame.Surface(tamano, pygame.SRCALPHA)
+        rasterizar(sprite)
+        # convert_alpha necesita un modo de vídeo activo
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+
+        self._sprites[clave] = sprite
+        if len(self._sprites) > self.tamano_maximo:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def limpiar(self) -> None:
+        """Elimina todos los sprites cacheados."""
+        self._sprites.clear()
+
+    def __contains__(self, clave: Hashable) -> bool:
+        return clave in self._sprites
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+
+# Caché compartida por todas las entidades del juego
+cache_sprites = CacheSprites()
@@ -6,6 +6,11 @@ GAME_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 ASSETS_DIR = os.path.join(GAME_DIR, "src", "assets")
 SPRITES_DIR = os.path.join(ASSETS_DIR, "sprites")
 SOUNDS_DIR = os.path.join(ASSETS_DIR, "sonidos")
+FUENTES_DIR = os.path.join(ASSETS_DIR, "fuentes")
+# Manifiesto y recursos ya convertidos (ver src/utils/recursos.py)
+RECURSOS_CACHE_DIR = os.path.join(ASSETS_DIR, ".cache")
+NIVELES_DIR = os.path.join(ASSETS_DIR, "niveles")
+NIVELES_CACHE_DIR = os.path.join(NIVELES_DIR, ".cache")
 
 # Dimensiones
 ANCHO = 800
@@ -28,11 +33,3 @@ NEGRO = (0, 0, 0)
 VERDE = (0, 200, 0)
 NARANJA = (255, 140, 0)
 VERDE_TUBO = (0, 168, 0)
-
-# Crear directorios necesarios
-def init_directories():
-    for directory in [ASSETS_DIR, SPRITES_DIR, SOUNDS_DIR]:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-
-init_directories()
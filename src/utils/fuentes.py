@@ -0,0 +1,54 @@
+import os
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from src.utils.constantes import FUENTES_DIR
+
+
+class RegistroFuentes:
+    """
+    Fuentes compartidas por todo el juego, creadas la primera vez que se piden.
+
+    Crear un ``pygame.font.Font`` lee y prepara el archivo de la fuente, así
+    que cada combinación de archivo y tamaño se crea una sola vez y la usan
+    todos (el HUD, las pantallas, el perfilador). El módulo ``pygame.font``
+    se inicializa también al pedir la primera fuente, no al importar.
+    """
+
+    def __init__(self, directorio: str = FUENTES_DIR) -> None:
+        self.directorio = directorio
+        self._fuentes: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+    def obtener(self, tamano: int, archivo: Optional[str] = None) -> pygame.font.Font:
+        """
+        Devuelve la fuente de un tamaño, creándola si hace falta.
+
+        Args:
+            tamano: Tamaño en puntos
+            archivo: Archivo de la fuente dentro de ``FUENTES_DIR``, o None
+                para la fuente por defecto de pygame
+
+        Returns:
+            pygame.font.Font: Fuente lista para renderizar
+        """
+        clave = (archivo, tamano)
+        fuente = self._fuentes.get(clave)
+        if fuente is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            ruta = None if archivo is None else os.path.join(self.directorio, archivo)
+            fuente = pygame.font.Font(ruta, tamano)
+            self._fuentes[clave] = fuente
+        return fuente
+
+    def limpiar(self) -> None:
+        """Olvida todas las fuentes creadas."""
+        self._fuentes.clear()
+
+    def __len__(self) -> int:
+        return len(self._fuentes)
+
+
+# Registro compartido por todo el juego
+fuentes = RegistroFuentes()
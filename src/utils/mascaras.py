@@ -0,0 +1,77 @@
+from typing import Dict, Hashable, Optional
+
+import pygame
+
+from src.utils.cache_sprites import MARGEN_SPRITE, cache_sprites
+
+
+class CacheMascaras:
+    """
+    Máscaras de colisión por píxel, una por estado de sprite.
+
+    La máscara de una entidad sale de su sprite (los píxeles opacos) y se
+    guarda con la misma clave que el sprite: tipo, fotograma y tamaño. Se
+    genera la primera vez que se pide y después cada comprobación es un
+    ``Mask.overlap`` entre dos máscaras ya hechas. Sólo debe usarse cuando
+    los rectángulos ya se tocan, como fase estrecha.
+    """
+
+    def __init__(self) -> None:
+        self._mascaras: Dict[Hashable, pygame.mask.Mask] = {}
+
+    def obtener(self, entidad) -> pygame.mask.Mask:
+        """
+        Devuelve la máscara del estado actual de una entidad.
+
+        Args:
+            entidad: Entidad con ``clave_sprite`` y ``rasterizar``
+
+        Returns:
+            pygame.mask.Mask: Máscara del sprite dentro de su rect, del tamaño
+            del sprite con su margen
+        """
+        clave = entidad.clave_sprite()
+        mascara = self._mascaras.get(clave)
+        if mascara is None:
+            rect = entidad.rect
+            sprite = cache_sprites.obtener(clave,
+                                           (rect.width + 2 * MARGEN_SPRITE, rect.height + 2 * MARGEN_SPRITE),
+                                           entidad.rasterizar)
+            # Lo que el dibujo saca fuera del rect (en el margen) no colisiona:
+            # la máscara sólo afina la caja, nunca la amplía
+            caja = pygame.mask.Mask(sprite.get_size())
+            caja.draw(pygame.mask.Mask(rect.size, fill=True), (MARGEN_SPRITE, MARGEN_SPRITE))
+            mascara = pygame.mask.from_surface(sprite).overlap_mask(caja, (0, 0))
+            self._mascaras[clave] = mascara
+        return mascara
+
+    def solapan(self, a, b, y_a: Optional[int] = None) -> bool:
+        """
+        Indica si los píxeles opacos de dos entidades se tocan.
+
+        Args:
+            a: Primera entidad
+            b: Segunda entidad
+            y_a: Posición vertical con la que probar ``a`` en lugar de la
+                actual (por ejemplo, la del tick anterior)
+
+        Returns:
+            bool: True si alguna pareja de píxeles opacos coincide
+        """
+        if y_a is None:
+            y_a = a.rect.y
+        # Los dos sprites llevan el mismo margen, así que el desplazamiento
+        # entre máscaras es el de los rectángulos
+        desplazamiento = (b.rect.x - a.rect.x, b.rect.y - y_a)
+        return self.obtener(a).overlap(self.obtener(b), desplazamiento) is not None
+
+    def limpiar(self) -> None:
+        """Elimina todas las máscaras cacheadas."""
+        self._mascaras.clear()
+
+    def __len__(self) -> int:
+        return len(self._mascaras)
+
+
+# Caché compartida por todas las entidades del juego
+cache_mascaras = CacheMascaras()
@@ -0,0 +1,266 @@
+"""
+Sistema de partículas con un pool de capacidad fija en arrays de NumPy.
+
+Posiciones, velocidades y vidas de todas las partículas viven en arrays
+preasignados; las vivas ocupan siempre el principio, así que integrarlas es
+un puñado de operaciones vectorizadas y retirar las muertas una compactación
+con máscara, sin crear ni destruir objetos. Se dibujan con un único
+``Surface.blits`` de sprites ya rasterizados (uno por tipo y nivel de
+desvanecimiento, en la caché de sprites). NumPy no es obligatorio: sin él
+``NUMPY_DISPONIBLE`` es False y el sistema no emite nada.
+"""
+import math
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import pygame
+
+from src.core import eventos as ev
+from src.utils.cache_sprites import cache_sprites
+from src.utils.constantes import AMARILLO, BLANCO, MARRON
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy es una dependencia opcional
+    np = None
+
+NUMPY_DISPONIBLE = np is not None
+
+Color = Tuple[int, int, int]
+
+
+class TipoParticula(NamedTuple):
+    """Aspecto de un tipo de partícula."""
+    color: Color
+    tamano: int
+    redonda: bool = True
+
+
+class Emisor(NamedTuple):
+    """Ráfaga de partículas que se lanza desde un punto."""
+    tipo: str
+    cantidad: int
+    # Rangos (mínimo, máximo) de los que se sortea cada partícula
+    velocidad: Tuple[float, float]
+    # Grados; 0 es hacia la derecha y 90 hacia arriba
+    angulo: Tuple[float, float]
+    vida: Tuple[int, int]
+    gravedad: float = 0.0
+
+
+TIPOS: Dict[str, TipoParticula] = {
+    'polvo': TipoParticula((200, 190, 170), 6),
+    'destello': TipoParticula(AMARILLO, 4),
+    'ladrillo': TipoParticula(MARRON, 5, redonda=False),
+    'estrella': TipoParticula(BLANCO, 4),
+}
+
+# Ráfaga que lanza cada tipo de evento de la simulación desde su entidad
+EMISOR_EVENTO: Dict[int, Emisor] = {
+    ev.ENEMIGO_APLASTADO: Emisor('polvo', 10, (1.0, 3.0), (0, 180), (15, 30), 0.05),
+    ev.MONEDA_RECOGIDA: Emisor('destello', 12, (1.5, 4.0), (0, 360), (20, 40)),
+    ev.BLOQUE_GOLPEADO: Emisor('ladrillo', 8, (2.0, 5.0), (30, 150), (25, 45), 0.4),
+    ev.POWERUP_RECOGIDO: Emisor('estrella', 16, (1.0, 3.0), (0, 360), (30, 50), -0.02),
+}
+
+
+class SistemaParticulas:
+    """
+    Pool de partículas con presupuestos fijos de emisión y de dibujo.
+
+    ``capacidad`` es el máximo de partículas vivas: lo que se emite con el
+    pool lleno se descarta. Además cada tick admite como mucho
+    ``presupuesto_emision`` partículas nuevas y cada frame dibuja como mucho
+    ``presupuesto_dibujo`` (las de dentro de la pantalla, repartidas a
+    intervalos regulares si sobran), de modo que el coste por frame está
+    acotado aunque el pool esté lleno: la integración es vectorizada y sólo
+    los ``blits`` crecen con el número de partículas.
+
+    Attributes:
+        capacidad (int): Partículas vivas como máximo
+        presupuesto_emision (int): Partículas nuevas por tick como máximo
+        presupuesto_dibujo (int): Partículas dibujadas por frame como máximo
+        niveles (int): Pasos de desvanecimiento (sprites por tipo)
+        vivas (int): Partículas vivas, al principio de los arrays
+        dibujadas (int): Partículas dibujadas en el último frame
+        descartadas (int): Partículas no emitidas por falta de sitio o de presupuesto
+    """
+
+    CAPACIDAD: int = 10000
+    PRESUPUESTO_EMISION: int = 1000
+    PRESUPUESTO_DIBUJO: int = 1500
+    NIVELES: int = 4
+
+    def __init__(self, capacidad: int = CAPACIDAD,
+                 presupuesto_emision: int = PRESUPUESTO_EMISION,
+                 presupuesto_dibujo: int = PRESUPUESTO_DIBUJO,
+                 niveles: int = NIVELES, tipos: Dict[str, TipoParticula] = TIPOS,
+                 semilla: Optional[int] = None) -> None:
+        self.capacidad = capacidad if NUMPY_DISPONIBLE else 0
+        self.presupuesto_emision = presupuesto_emision
+        self.presupuesto_dibujo = presupuesto_dibujo
+        self.niveles = niveles
+        self.tipos = tipos
+        self._indice_tipo = {nombre: i for i, nombre in enumerate(tipos)}
+        self.vivas = 0
+        self.dibujadas = 0
+        self.descartadas = 0
+        self._emitidas_tick = 0
+        if not NUMPY_DISPONIBLE:
+            return
+        # El azar de las partículas es sólo visual: no toca el de la simulación
+        self._rng = np.random.default_rng(semilla)
+        self.x = np.zeros(capacidad, dtype=np.float32)
+        self.y = np.zeros(capacidad, dtype=np.float32)
+        self.vx = np.zeros(capacidad, dtype=np.float32)
+        self.vy = np.zeros(capacidad, dtype=np.float32)
+        self.gravedad = np.zeros(capacidad, dtype=np.float32)
+        self.vida = np.zeros(capacidad, dtype=np.int16)
+        self.vida_total = np.ones(capacidad, dtype=np.int16)
+        self.tipo = np.zeros(capacidad, dtype=np.int16)
+        self._arrays = (self.x, self.y, self.vx, self.vy, self.gravedad,
+                        self.vida, self.vida_total, self.tipo)
+        # Mitad del tamaño de cada tipo, para dibujar centrado
+        self._medio = np.array([t.tamano // 2 for t in tipos.values()], dtype=np.int32)
+
+    def emitir(self, emisor: Emisor, x: float, y: float) -> int:
+        """
+        Lanza una ráfaga desde un punto del mapa.
+
+        Args:
+            emisor: Ráfaga a lanzar
+            x, y: Punto de salida en coordenadas del mapa
+
+        Returns:
+            int: Partículas emitidas (menos que ``emisor.cantidad`` si no caben)
+        """
+        cantidad = min(emisor.cantidad, self.capacidad - self.vivas,
+                       self.presupuesto_emision - self._emitidas_tick)
+        self.descartadas += emisor.cantidad - max(0, cantidad)
+        if cantidad <= 0:
+            return 0
+        inicio, fin = self.vivas, self.vivas + cantidad
+        rng = self._rng
+        angulo = np.radians(rng.uniform(*emisor.angulo, cantidad))
+        velocidad = rng.uniform(*emisor.velocidad, cantidad)
+        vida = rng.integers(emisor.vida[0], emisor.vida[1] + 1, cantidad)
+        self.x[inicio:fin] = x
+        self.y[inicio:fin] = y
+        self.vx[inicio:fin] = np.cos(angulo) * velocidad
+        # El eje y de la pantalla crece hacia abajo
+        self.vy[inicio:fin] = -np.sin(angulo) * velocidad
+        self.gravedad[inicio:fin] = emisor.gravedad
+        self.vida[inicio:fin] = vida
+        self.vida_total[inicio:fin] = vida
+        self.tipo[inicio:fin] = self._indice_tipo[emisor.tipo]
+        self.vivas = fin
+        self._emitidas_tick += cantidad
+        return cantidad
+
+    def procesar(self, eventos: Iterable[Tuple[int, object]]) -> None:
+        """
+        Lanza las ráfagas de los eventos de un tick desde el centro de su entidad.
+
+        Args:
+            eventos: Lista ``(tipo, entidad)`` de ``Simulacion.eventos``
+        """
+        if not self.capacidad:
+            return
+        for tipo, entidad in eventos:
+            emisor = EMISOR_EVENTO.get(tipo)
+            if emisor is not None and entidad is not None:
+                self.emitir(emisor, *entidad.rect.center)
+
+    def actualizar(self) -> None:
+        """Avanza un tick: integra todas las partículas y retira las que mueren."""
+        self._emitidas_tick = 0
+        n = self.vivas
+        if not n:
+            return
+        vy = self.vy[:n]
+        vy += self.gravedad[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += vy
+        vida = self.vida[:n]
+        vida -= 1
+        siguen = vida > 0
+        quedan = int(np.count_nonzero(siguen))
+        if quedan < n:
+            # Compactación: las vivas vuelven a ocupar el principio, en orden
+            for array in self._arrays:
+                array[:quedan] = array[:n][siguen]
+            self.vivas = quedan
+
+    def vaciar(self) -> None:
+        """Elimina todas las partículas (al cambiar o reiniciar el nivel)."""
+        self.vivas = 0
+        self._emitidas_tick = 0
+
+    def _sprites(self) -> list:
+        # Un sprite por tipo y nivel de desvanecimiento, de más a menos opaco
+        sprites = []
+        for nombre, tipo in self.tipos.items():
+            for nivel in range(self.niveles):
+                alfa = 255 * (nivel + 1) // self.niveles
+
+                def rasterizar(superficie, tipo=tipo, alfa=alfa):
+                    color = (*tipo.color, alfa)
+                    if tipo.redonda:
+                        pygame.draw.circle(superficie, color, (tipo.tamano / 2, tipo.tamano / 2), tipo.tamano / 2)
+                    else:
+                        superficie.fill(color)
+
+                sprites.append(cache_sprites.obtener(('particula', nombre, nivel),
+                                                     (tipo.tamano, tipo.tamano), rasterizar))
+        return sprites
+
+    def dibujar(self, superficie: pygame.Surface, desplazamiento_x: int = 0) -> Optional[pygame.Rect]:
+        """
+        Dibuja las partículas visibles con un solo ``blits``.
+
+        Args:
+            superficie: Superficie de destino
+            desplazamiento_x: Posición de la cámara
+
+        Returns:
+            pygame.Rect: Zona que cubre todo lo dibujado, o None si no se ha
+            dibujado nada
+        """
+        self.dibujadas = 0
+        n = self.vivas
+        if not n:
+            return None
+        tipo = self.tipo[:n]
+        medio = self._medio[tipo]
+        x = self.x[:n].astype(np.int32) - medio - desplazamiento_x
+        y = self.y[:n].astype(np.int32) - medio
+        ancho, alto = superficie.get_size()
+        visibles = np.flatnonzero((x > -16) & (x < ancho) & (y > -16) & (y < alto))
+        if len(visibles) > self.presupuesto_dibujo:
+            visibles = visibles[::math.ceil(len(visibles) / self.presupuesto_dibujo)]
+        if not len(visibles):
+            return None
+
+        x = x[visibles]
+        y = y[visibles]
+        # Cuanta menos vida queda, más transparente
+        nivel = (self.vida[visibles].astype(np.int32) * self.niveles - 1) // self.vida_total[visibles]
+        indice = tipo[visibles].astype(np.int32) * self.niveles + nivel
+        sprites = self._sprites()
+        superficie.blits(zip(map(sprites.__getitem__, indice.tolist()),
+                             zip(x.tolist(), y.tolist())), doreturn=False)
+        self.dibujadas = len(visibles)
+        izquierda, arriba = int(x.min()), int(y.min())
+        return pygame.Rect(izquierda, arriba, int(x.max()) + 16 - izquierda,
+                           int(y.max()) + 16 - arriba).clip(superficie.get_rect())
+
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Resume el estado del pool para el perfilador.
+
+        Returns:
+            dict: Partículas vivas, dibujadas en el último frame y descartadas
+        """
+        return {'vivas': self.vivas, 'dibujadas': self.dibujadas, 'descartadas': self.descartadas}
+
+    def __len__(self) -> int:
+        return self.vivas
@@ -0,0 +1,278 @@
+import csv
+import json
+import math
+from array import array
+from time import perf_counter
+from typing import Callable, Dict, Optional, Sequence
+
+import pygame
+
+from src.utils.fuentes import fuentes
+
+# Color de cada fase en la gráfica del overlay
+COLORES_FASE = {
+    'entrada': (200, 200, 200),
+    'mario': (255, 80, 80),
+    'enemigos': (160, 82, 45),
+    'colisiones': (255, 165, 0),
+    'sonidos': (255, 105, 180),
+    'particulas': (0, 150, 136),
+    'fondo': (135, 206, 235),
+    'entidades': (34, 200, 34),
+    'hud': (255, 255, 0),
+    'flip': (180, 120, 255),
+}
+
+
+class Perfilador:
+    """
+    Mide cuánto tarda cada fase de un frame y guarda una ventana deslizante.
+
+    El frame se reparte con marcas: ``marcar(fase)`` suma a la fase el tiempo
+    transcurrido desde la marca anterior, así que cada fase cuesta una sola
+    llamada a ``perf_counter``. El tiempo que no es trabajo (la espera del
+    reloj, el propio overlay) se descarta con ``descartar``. Desactivado, cada
+    marca es una comprobación de un atributo.
+
+    Otros subsistemas pueden añadir sus propios contadores (lo que han
+    cargado, cuánto tardaron...) con ``registrar``: se consultan sólo al
+    resumir, y aparecen en el overlay y en el JSON exportado.
+
+    Attributes:
+        fases (tuple): Nombres de las fases en orden de dibujo en la gráfica
+        ventana (int): Número de frames que se conservan
+        activo (bool): Si se están tomando medidas
+    """
+
+    FASES = tuple(COLORES_FASE)
+    VENTANA: int = 300
+    # Presupuesto de un frame a 60 FPS, en milisegundos
+    PRESUPUESTO_MS: float = 1000 / 60
+    # Frames entre cada actualización del texto del overlay
+    REFRESCO_TEXTO: int = 30
+    ALTO_GRAFICA: int = 80
+
+    def __init__(self, fases: Sequence[str] = FASES, ventana: int = VENTANA,
+                 activo: bool = False) -> None:
+        self.fases = tuple(fases)
+        self.ventana = ventana
+        self.activo = activo
+        self._indice_fase = {fase: i for i, fase in enumerate(self.fases)}
+        self._actual = array('d', [0.0]) * len(self.fases)
+        # Un buffer circular por fase más el total del frame, en milisegundos
+        self._muestras = [array('d', [0.0]) * ventana for _ in self.fases]
+        self._totales = array('d', [0.0]) * ventana
+        self._posicion = 0
+        self.frames = 0
+        self._marca = 0.0
+        self._grafica: Optional[pygame.Surface] = None
+        self._texto: Optional[pygame.Surface] = None
+        self._fuente: Optional[pygame.font.Font] = None
+        self._contadores: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def registrar(self, nombre: str, contadores: Callable[[], Dict[str, float]]) -> None:
+        """
+        Añade un grupo de contadores externos al resumen.
+
+        Args:
+            nombre: Nombre del grupo (por ejemplo, ``'sonidos'``)
+            contadores: Función que devuelve los valores actuales del grupo
+        """
+        self._contadores[nombre] = contadores
+
+    def alternar(self) -> None:
+        """Activa o desactiva las medidas (y el overlay)."""
+        self.activo = not self.activo
+        self._marca = perf_counter()
+
+    def iniciar_frame(self) -> None:
+        """Empieza a medir un frame nuevo."""
+        if not self.activo:
+            return
+        actual = self._actual
+        for i in range(len(actual)):
+            actual[i] = 0.0
+        self._marca = perf_counter()
+
+    def marcar(self, fase: str) -> None:
+        """
+        Atribuye a una fase el tiempo transcurrido desde la marca anterior.
+
+        Args:
+            fase: Nombre de la fase que acaba de terminar
+        """
+        if not self.activo:
+            return
+        ahora = perf_counter()
+        self._actual[self._indice_fase[fase]] += ahora - self._marca
+        self._marca = ahora
+
+    def descartar(self) -> None:
+        """Ignora el tiempo transcurrido desde la última marca."""
+        if self.activo:
+            self._marca = perf_counter()
+
+    def terminar_frame(self) -> None:
+        """Guarda las medidas del frame actual en la ventana."""
+        if not self.activo:
+            return
+        posicion = self._posicion
+        total = 0.0
+        for muestras, segundos in zip(self._muestras, self._actual):
+            muestras[posicion] = segundos * 1000
+            total += segundos * 1000
+        self._totales[posicion] = total
+        self._posicion = (posicion + 1) % self.ventana
+        self.frames += 1
+        if self._grafica is not None:
+            self._anadir_columna()
+
+    def _validas(self, muestras: array) -> list:
+        # Valores en orden cronológico, sólo los ya escritos
+        if self.frames < self.ventana:
+            return list(muestras[:self.frames])
+        return list(muestras[self._posicion:]) + list(muestras[:self._posicion])
+
+    def percentil(self, p: float) -> float:
+        """
+        Devuelve el percentil ``p`` (0-100) del tiempo total por frame.
+
+        Args:
+            p: Percentil a calcular
+
+        Returns:
+            float: Milisegundos, o 0 si aún no hay medidas
+        """
+        totales = sorted(self._validas(self._totales))
+        if not totales:
+            return 0.0
+        rango = max(1, math.ceil(p / 100 * len(totales)))
+        return totales[rango - 1]
+
+    def resumen(self) -> Dict[str, object]:
+        """
+        Resume la ventana actual.
+
+        Returns:
+            dict: Frames medidos, p50/p95/p99 y peor frame en milisegundos, la
+            fase que más pesó en ese peor frame, la media de cada fase y los
+            contadores registrados
+        """
+        totales = self._validas(self._totales)
+        por_fase = [self._validas(muestras) for muestras in self._muestras]
+        resumen = {
+            'frames': len(totales),
+            'p50': self.percentil(50),
+            'p95': self.percentil(95),
+            'p99': self.percentil(99),
+            'peor': max(totales, default=0.0),
+            'fase_peor': None,
+            'media_fases': {fase: (sum(valores) / len(valores) if valores else 0.0)
+                            for fase, valores in zip(self.fases, por_fase)},
+            'contadores': {nombre: contadores() for nombre, contadores in self._contadores.items()},
+        }
+        if totales:
+            peor = totales.index(resumen['peor'])
+            resumen['fase_peor'] = max(self.fases,
+                                       key=lambda fase: por_fase[self._indice_fase[fase]][peor])
+        return resumen
+
+    def exportar_csv(self, ruta: str) -> None:
+        """
+        Escribe un frame por fila con el tiempo de cada fase y el total.
+
+        Args:
+            ruta: Ruta del fichero CSV
+        """
+        columnas = [self._validas(muestras) for muestras in self._muestras]
+        totales = self._validas(self._totales)
+        with open(ruta, 'w', newline='', encoding='utf-8') as fichero:
+            escritor = csv.writer(fichero)
+            escritor.writerow(('frame',) + self.fases + ('total',))
+            primero = self.frames - len(totales)
+            for i, total in enumerate(totales):
+                escritor.writerow([primero + i] + [f"{c[i]:.4f}" for c in columnas] + [f"{total:.4f}"])
+
+    def exportar_json(self, ruta: str) -> None:
+        """
+        Escribe el resumen y los tiempos de cada frame en formato JSON.
+
+        Args:
+            ruta: Ruta del fichero JSON
+        """
+        datos = {
+            'resumen': self.resumen(),
+            'fases': {fase: self._validas(muestras)
+                      for fase, muestras in zip(self.fases, self._muestras)},
+            'totales': self._validas(self._totales),
+        }
+        with open(ruta, 'w', encoding='utf-8') as fichero:
+            json.dump(datos, fichero, indent=1)
+
+    def exportar(self, ruta: str) -> None:
+        """Exporta en JSON o CSV según la extensión de la ruta."""
+        if ruta.lower().endswith('.json'):
+            self.exportar_json(ruta)
+        else:
+            self.exportar_csv(ruta)
+
+    def _anadir_columna(self) -> None:
+        # La gráfica se desplaza un píxel y sólo se pinta la columna nueva
+        grafica = self._grafica
+        alto = self.ALTO_GRAFICA
+        escala = alto / (2 * self.PRESUPUESTO_MS)
+        x = grafica.get_width() - 1
+        grafica.scroll(-1, 0)
+        grafica.fill((0, 0, 0, 160), (x, 0, 1, alto))
+        y = alto
+        posicion = (self._posicion - 1) % self.ventana
+        for fase, muestras in zip(self.fases, self._muestras):
+            altura = muestras[posicion] * escala
+            if altura >= 0.5:
+                y_nueva = max(0.0, y - altura)
+                grafica.fill(COLORES_FASE.get(fase, (255, 255, 255)),
+                             (x, round(y_nueva), 1, round(y) - round(y_nueva)))
+                y = y_nueva
+        # Línea del presupuesto de 60 FPS a media altura
+        grafica.set_at((x, alto // 2), (255, 255, 255))
+
+    def _componer_texto(self) -> pygame.Surface:
+        resumen = self.resumen()
+        lineas = [
+            f"p50 {resumen['p50']:.2f}  p95 {resumen['p95']:.2f}  p99 {resumen['p99']:.2f} ms",
+            f"peor {resumen['peor']:.2f} ms ({resumen['fase_peor'] or '-'})",
+        ]
+        lineas.extend(f"{fase:<10} {media:6.3f}" for fase, media in resumen['media_fases'].items())
+        for nombre, valores in resumen['contadores'].items():
+            lineas.append(f"{nombre}:")
+            lineas.extend(f"  {clave:<18} {valor:8.4g}" for clave, valor in valores.items())
+        alto_linea = self._fuente.get_linesize()
+        texto = pygame.Surface((self.ventana, alto_linea * len(lineas)), pygame.SRCALPHA)
+        texto.fill((0, 0, 0, 160))
+        for i, linea in enumerate(lineas):
+            color = COLORES_FASE.get(linea.split(' ', 1)[0], (255, 255, 255))
+            texto.blit(self._fuente.render(linea, True, color), (4, i * alto_linea))
+        return texto
+
+    def dibujar(self, superficie: pygame.Surface) -> Optional[pygame.Rect]:
+        """
+        Dibuja la gráfica de tiempos por fase y el resumen en una esquina.
+
+        Args:
+            superficie: Superficie de destino (la pantalla)
+
+        Returns:
+            pygame.Rect: Zona ocupada por el overlay, o None si está desactivado
+        """
+        if not self.activo:
+            return None
+        if self._grafica is None:
+            self._grafica = pygame.Surface((self.ventana, self.ALTO_GRAFICA), pygame.SRCALPHA)
+            self._grafica.fill((0, 0, 0, 160))
+            self._fuente = fuentes.obtener(18)
+        if self._texto is None or self.frames % self.REFRESCO_TEXTO == 0:
+            self._texto = self._componer_texto()
+
+        x = superficie.get_width() - self.ventana - 10
+        grafica = superficie.blit(self._grafica, (x, 60))
+        return grafica.union(superficie.blit(self._texto, (x, 60 + self.ALTO_GRAFICA + 4)))
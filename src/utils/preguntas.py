@@ -0,0 +1,176 @@
+import json
+import random
+from array import array
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+Grupo = Tuple[int, Optional[str]]
+
+
+class Palabra(NamedTuple):
+    """Una palabra del vocabulario."""
+    ingles: str
+    emoji: str
+    categoria: str
+    nivel: int
+
+
+class CursorPermutacion:
+    """
+    Recorre ``0..n-1`` en orden aleatorio sin repetir hasta agotarlos.
+
+    Es un Fisher–Yates perezoso: en lugar de barajar los ``n`` índices de
+    golpe, cada extracción sortea una posición entre las que quedan y sólo
+    anota los intercambios que ha hecho. Crear el cursor no cuesta nada,
+    cada extracción es O(1) y la memoria crece con lo extraído, no con
+    ``n``. Al agotarse empieza una vuelta nueva con otro orden.
+
+    Attributes:
+        total (int): Número de elementos a recorrer
+        restantes (int): Elementos que quedan en la vuelta actual
+        vueltas (int): Vueltas completadas
+    """
+
+    def __init__(self, total: int, rng: random.Random) -> None:
+        if total <= 0:
+            raise ValueError("el cursor necesita al menos un elemento")
+        self.total = total
+        self.restantes = total
+        self.vueltas = 0
+        self._rng = rng
+        self._intercambios: Dict[int, int] = {}
+
+    def siguiente(self) -> int:
+        """Devuelve el siguiente índice de la permutación."""
+        if self.restantes == 0:
+            self.restantes = self.total
+            self.vueltas += 1
+            self._intercambios.clear()
+        intercambios = self._intercambios
+        posicion = self._rng.randrange(self.restantes)
+        ultimo = self.restantes - 1
+        elegido = intercambios.get(posicion, posicion)
+        # La posición elegida pasa a contener el último de los que quedan
+        intercambios[posicion] = intercambios.pop(ultimo, ultimo)
+        self.restantes = ultimo
+        return elegido
+
+
+class BancoPreguntas:
+    """
+    Vocabulario indexado por nivel y categoría, con distractores precalculados.
+
+    Al construirlo cada palabra recibe un identificador (su posición) y se
+    anota en los grupos ``(nivel, categoria)`` y ``(nivel, None)``, de modo
+    que las palabras de un grupo se obtienen sin filtrar el vocabulario.
+
+    Los distractores salen de un orden barajado de cada grupo, fijado al
+    construir el banco: los candidatos de una palabra son las que la siguen
+    en ese orden, primero en su categoría y después, si la categoría es
+    pequeña, en todo su nivel. Basta con guardar la posición de cada palabra
+    en esos órdenes (memoria lineal) y pedir distractores es O(opciones).
+
+    Attributes:
+        palabras (list): Palabras del banco; el índice es su identificador
+    """
+
+    def __init__(self, palabras: Iterable[Palabra], semilla: Optional[int] = None) -> None:
+        rng = random.Random(semilla)
+        self.palabras: List[Palabra] = []
+        vistas = set()
+        self._grupos: Dict[Grupo, array] = {}
+        for palabra in palabras:
+            # Una palabra repetida daría opciones iguales en la misma pregunta
+            if palabra.ingles in vistas:
+                continue
+            vistas.add(palabra.ingles)
+            identificador = len(self.palabras)
+            self.palabras.append(palabra)
+            for grupo in ((palabra.nivel, palabra.categoria), (palabra.nivel, None)):
+                if grupo not in self._grupos:
+                    self._grupos[grupo] = array('I')
+                self._grupos[grupo].append(identificador)
+
+        # Orden barajado de cada grupo y posición de cada palabra en el de su
+        # categoría y en el de su nivel
+        self._ordenes: Dict[Grupo, array] = {}
+        self._posicion_categoria = array('I', bytes(4 * len(self.palabras)))
+        self._posicion_nivel = array('I', bytes(4 * len(self.palabras)))
+        for grupo, identificadores in self._grupos.items():
+            orden = list(identificadores)
+            rng.shuffle(orden)
+            self._ordenes[grupo] = array('I', orden)
+            posiciones = self._posicion_nivel if grupo[1] is None else self._posicion_categoria
+            for posicion, identificador in enumerate(orden):
+                posiciones[identificador] = posicion
+
+    @classmethod
+    def desde_diccionario(cls, vocabulario: Mapping[str, Mapping],
+                          semilla: Optional[int] = None) -> 'BancoPreguntas':
+        """
+        Crea el banco a partir de ``{ingles: {'emoji', 'categoria', 'nivel'}}``.
+
+        Args:
+            vocabulario: Propiedades de cada palabra en inglés
+            semilla: Semilla del orden de los distractores
+
+        Returns:
+            BancoPreguntas: Banco con todas las palabras
+        """
+        return cls((Palabra(ingles, datos['emoji'], datos.get('categoria', 'general'), int(datos['nivel']))
+                    for ingles, datos in vocabulario.items()), semilla)
+
+    @classmethod
+    def desde_json(cls, ruta: str, semilla: Optional[int] = None) -> 'BancoPreguntas':
+        """Carga el banco de un JSON con el formato de ``desde_diccionario``."""
+        with open(ruta, encoding='utf-8') as fichero:
+            return cls.desde_diccionario(json.load(fichero), semilla)
+
+    def grupo(self, nivel: int, categoria: Optional[str] = None) -> array:
+        """
+        Devuelve los identificadores de un nivel, o de una categoría del nivel.
+
+        Args:
+            nivel: Nivel de dificultad
+            categoria: Categoría, o None para todo el nivel
+
+        Returns:
+            array: Identificadores de las palabras (vacío si no hay ninguna)
+        """
+        return self._grupos.get((nivel, categoria), array('I'))
+
+    def categorias(self, nivel: int) -> List[str]:
+        """Devuelve las categorías que tienen palabras en un nivel."""
+        return [categoria for grupo_nivel, categoria in self._grupos
+                if grupo_nivel == nivel and categoria is not None]
+
+    def distractores(self, identificador: int, cantidad: int) -> List[int]:
+        """
+        Devuelve palabras distintas de una dada para usarlas como opciones falsas.
+
+        Args:
+            identificador: Palabra correcta
+            cantidad: Número de distractores
+
+        Returns:
+            list: Identificadores de los distractores, de su misma categoría
+            mientras haya y después de su mismo nivel; menos de ``cantidad``
+            sólo si el nivel no tiene suficientes palabras
+        """
+        palabra = self.palabras[identificador]
+        elegidos: List[int] = []
+        for grupo, posiciones in (((palabra.nivel, palabra.categoria), self._posicion_categoria),
+                                  ((palabra.nivel, None), self._posicion_nivel)):
+            orden = self._ordenes[grupo]
+            inicio = posiciones[identificador]
+            # Las siguientes del orden barajado, dando la vuelta; se descartan
+            # la propia palabra y las ya elegidas en la categoría
+            for paso in range(1, len(orden)):
+                if len(elegidos) == cantidad:
+                    return elegidos
+                candidato = orden[(inicio + paso) % len(orden)]
+                if candidato not in elegidos:
+                    elegidos.append(candidato)
+        return elegidos
+
+    def __len__(self) -> int:
+        return len(self.palabras)
@@ -0,0 +1,135 @@
+import random
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from src.utils.preguntas import BancoPreguntas, CursorPermutacion, Grupo, Palabra
+
+
+class ConfigNivel(NamedTuple):
+    """Dificultad de un nivel del quiz."""
+    nombre: str
+    opciones: int
+    # Segundos para responder, o None si no hay límite
+    tiempo: Optional[int]
+
+
+NIVELES: Dict[int, ConfigNivel] = {
+    1: ConfigNivel('Principiante', 3, None),
+    2: ConfigNivel('Fácil', 4, None),
+    3: ConfigNivel('Intermedio', 5, 15),
+    4: ConfigNivel('Avanzado', 6, 12),
+    5: ConfigNivel('Experto', 8, 10),
+}
+
+
+class Pregunta(NamedTuple):
+    """Una ronda: el emoji a adivinar y las palabras entre las que elegir."""
+    palabra: Palabra
+    opciones: Tuple[str, ...]
+    correcta: int
+    tiempo: Optional[int]
+
+
+class GestorQuiz:
+    """
+    Reparte preguntas a un alumno sin repetir palabras hasta agotar su grupo.
+
+    Cada alumno tiene un ``CursorPermutacion`` por grupo ``(nivel,
+    categoria)`` que usa, creado la primera vez que se pide una pregunta de
+    ese grupo. Sacar la palabra de una ronda es una extracción del cursor y
+    sus opciones falsas salen de los distractores precalculados del banco,
+    así que empezar una ronda no depende del tamaño del vocabulario ni de
+    cuántas palabras se hayan usado ya.
+
+    Attributes:
+        banco (BancoPreguntas): Vocabulario compartido entre alumnos
+        nivel (int): Nivel actual
+        categoria (str): Categoría a la que se limitan las preguntas, o None
+        puntuacion (int): Puntos acumulados
+        aciertos (int): Respuestas correctas en el nivel actual
+    """
+
+    # Aciertos necesarios para pasar al siguiente nivel
+    ACIERTOS_NIVEL: int = 10
+    PUNTOS_ACIERTO: int = 10
+
+    def __init__(self, banco: BancoPreguntas, nivel: int = 1,
+                 categoria: Optional[str] = None, semilla: Optional[int] = None) -> None:
+        self.banco = banco
+        self.nivel = nivel
+        self.categoria = categoria
+        self.puntuacion = 0
+        self.aciertos = 0
+        self._rng = random.Random(semilla)
+        self._cursores: Dict[Grupo, CursorPermutacion] = {}
+
+    @property
+    def config(self) -> ConfigNivel:
+        """Opciones y tiempo del nivel actual."""
+        return NIVELES[self.nivel]
+
+    def _cursor(self) -> CursorPermutacion:
+        grupo = (self.nivel, self.categoria)
+        cursor = self._cursores.get(grupo)
+        if cursor is None:
+            total = len(self.banco.grupo(*grupo))
+            if not total:
+                raise ValueError(f"no hay palabras para el nivel {self.nivel}"
+                                 + (f" y la categoría {self.categoria}" if self.categoria else ""))
+            cursor = self._cursores[grupo] = CursorPermutacion(total, self._rng)
+        return cursor
+
+    def restantes(self) -> int:
+        """Palabras del grupo actual que aún no han salido en esta vuelta."""
+        return self._cursor().restantes
+
+    def nueva_pregunta(self) -> Pregunta:
+        """
+        Prepara la siguiente ronda del grupo actual.
+
+        Returns:
+            Pregunta: Palabra, opciones barajadas (la correcta en
+            ``correcta``) y tiempo límite del nivel
+        """
+        config = self.config
+        identificador = self.banco.grupo(self.nivel, self.categoria)[self._cursor().siguiente()]
+        palabras = self.banco.palabras
+        opciones = [palabras[i].ingles for i in self.banco.distractores(identificador, config.opciones - 1)]
+        correcta = self._rng.randrange(len(opciones) + 1)
+        opciones.insert(correcta, palabras[identificador].ingles)
+        return Pregunta(palabras[identificador], tuple(opciones), correcta, config.tiempo)
+
+    def responder(self, pregunta: Pregunta, eleccion: Optional[int]) -> bool:
+        """
+        Corrige una respuesta y sube de nivel al llegar a ``ACIERTOS_NIVEL``.
+
+        Args:
+            pregunta: Pregunta respondida
+            eleccion: Índice de la opción elegida, o None si se agotó el tiempo
+
+        Returns:
+            bool: True si la respuesta es correcta
+        """
+        correcta = eleccion == pregunta.correcta
+        if correcta:
+            self.puntuacion += self.PUNTOS_ACIERTO * self.nivel
+            self.aciertos += 1
+            siguiente = self.nivel + 1
+            if self.aciertos >= self.ACIERTOS_NIVEL and siguiente in NIVELES:
+                # Se sigue en la misma categoría si el nivel siguiente la tiene
+                self.cambiar_nivel(siguiente, self.categoria if self.banco.grupo(siguiente, self.categoria) else None)
+        return correcta
+
+    def cambiar_nivel(self, nivel: int, categoria: Optional[str] = None) -> None:
+        """
+        Pasa a otro nivel (y categoría). Los cursores de cada grupo se
+        conservan, así que volver a un grupo continúa su vuelta sin repetir.
+
+        Args:
+            nivel: Nivel nuevo
+            categoria: Categoría a la que limitar las preguntas, o None
+        """
+        if nivel not in NIVELES:
+            raise ValueError(f"nivel desconocido: {nivel}")
+        self.nivel = nivel
+        self.categoria = categoria
+        self.aciertos = 0
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from src.utils.constantes import FUENTES_DIR, RECURSOS_CACHE_DIR, SOUNDS_DIR, SPRITES_DIR
+
+# Carpeta de cada tipo de recurso y extensiones que se reconocen al explorarla
+DIRECTORIOS = {
+    'imagen': SPRITES_DIR,
+    'sonido': SOUNDS_DIR,
+    'fuente': FUENTES_DIR,
+}
+EXTENSIONES = {
+    'imagen': ('.png', '.jpg', '.jpeg', '.bmp', '.gif'),
+    'sonido': ('.wav', '.ogg', '.mp3', '.flac'),
+    'fuente': ('.ttf', '.otf'),
+}
+MANIFIESTO = 'manifiesto.json'
+# Se incrementa si cambia el formato de los ficheros convertidos
+VERSION_CACHE = 1
+HILOS = 4
+
+Clave = Tuple[str, str, Optional[int]]
+
+
+class GestorRecursos:
+    """
+    Carga imágenes, sonidos y fuentes en un pool de hilos.
+
+    ``solicitar`` sólo encola la carga y vuelve enseguida, así que la primera
+    pantalla se dibuja sin esperar a ningún recurso: ``progreso`` permite
+    mostrar una barra mientras tanto y ``obtener`` espera únicamente al
+    recurso que se pide, si aún no está.
+
+    Las rutas se resuelven siempre a partir de ``SPRITES_DIR``,
+    ``SOUNDS_DIR`` y ``FUENTES_DIR``, nunca del directorio de trabajo.
+
+    Un manifiesto guarda el hash del contenido de cada archivo (junto con su
+    fecha y tamaño, para no tener que releerlo si no ha cambiado) y el
+    fichero convertido que le corresponde: los píxeles en RGBA de una imagen
+    o las muestras de un sonido en el formato del mezclador. Si el hash
+    coincide se carga el convertido, que no necesita decodificarse; si no,
+    se decodifica el original y se vuelve a convertir. Las fuentes no tienen
+    forma convertida y siempre se leen del original.
+
+    Un archivo que falta no se avisa (los hilos mezclarían los mensajes y el
+    juego funciona sin él): ``obtener`` devuelve None y se cuenta en
+    ``ausentes``. Sí se avisa de los que existen pero no se pueden leer.
+
+    Attributes:
+        directorio_cache (str): Carpeta del manifiesto y los convertidos
+        directorios (dict): Carpeta de la que se lee cada tipo de recurso
+    """
+
+    def __init__(self, directorio_cache: str = RECURSOS_CACHE_DIR, hilos: int = HILOS,
+                 directorios: Optional[Dict[str, str]] = None) -> None:
+        self.directorio_cache = directorio_cache
+        self.directorios = dict(DIRECTORIOS, **(directorios or {}))
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='recursos')
+        self._futuros: Dict[Clave, Future] = {}
+        self._listos: Dict[Clave, object] = {}
+        self._candado = threading.Lock()
+        self._manifiesto = self._leer_manifiesto()
+        self._manifiesto_modificado = False
+        self.completados = 0
+        self.desde_cache = 0
+        self.ausentes = 0
+        self.segundos_carga = 0.0
+
+    def ruta(self, tipo: str, archivo: str) -> str:
+        """Devuelve la ruta absoluta de un archivo de recurso."""
+        return os.path.join(self.directorios[tipo], archivo)
+
+    def solicitar(self, tipo: str, archivo: str, tamano: Optional[int] = None) -> Clave:
+        """
+        Encola la carga de un recurso si no estaba ya pedido.
+
+        Args:
+            tipo: ``'imagen'``, ``'sonido'`` o ``'fuente'``
+            archivo: Nombre del archivo dentro de la carpeta de su tipo
+            tamano: Tamaño en puntos, sólo para las fuentes
+
+        Returns:
+            tuple: Clave del recurso
+        """
+        clave = (tipo, archivo, tamano)
+        if clave not in self._futuros:
+            self._futuros[clave] = self._pool.submit(self._cargar, clave)
+        return clave
+
+    def solicitar_carpeta(self, tipo: str) -> List[Clave]:
+        """
+        Encola todos los archivos reconocidos de la carpeta de un tipo.
+
+        Las fuentes no se exploran porque cada una se pide con su tamaño.
+
+        Args:
+            tipo: ``'imagen'`` o ``'sonido'``
+
+        Returns:
+            list: Claves de los recursos encolados
+        """
+        try:
+            archivos = sorted(os.listdir(self.directorios[tipo]))
+        except FileNotFoundError:
+            return []
+        return [self.solicitar(tipo, archivo) for archivo in archivos
+                if archivo.lower().endswith(EXTENSIONES[tipo])]
+
+    @property
+    def progreso(self) -> float:
+        """Fracción de los recursos pedidos que ya han terminado (1 si no hay)."""
+        if not self._futuros:
+            return 1.0
+        return self.completados / len(self._futuros)
+
+    @property
+    def listo(self) -> bool:
+        """Si han terminado todas las cargas pedidas."""
+        return self.completados == len(self._futuros)
+
+    def obtener(self, tipo: str, archivo: str, tamano: Optional[int] = None):
+        """
+        Devuelve un recurso, pidiéndolo y esperándolo si hace falta.
+
+        Las imágenes se convierten al formato de la pantalla aquí, en el hilo
+        principal, la primera vez que se obtienen.
+
+        Args:
+            tipo: ``'imagen'``, ``'sonido'`` o ``'fuente'``
+            archivo: Nombre del archivo dentro de la carpeta de su tipo
+            tamano: Tamaño en puntos, sólo para las fuentes
+
+        Returns:
+            Surface, Sound o Font, o None si el archivo falta o no se puede leer
+        """
+        clave = self.solicitar(tipo, archivo, tamano)
+        if clave in self._listos:
+            return self._listos[clave]
+        recurso = self._futuros[clave].result()
+        if tipo == 'imagen' and recurso is not None and pygame.display.get_surface() is not None:
+            recurso = recurso.convert_alpha()
+        self._listos[clave] = recurso
+        return recurso
+
+    def esperar(self) -> None:
+        """Espera a todas las cargas pedidas y guarda el manifiesto si ha cambiado."""
+        for futuro in list(self._futuros.values()):
+            futuro.result()
+        self.guardar_manifiesto()
+
+    def cerrar(self) -> None:
+        """Espera a las cargas en curso y libera los hilos."""
+        self._pool.shutdown(wait=True)
+        self.guardar_manifiesto()
+
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Resume la carga para el perfilador.
+
+        Returns:
+            dict: Recursos pedidos, terminados, leídos de la caché y ausentes,
+            y milisegundos de carga sumados entre todos los hilos
+        """
+        return {
+            'pedidos': len(self._futuros),
+            'cargados': self.completados,
+            'desde_cache': self.desde_cache,
+            'ausentes': self.ausentes,
+            'ms_carga': self.segundos_carga * 1000,
+        }
+
+    # -- Trabajo en los hilos --------------------------------------------
+
+    def _cargar(self, clave: Clave):
+        tipo, archivo, tamano = clave
+        ruta = self.ruta(tipo, archivo)
+        inicio = perf_counter()
+        recurso = None
+        convertido = False
+        try:
+            recurso, convertido = self._cargar_archivo(tipo, ruta, tamano)
+        except FileNotFoundError:
+            # Los recursos que faltan sólo se cuentan: el juego funciona sin ellos
+            pass
+        except (pygame.error, OSError, ValueError) as error:
+            print(f"No se pudo cargar {ruta}: {error}")
+        with self._candado:
+            self.segundos_carga += perf_counter() - inicio
+            self.completados += 1
+            self.desde_cache += convertido
+            self.ausentes += recurso is None
+        return recurso
+
+    def _cargar_archivo(self, tipo: str, ruta: str, tamano: Optional[int]):
+        # Devuelve (recurso, si salió del fichero convertido)
+        if tipo == 'fuente':
+            return pygame.font.Font(ruta, tamano), False
+
+        estado = os.stat(ruta)
+        nombre = os.path.relpath(ruta, os.path.dirname(self.directorios[tipo]))
+        with self._candado:
+            entrada = self._manifiesto.get(nombre)
+        if entrada is not None and (entrada['mtime'], entrada['bytes']) == (estado.st_mtime_ns, estado.st_size):
+            resumen = entrada['hash']
+        else:
+            with open(ruta, 'rb') as fichero:
+                resumen = hashlib.blake2b(fichero.read(), digest_size=16).hexdigest()
+
+        formato = self._formato(tipo)
+        if entrada is not None and entrada['hash'] == resumen and entrada['formato'] == formato:
+            recurso = self._leer_convertido(tipo, entrada)
+            if recurso is not None:
+                self._anotar(nombre, dict(entrada, mtime=estado.st_mtime_ns, bytes=estado.st_size))
+                return recurso, True
+
+        if tipo == 'imagen':
+            recurso = pygame.image.load(ruta)
+            datos = pygame.image.tobytes(recurso, 'RGBA')
+            medidas = list(recurso.get_size())
+        else:
+            recurso = pygame.mixer.Sound(ruta)
+            datos = recurso.get_raw()
+            medidas = None
+        convertido = self._escribir_convertido(resumen, datos)
+        self._anotar(nombre, {'hash': resumen, 'mtime': estado.st_mtime_ns, 'bytes': estado.st_size,
+                              'formato': formato, 'medidas': medidas, 'convertido': convertido})
+        return recurso, False
+
+    @staticmethod
+    def _formato(tipo: str):
+        # Los sonidos convertidos sólo sirven para el mismo formato de mezclador
+        if tipo == 'sonido':
+            return list(pygame.mixer.get_init() or ())
+        return ['RGBA', VERSION_CACHE]
+
+    def _leer_convertido(self, tipo: str, entrada: dict):
+        # None si no se puede usar: el llamador decodifica el original y lo reescribe
+        try:
+            ruta = os.path.join(self.directorio_cache, entrada['convertido'])
+            with open(ruta, 'rb') as fichero:
+                datos = fichero.read()
+        except (OSError, TypeError):
+            return None
+        try:
+            if tipo == 'imagen':
+                return pygame.image.frombytes(datos, tuple(entrada['medidas']), 'RGBA')
+            return pygame.mixer.Sound(buffer=datos)
+        except (pygame.error, TypeError, ValueError):
+            # Truncado o dañado: se borra para que no se vuelva a intentar
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            return None
+
+    def _escribir_convertido(self, resumen: str, datos: bytes) -> Optional[str]:
+        # La caché es opcional: si no se puede escribir se decodificará otra vez
+        nombre = f"{resumen}.bin"
+        ruta = os.path.join(self.directorio_cache, nombre)
+        try:
+            os.makedirs(self.directorio_cache, exist_ok=True)
+            temporal = f"{ruta}.{threading.get_ident()}.tmp"
+            with open(temporal, 'wb') as fichero:
+                fichero.write(datos)
+            os.replace(temporal, ruta)
+        except OSError:
+            return None
+        return nombre
+
+    def _anotar(self, nombre: str, entrada: dict) -> None:
+        with self._candado:
+            if self._manifiesto.get(nombre) != entrada:
+                self._manifiesto[nombre] = entrada
+                self._manifiesto_modificado = True
+
+    # -- Manifiesto --------------------------------------------------------
+
+    def _leer_manifiesto(self) -> Dict[str, dict]:
+        try:
+            with open(os.path.join(self.directorio_cache, MANIFIESTO), encoding='utf-8') as fichero:
+                datos = json.load(fichero)
+        except (OSError, ValueError):
+            return {}
+        if datos.get('version') != VERSION_CACHE:
+            return {}
+        return datos.get('recursos', {})
+
+    def guardar_manifiesto(self) -> None:
+        """Escribe el manifiesto si alguna carga lo ha cambiado."""
+        with self._candado:
+            if not self._manifiesto_modificado:
+                return
+            datos = {'version': VERSION_CACHE, 'recursos': dict(self._manifiesto)}
+            self._manifiesto_modificado = False
+        ruta = os.path.join(self.directorio_cache, MANIFIESTO)
+        try:
+            os.makedirs(self.directorio_cache, exist_ok=True)
+            with open(ruta + '.tmp', 'w', encoding='utf-8') as fichero:
+                json.dump(datos, fichero, indent=1, sort_keys=True)
+            os.replace(ruta + '.tmp', ruta)
+        except OSError:
+            pass
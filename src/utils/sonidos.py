@@ -0,0 +1,268 @@
+import os
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import pygame
+
+from src.core import eventos as ev
+from src.utils.constantes import SOUNDS_DIR
+from src.utils.recursos import GestorRecursos
+
+
+class Efecto(NamedTuple):
+    """Un efecto de sonido del catálogo."""
+    archivo: str
+    categoria: str
+    # Tiempo mínimo entre dos reproducciones; las que llegan antes se ignoran
+    intervalo_ms: int = 0
+
+
+# Canales del mezclador reservados para cada categoría
+CANALES_CATEGORIA: Dict[str, int] = {
+    'jugador': 1,
+    'recogidas': 2,
+    'enemigos': 2,
+    'avisos': 1,
+}
+
+EFECTOS: Dict[str, Efecto] = {
+    'salto': Efecto('salto.wav', 'jugador'),
+    'moneda': Efecto('moneda.wav', 'recogidas', 60),
+    'powerup': Efecto('powerup.wav', 'recogidas', 100),
+    'aplastar': Efecto('aplastar.wav', 'enemigos', 50),
+    'bloque': Efecto('bloque.wav', 'enemigos', 80),
+    'muerte': Efecto('muerte.wav', 'avisos'),
+    'nivel_completado': Efecto('nivel_completado.wav', 'avisos'),
+}
+
+# Efecto que suena con cada tipo de evento de la simulación
+EFECTO_EVENTO: Dict[int, str] = {
+    ev.SALTO: 'salto',
+    ev.MONEDA_RECOGIDA: 'moneda',
+    ev.POWERUP_RECOGIDO: 'powerup',
+    ev.ENEMIGO_APLASTADO: 'aplastar',
+    ev.BLOQUE_GOLPEADO: 'bloque',
+    ev.MARIO_MUERTO: 'muerte',
+    ev.NIVEL_COMPLETADO: 'nivel_completado',
+}
+
+
+class BancoSonidos:
+    """
+    Efectos de sonido decodificados una sola vez y reproducidos por categoría.
+
+    Cada efecto se decodifica a un ``pygame.mixer.Sound`` la primera vez que
+    se pide (o antes, con ``precargar``) y se guarda en el banco. Un archivo
+    que falta no es un error, porque el juego funciona sin sonido: no se
+    avisa, se cuenta como ausente en ``estadisticas`` y no se vuelve a
+    buscar. Sólo se avisa de los archivos que existen pero no se pueden
+    decodificar.
+
+    Con un ``GestorRecursos`` la decodificación pasa a sus hilos:
+    ``precargar`` sólo la encola y el primer uso espera a que termine. Cada
+    categoría tiene sus propios canales reservados del mezclador, así que
+    una lluvia de monedas nunca deja sin canal al salto: cuando todos los
+    canales de la categoría están ocupados se reutiliza el que lleva más
+    tiempo sonando. Además cada efecto tiene un intervalo mínimo entre
+    reproducciones, de modo que treinta monedas seguidas no disparan treinta
+    sonidos.
+
+    La música no pasa por el banco: ``musica`` la reproduce en streaming con
+    ``pygame.mixer.music`` en lugar de decodificarla entera en memoria. Una
+    pista que falta también se cuenta como ausente sin avisar.
+
+    Sin mezclador (sin dispositivo de audio) todas las operaciones son nulas.
+
+    Attributes:
+        directorio (str): Carpeta de la que se leen los archivos
+        disponible (bool): Si hay mezclador con el que sonar
+        segundos_decodificacion (float): Tiempo total gastado decodificando (sin
+            gestor de recursos; con él lo mide el gestor)
+        bytes_decodificados (int): Memoria ocupada por las muestras del banco
+        omitidos (int): Reproducciones ignoradas por el intervalo mínimo
+    """
+
+    def __init__(self, efectos: Dict[str, Efecto] = EFECTOS,
+                 canales: Dict[str, int] = CANALES_CATEGORIA,
+                 directorio: str = SOUNDS_DIR,
+                 reloj: Callable[[], int] = lambda: int(perf_counter() * 1000),
+                 recursos: Optional[GestorRecursos] = None) -> None:
+        self.efectos = efectos
+        self.directorio = directorio
+        self.recursos = recursos
+        self._reloj = reloj
+        self._sonidos: Dict[str, Optional[pygame.mixer.Sound]] = {}
+        self._ultima_vez: Dict[str, int] = {}
+        self._canales: Dict[str, List[pygame.mixer.Channel]] = {}
+        self._inicio_canal: Dict[int, int] = {}
+        self._musica: Optional[str] = None
+        self._pistas_ausentes: Set[str] = set()
+        self.segundos_decodificacion = 0.0
+        self.bytes_decodificados = 0
+        self.omitidos = 0
+
+        self.disponible = self._iniciar_mezclador()
+        if self.disponible:
+            # Los canales reservados van primero y Sound.play nunca los toma
+            reservados = sum(canales.values())
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reservados + 4))
+            pygame.mixer.set_reserved(reservados)
+            indice = 0
+            for categoria, numero in canales.items():
+                self._canales[categoria] = [pygame.mixer.Channel(indice + i) for i in range(numero)]
+                indice += numero
+
+    @staticmethod
+    def _iniciar_mezclador() -> bool:
+        if pygame.mixer.get_init() is None:
+            try:
+                pygame.mixer.init()
+            except pygame.error:
+                return False
+        return True
+
+    def obtener(self, clave: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Devuelve el sonido decodificado de un efecto, decodificándolo si hace falta.
+
+        Args:
+            clave: Nombre del efecto en el catálogo
+
+        Returns:
+            pygame.mixer.Sound: El sonido, o None si no hay mezclador o falta el archivo
+        """
+        if clave in self._sonidos:
+            return self._sonidos[clave]
+        sonido = None
+        if self.disponible and self.recursos is not None:
+            sonido = self.recursos.obtener('sonido', self.efectos[clave].archivo)
+            if sonido is not None:
+                self.bytes_decodificados += self._tamano(sonido)
+        elif self.disponible:
+            ruta = os.path.join(self.directorio, self.efectos[clave].archivo)
+            inicio = perf_counter()
+            try:
+                sonido = pygame.mixer.Sound(ruta)
+            except FileNotFoundError:
+                pass
+            except pygame.error:
+                print(f"No se pudo cargar el sonido {ruta}")
+            else:
+                self.segundos_decodificacion += perf_counter() - inicio
+                self.bytes_decodificados += self._tamano(sonido)
+        self._sonidos[clave] = sonido
+        return sonido
+
+    @staticmethod
+    def _tamano(sonido: pygame.mixer.Sound) -> int:
+        # Muestras en el formato del mezclador: frecuencia x canales x bytes
+        frecuencia, bits, canales = pygame.mixer.get_init()
+        return round(sonido.get_length() * frecuencia) * canales * (abs(bits) // 8)
+
+    def precargar(self, claves: Iterable[str]) -> None:
+        """
+        Decodifica de antemano los efectos indicados (por ejemplo, los que usa
+        un nivel) para que el primer uso no pague la decodificación.
+
+        Args:
+            claves: Nombres de los efectos a decodificar
+        """
+        for clave in claves:
+            if self.recursos is None:
+                self.obtener(clave)
+            elif self.disponible and clave not in self._sonidos:
+                self.recursos.solicitar('sonido', self.efectos[clave].archivo)
+
+    def reproducir(self, clave: str) -> bool:
+        """
+        Reproduce un efecto en uno de los canales de su categoría.
+
+        Args:
+            clave: Nombre del efecto en el catálogo
+
+        Returns:
+            bool: True si ha empezado a sonar; False si se ha ignorado por el
+            intervalo mínimo o no hay sonido
+        """
+        efecto = self.efectos[clave]
+        ahora = self._reloj()
+        ultima = self._ultima_vez.get(clave)
+        if ultima is not None and ahora - ultima < efecto.intervalo_ms:
+            self.omitidos += 1
+            return False
+        sonido = self.obtener(clave)
+        if sonido is None:
+            return False
+        self._ultima_vez[clave] = ahora
+
+        canales = self._canales[efecto.categoria]
+        canal = next((c for c in canales if not c.get_busy()), None)
+        if canal is None:
+            # Todos ocupados: se corta el que empezó antes
+            canal = min(canales, key=lambda c: self._inicio_canal.get(id(c), 0))
+        canal.play(sonido)
+        self._inicio_canal[id(canal)] = ahora
+        return True
+
+    def procesar(self, eventos: Iterable[Tuple[int, object]]) -> None:
+        """
+        Reproduce los efectos de los eventos de un tick de la simulación.
+
+        Args:
+            eventos: Lista ``(tipo, entidad)`` de ``Simulacion.eventos``
+        """
+        if not self.disponible:
+            return
+        for tipo, _ in eventos:
+            clave = EFECTO_EVENTO.get(tipo)
+            if clave is not None:
+                self.reproducir(clave)
+
+    def musica(self, archivo: Optional[str], bucles: int = -1) -> None:
+        """
+        Reproduce una pista de música en streaming desde el disco.
+
+        Pedir la pista que ya suena no la reinicia.
+
+        Args:
+            archivo: Nombre del archivo dentro del directorio, o None para parar
+            bucles: Repeticiones, -1 para repetir sin fin
+        """
+        if not self.disponible or archivo == self._musica:
+            return
+        self._musica = None
+        if archivo is None:
+            pygame.mixer.music.stop()
+            return
+        if archivo in self._pistas_ausentes:
+            return
+        ruta = os.path.join(self.directorio, archivo)
+        # mixer.music.load da pygame.error (no FileNotFoundError) si no existe
+        if not os.path.isfile(ruta):
+            self._pistas_ausentes.add(archivo)
+            return
+        try:
+            pygame.mixer.music.load(ruta)
+        except pygame.error:
+            print(f"No se pudo cargar la música {ruta}")
+            return
+        pygame.mixer.music.play(bucles)
+        self._musica = archivo
+
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Resume el coste del banco para el perfilador.
+
+        Returns:
+            dict: Efectos decodificados, efectos y pistas ausentes,
+            milisegundos de decodificación, kilobytes en memoria y
+            reproducciones omitidas
+        """
+        return {
+            'decodificados': sum(sonido is not None for sonido in self._sonidos.values()),
+            'ausentes': (sum(sonido is None for sonido in self._sonidos.values())
+                         + len(self._pistas_ausentes)),
+            'ms_decodificacion': self.segundos_decodificacion * 1000,
+            'kb': self.bytes_decodificados / 1024,
+            'omitidos': self.omitidos,
+        }
@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+
+class CacheTexto:
+    """
+    Caché LRU de textos ya renderizados.
+
+    ``Font.render`` es de las llamadas más caras de pygame y el HUD y los
+    menús repiten casi siempre los mismos textos. Cada combinación de
+    fuente, texto y color se renderiza una vez y se reutiliza.
+
+    Attributes:
+        tamano_maximo (int): Número máximo de textos en memoria
+    """
+
+    TAMANO_MAXIMO: int = 128
+
+    def __init__(self, tamano_maximo: int = TAMANO_MAXIMO) -> None:
+        self.tamano_maximo = tamano_maximo
+        self._textos: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+
+    def renderizar(self, fuente: pygame.font.Font, texto: str, color: Color) -> pygame.Surface:
+        """
+        Devuelve el texto renderizado con antialias, usando la caché.
+
+        Args:
+            fuente: Fuente con la que renderizar
+            texto: Texto a renderizar
+            color: Color del texto
+
+        Returns:
+            pygame.Surface: Superficie con el texto
+        """
+        clave = (fuente, texto, color)
+        superficie = self._textos.get(clave)
+        if superficie is not None:
+            self._textos.move_to_end(clave)
+            return superficie
+
+        superficie = fuente.render(texto, True, color)
+        self._textos[clave] = superficie
+        if len(self._textos) > self.tamano_maximo:
+            self._textos.popitem(last=False)
+        return superficie
+
+    def limpiar(self) -> None:
+        """Elimina todos los textos cacheados."""
+        self._textos.clear()
+
+    def __len__(self) -> int:
+        return len(self._textos)
+
+
+# Caché compartida por el HUD y las pantallas del juego
+cache_texto = CacheTexto()
+
+
+class BarraHUD:
+    """
+    Barra de HUD compuesta en una superficie propia.
+
+    Cada campo guarda el último valor dibujado y sólo se recompone cuando
+    cambia: se borra su zona con el color de fondo y se vuelven a copiar los
+    campos que la tocan, en el orden en que se crearon, para que los que se
+    solapan queden igual que si se dibujara todo. Dibujar el HUD cada frame
+    es entonces un único ``blit``.
+
+    Attributes:
+        superficie (pygame.Surface): Barra ya compuesta
+        color_fondo (tuple): Color con el que se borran los campos
+        cambios (list): Zonas de la barra modificadas desde el último ``dibujar``
+    """
+
+    def __init__(self, tamano: Tuple[int, int], color_fondo: Color,
+                 cache: CacheTexto = cache_texto) -> None:
+        self.superficie = pygame.Surface(tamano)
+        self.color_fondo = color_fondo
+        self.cache = cache
+        self.superficie.fill(color_fondo)
+        self._campos: Dict[str, Tuple[Any, pygame.Rect, pygame.Surface]] = {}
+        self.cambios: List[pygame.Rect] = []
+
+    def campo(self, nombre: str, valor: Hashable, posicion: Tuple[int, int],
+              componer: Callable[[Any], pygame.Surface]) -> bool:
+        """
+        Actualiza un campo si su valor ha cambiado.
+
+        Args:
+            nombre: Identificador del campo
+            valor: Valor que determina el contenido del campo
+            posicion: Esquina superior izquierda del campo en la barra
+            componer: Función que crea la superficie del campo para un valor
+
+        Returns:
+            bool: True si el campo se ha vuelto a dibujar
+        """
+        anterior = self._campos.get(nombre)
+        if anterior is not None and anterior[0] == valor:
+            return False
+
+        contenido = componer(valor)
+        rect = contenido.get_rect(topleft=posicion)
+        zona = rect.union(anterior[1]) if anterior is not None else rect
+        self._campos[nombre] = (valor, rect, contenido)
+
+        # Sólo se repinta la zona borrada: fuera de ella el antialias de los
+        # textos se mezclaría dos veces
+        self.superficie.set_clip(zona)
+        self.superficie.fill(self.color_fondo)
+        for _, rect_campo, contenido_campo in self._campos.values():
+            if rect_campo.colliderect(zona):
+                self.superficie.blit(contenido_campo, rect_campo)
+        self.superficie.set_clip(None)
+        self.cambios.append(zona)
+        return True
+
+    def texto(self, nombre: str, fuente: pygame.font.Font, texto: str, color: Color,
+              posicion: Tuple[int, int]) -> bool:
+        """
+        Actualiza un campo de texto si su texto o su color han cambiado.
+
+        Args:
+            nombre: Identificador del campo
+            fuente: Fuente del texto
+            texto: Texto a mostrar
+            color: Color del texto
+            posicion: Esquina superior izquierda del texto en la barra
+
+        Returns:
+            bool: True si el campo se ha vuelto a dibujar
+        """
+        return self.campo(nombre, (texto, color), posicion,
+                          lambda valor: self.cache.renderizar(fuente, *valor))
+
+    def dibujar(self, superficie: pygame.Surface, posicion: Tuple[int, int] = (0, 0)) -> pygame.Rect:
+        """
+        Copia la barra compuesta en la superficie de destino.
+
+        Args:
+            superficie: Superficie de destino (la pantalla)
+            posicion: Dónde colocar la barra
+
+        Returns:
+            pygame.Rect: Zona de la pantalla ocupada por la barra
+        """
+        self.cambios.clear()
+        return superficie.blit(self.superficie, posicion)
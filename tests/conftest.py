@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Sin ventana ni audio reales, y con la raíz del proyecto importable aunque
+# se lance ``pytest`` en lugar de ``python -m pytest``
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
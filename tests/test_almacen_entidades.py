@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from Game1 import Simulacion, step
+from src.core import entrada as ent
+from src.core.almacen_entidades import NUMPY_DISPONIBLE
+
+pytestmark = pytest.mark.skipif(not NUMPY_DISPONIBLE, reason="necesita NumPy")
+
+
+def entradas(semilla, ticks):
+    rng = random.Random(semilla)
+    entrada = ent.DERECHA
+    for tick in range(ticks):
+        if tick % 15 == 0:
+            entrada = rng.choice((ent.DERECHA, ent.DERECHA, ent.IZQUIERDA, 0))
+        yield entrada | (ent.SALTO if rng.random() < 0.08 else 0)
+
+
+def estado_visible(simulacion):
+    # Lo que el hash no incluye pero se dibuja: la animación
+    nivel = simulacion.nivel
+    return ([(e.animacion_frame, e.animacion_contador, e.aplastado) for e in nivel.enemigos],
+            [(m.animacion_frame, m.animacion_contador) for m in nivel.monedas])
+
+
+@pytest.mark.parametrize('nivel', [1, 2, 3])
+def test_almacen_igual_que_los_objetos(nivel):
+    objetos = Simulacion(semilla=5, nivel_inicial=nivel)
+    almacen = Simulacion(semilla=5, nivel_inicial=nivel, almacen=True)
+    for tick, entrada in enumerate(entradas(nivel, 1500)):
+        step(objetos, entrada)
+        step(almacen, entrada)
+        assert almacen.hash_estado() == objetos.hash_estado(), f"diverge en el tick {tick}"
+        assert estado_visible(almacen) == estado_visible(objetos), f"diverge en el tick {tick}"
+
+
+def test_almacen_tras_reiniciar_el_nivel():
+    objetos = Simulacion(semilla=1)
+    almacen = Simulacion(semilla=1, almacen=True)
+    for simulacion in (objetos, almacen):
+        for entrada in entradas(9, 300):
+            step(simulacion, entrada)
+        step(simulacion, ent.REINICIAR)
+        for entrada in entradas(10, 300):
+            step(simulacion, entrada)
+    assert almacen.hash_estado() == objetos.hash_estado()
+    assert estado_visible(almacen) == estado_visible(objetos)
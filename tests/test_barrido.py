@@ -0,0 +1,210 @@
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+from src.core.barrido import barrer, desplazamiento, primer_impacto, solapa, tiempo_impacto
+
+
+def plataforma(x, y, ancho, alto):
+    return SimpleNamespace(rect=pygame.Rect(x, y, ancho, alto))
+
+
+# -- desplazamiento -------------------------------------------------------
+
+@pytest.mark.parametrize('posicion, velocidad, esperado', [
+    (100, 0, 0),
+    (100, 3, 3),
+    (100, 0.4, 0),
+    (100, 0.5, 1),
+    (100, 0.6, 1),
+    (100, -0.4, 0),
+    (100, -0.5, 0),
+    (100, -0.6, -1),
+    (100, 15, 15),
+    # Destino -0.5: los medios se alejan de cero, a -1
+    (-3, 2.5, 2),
+    (-3, 2.6, 3),
+])
+def test_desplazamiento_redondea(posicion, velocidad, esperado):
+    assert desplazamiento(posicion, velocidad) == esperado
+
+
+@pytest.mark.parametrize('posicion', [-40, -7, 0, 3, 399, 550])
+@pytest.mark.parametrize('velocidad', [-15, -8.8, -0.8, -0.5, 0, 0.4, 0.5, 0.8, 1.5, 2.5, 7.2, 15])
+def test_desplazamiento_igual_que_pygame(posicion, velocidad):
+    rect = pygame.Rect(0, posicion, 10, 10)
+    rect.y += velocidad
+    assert posicion + desplazamiento(posicion, velocidad) == rect.y
+
+
+# -- tiempo_impacto -------------------------------------------------------
+
+def test_impacto_frontal_por_la_izquierda():
+    rect = pygame.Rect(0, 0, 10, 10)
+    obstaculo = pygame.Rect(20, 0, 10, 10)
+    assert tiempo_impacto(rect, 20, 0, obstaculo) == (0.5, -1, 0)
+
+
+def test_impacto_frontal_por_la_derecha():
+    rect = pygame.Rect(40, 0, 10, 10)
+    obstaculo = pygame.Rect(20, 0, 10, 10)
+    assert tiempo_impacto(rect, -20, 0, obstaculo) == (0.5, 1, 0)
+
+
+def test_impacto_al_caer_y_al_subir():
+    obstaculo = pygame.Rect(0, 50, 100, 20)
+    assert tiempo_impacto(pygame.Rect(10, 30, 10, 10), 0, 20, obstaculo) == (0.5, 0, -1)
+    assert tiempo_impacto(pygame.Rect(10, 80, 10, 10), 0, -20, obstaculo) == (0.5, 0, 1)
+
+
+def test_sin_impacto_si_no_llega():
+    rect = pygame.Rect(0, 0, 10, 10)
+    obstaculo = pygame.Rect(20, 0, 10, 10)
+    # Acaba justo tocando el borde: los rectángulos son semiabiertos
+    assert tiempo_impacto(rect, 10, 0, obstaculo) is None
+    assert tiempo_impacto(rect, 5, 0, obstaculo) is None
+
+
+def test_sin_impacto_si_pasa_por_al_lado():
+    rect = pygame.Rect(0, 0, 10, 10)
+    # Deslizarse pegado a la cara superior del obstáculo no es chocar
+    assert tiempo_impacto(rect, 40, 0, pygame.Rect(20, 10, 10, 10)) is None
+    assert tiempo_impacto(rect, 40, 0, pygame.Rect(20, 30, 10, 10)) is None
+
+
+def test_impacto_no_atraviesa_a_gran_velocidad():
+    # Más rápido que el tamaño de los dos rectángulos juntos
+    rect = pygame.Rect(0, 0, 4, 4)
+    obstaculo = pygame.Rect(50, 0, 4, 4)
+    tiempo, normal_x, normal_y = tiempo_impacto(rect, 200, 0, obstaculo)
+    assert tiempo == pytest.approx(46 / 200)
+    assert (normal_x, normal_y) == (-1, 0)
+
+
+def test_impacto_diagonal_por_el_lado():
+    # Llega antes al lado izquierdo del obstáculo que a su cara superior
+    rect = pygame.Rect(0, 20, 10, 10)
+    obstaculo = pygame.Rect(20, 25, 10, 40)
+    tiempo, normal_x, normal_y = tiempo_impacto(rect, 20, 20, obstaculo)
+    assert tiempo == 0.5
+    assert (normal_x, normal_y) == (-1, 0)
+
+
+def test_esquina_exacta_gana_el_choque_vertical():
+    rect = pygame.Rect(0, 0, 10, 10)
+    obstaculo = pygame.Rect(20, 20, 10, 10)
+    assert tiempo_impacto(rect, 20, 20, obstaculo) == (0.5, 0, -1)
+
+
+def test_esquina_rozada_sin_solape():
+    # La diagonal pasa justo por el vértice del obstáculo sin entrar
+    rect = pygame.Rect(0, 0, 10, 10)
+    obstaculo = pygame.Rect(20, 20, 10, 10)
+    assert tiempo_impacto(rect, 20, -20, obstaculo) is None
+
+
+def test_sin_impacto_si_ya_solapaba():
+    rect = pygame.Rect(0, 0, 10, 10)
+    obstaculo = pygame.Rect(5, 5, 10, 10)
+    assert tiempo_impacto(rect, 3, 0, obstaculo) is None
+    assert tiempo_impacto(rect, 0, 0, obstaculo) is None
+
+
+def test_sin_desplazamiento_no_hay_impacto():
+    rect = pygame.Rect(0, 0, 10, 10)
+    assert tiempo_impacto(rect, 0, 0, pygame.Rect(10, 0, 10, 10)) is None
+    assert tiempo_impacto(rect, 0, 0, pygame.Rect(50, 50, 10, 10)) is None
+
+
+def test_impacto_inmediato_desde_el_contacto():
+    # Empieza tocando el suelo y sigue cayendo: choca al instante
+    rect = pygame.Rect(0, 40, 10, 10)
+    suelo = pygame.Rect(0, 50, 100, 10)
+    assert tiempo_impacto(rect, 0, 5, suelo) == (0.0, 0, -1)
+
+
+# -- primer_impacto -------------------------------------------------------
+
+def test_primer_impacto_elige_el_mas_cercano():
+    lejos = plataforma(60, 0, 10, 10)
+    cerca = plataforma(30, 0, 10, 10)
+    impacto = primer_impacto(pygame.Rect(0, 0, 10, 10), 100, 0, [lejos, cerca])
+    assert impacto.obstaculo is cerca
+    assert impacto.tiempo == pytest.approx(0.2)
+
+
+def test_primer_impacto_a_igual_tiempo_gana_la_primera():
+    a = plataforma(0, 20, 10, 10)
+    b = plataforma(10, 20, 10, 10)
+    impacto = primer_impacto(pygame.Rect(5, 0, 10, 10), 0, 20, [a, b])
+    assert impacto.obstaculo is a
+
+
+def test_primer_impacto_sin_candidatas():
+    assert primer_impacto(pygame.Rect(0, 0, 10, 10), 5, 5, []) is None
+
+
+# -- barrer ----------------------------------------------------------------
+
+def test_barrer_sin_obstaculos_mueve_todo():
+    rect = pygame.Rect(0, 0, 10, 10)
+    assert barrer(rect, 7, -3, [plataforma(100, 100, 10, 10)]) is None
+    assert rect.topleft == (7, -3)
+
+
+def test_barrer_aterriza_sobre_la_plataforma():
+    rect = pygame.Rect(0, 0, 10, 10)
+    suelo = plataforma(-50, 30, 200, 10)
+    impacto = barrer(rect, 0, 40, [suelo])
+    assert impacto.obstaculo is suelo
+    assert (impacto.normal_x, impacto.normal_y) == (0, -1)
+    assert rect.bottom == suelo.rect.top
+    assert rect.x == 0
+
+
+def test_barrer_se_detiene_contra_la_pared():
+    rect = pygame.Rect(0, 0, 10, 10)
+    pared = plataforma(25, -50, 10, 100)
+    barrer(rect, 40, 0, [pared])
+    assert rect.right == pared.rect.left
+    assert rect.y == 0
+
+
+def test_barrer_choque_lateral_avanza_la_parte_entera_del_otro_eje():
+    rect = pygame.Rect(0, 0, 10, 10)
+    pared = plataforma(20, -50, 10, 100)
+    # Toca la pared a mitad de camino: 7 de los 15 píxeles verticales
+    barrer(rect, 20, 15, [pared])
+    assert rect.right == pared.rect.left
+    assert rect.y == 7
+
+
+def test_barrer_en_esquina_queda_encima():
+    rect = pygame.Rect(0, 0, 10, 10)
+    bloque = plataforma(20, 20, 10, 10)
+    impacto = barrer(rect, 20, 20, [bloque])
+    assert impacto.normal_y == -1
+    assert rect.bottom == bloque.rect.top
+    assert rect.x == 10
+
+
+def test_barrer_sin_desplazamiento_no_mueve():
+    rect = pygame.Rect(0, 0, 10, 10)
+    assert barrer(rect, 0, 0, [plataforma(10, 0, 10, 10)]) is None
+    assert rect.topleft == (0, 0)
+
+
+def test_barrer_ya_solapando_no_detecta_el_obstaculo():
+    # El llamador debe comprobarlo antes con ``solapa``
+    rect = pygame.Rect(0, 0, 10, 10)
+    dentro = plataforma(5, 5, 10, 10)
+    assert solapa(rect, [dentro])
+    assert barrer(rect, 0, 4, [dentro]) is None
+    assert rect.topleft == (0, 4)
+
+
+def test_solapa_ignora_bordes_que_se_tocan():
+    rect = pygame.Rect(0, 0, 10, 10)
+    assert not solapa(rect, [plataforma(10, 0, 10, 10), plataforma(0, 10, 10, 10)])
+    assert not solapa(rect, [])
@@ -0,0 +1,169 @@
+import json
+import os
+
+import pytest
+
+from src.core import cargador_niveles
+from src.core.cargador_niveles import VERSION, _CABECERA, cargar_nivel, leer_json
+
+NIVEL = {
+    'ancho_mapa': 3200,
+    'plataformas': [[0, 550, 3200, 50, 'suelo'], [300, 450, 40, 40, 'bloque'],
+                    [1000, 450, 60, 120, 'tubo']],
+    'enemigos': [[600, 520, 'goomba'], [900, 510, 'koopa']],
+    'monedas': [[310, 400], [500, 300, 0.5]],
+    'powerups': [[305, 410, 'hongo']],
+    'bandera': [3100, 250],
+    'fondo': {'cielo': [[60, 90, 200], [150, 180, 255]], 'nubes': 0.4, 'colinas': None},
+}
+
+
+@pytest.fixture
+def niveles(tmp_path):
+    directorio = tmp_path / 'niveles'
+    directorio.mkdir()
+    ruta = directorio / 'nivel_1.json'
+    ruta.write_text(json.dumps(NIVEL), encoding='utf-8')
+    return directorio, tmp_path / 'cache', ruta
+
+
+@pytest.fixture
+def lecturas_json(monkeypatch):
+    # Cuenta las veces que se compila el JSON en lugar de usar la caché
+    lecturas = []
+
+    def leer(ruta):
+        lecturas.append(ruta)
+        return leer_json(ruta)
+
+    monkeypatch.setattr(cargador_niveles, 'leer_json', leer)
+    return lecturas
+
+
+def cargar(niveles):
+    directorio, cache, _ = niveles
+    return cargar_nivel(1, str(directorio), str(cache))
+
+
+def ruta_cache(niveles):
+    return niveles[1] / 'nivel_1.bin'
+
+
+def test_primera_carga_compila_y_guarda_la_cache(niveles, lecturas_json):
+    datos = cargar(niveles)
+    assert len(lecturas_json) == 1
+    assert ruta_cache(niveles).exists()
+    assert datos == leer_json(str(niveles[2]))
+
+
+def test_cache_igual_que_el_json(niveles):
+    compilado = cargar(niveles)
+    desde_cache = cargar(niveles)
+    assert desde_cache == compilado
+    assert list(desde_cache.iter_plataformas())[1] == (300, 450, 40, 40, 'bloque')
+    assert list(desde_cache.iter_monedas())[1] == (500, 300, 0.5)
+    assert desde_cache.bandera == (3100, 250)
+    assert desde_cache.fondo.factor_nubes == 0.4
+    assert desde_cache.fondo.factor_colinas is None
+
+
+def test_json_sin_cambios_usa_la_cache(niveles, lecturas_json):
+    cargar(niveles)
+    cargar(niveles)
+    cargar(niveles)
+    assert len(lecturas_json) == 1
+
+
+def test_json_con_otra_fecha_recompila(niveles, lecturas_json):
+    cargar(niveles)
+    ruta = niveles[2]
+    estado = os.stat(ruta)
+    os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+    cargar(niveles)
+    assert len(lecturas_json) == 2
+    # La caché recompilada vuelve a valer
+    cargar(niveles)
+    assert len(lecturas_json) == 2
+
+
+def test_json_con_otro_tamano_recompila(niveles, lecturas_json):
+    cargar(niveles)
+    ruta = niveles[2]
+    estado = os.stat(ruta)
+    nivel = dict(NIVEL, ancho_mapa=6400)
+    ruta.write_text(json.dumps(nivel, indent=1), encoding='utf-8')
+    # Misma fecha que antes: sólo cambia el tamaño
+    os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns))
+    assert cargar(niveles).ancho_mapa == 6400
+    assert len(lecturas_json) == 2
+
+
+@pytest.mark.parametrize('cortar', [1, 3, 4, 40, _CABECERA.size - 1])
+def test_cache_truncada_vuelve_al_json(niveles, lecturas_json, cortar):
+    esperado = cargar(niveles)
+    cache = ruta_cache(niveles)
+    contenido = cache.read_bytes()
+    cache.write_bytes(contenido[:len(contenido) - cortar])
+    assert cargar(niveles) == esperado
+    assert len(lecturas_json) == 2
+    # Y la deja reparada para la siguiente carga
+    assert cache.read_bytes() == contenido
+
+
+def test_cache_vacia_vuelve_al_json(niveles, lecturas_json):
+    esperado = cargar(niveles)
+    ruta_cache(niveles).write_bytes(b'')
+    assert cargar(niveles) == esperado
+    assert len(lecturas_json) == 2
+
+
+def test_cache_danada_vuelve_al_json(niveles, lecturas_json):
+    esperado = cargar(niveles)
+    cache = ruta_cache(niveles)
+    contenido = bytearray(cache.read_bytes())
+    # Un tipo de plataforma imposible en mitad de los registros
+    contenido[_CABECERA.size + 4 * 4] = 0xFF
+    cache.write_bytes(bytes(contenido))
+    assert cargar(niveles) == esperado
+    assert len(lecturas_json) == 2
+
+
+def test_cache_con_longitudes_danadas_vuelve_al_json(niveles, lecturas_json):
+    esperado = cargar(niveles)
+    cache = ruta_cache(niveles)
+    contenido = bytearray(cache.read_bytes())
+    # Número de plataformas: primer contador tras la bandera
+    contenido[_CABECERA.size - 20] += 1
+    cache.write_bytes(bytes(contenido))
+    assert cargar(niveles) == esperado
+    assert len(lecturas_json) == 2
+
+
+def test_cache_de_otra_version_se_recompila(niveles, lecturas_json):
+    cargar(niveles)
+    cache = ruta_cache(niveles)
+    contenido = bytearray(cache.read_bytes())
+    assert contenido[:4] == b'MNIV'
+    assert int.from_bytes(contenido[4:6], 'little') == VERSION
+    contenido[4:6] = (VERSION - 1).to_bytes(2, 'little')
+    cache.write_bytes(bytes(contenido))
+    cargar(niveles)
+    assert len(lecturas_json) == 2
+    assert int.from_bytes(cache.read_bytes()[4:6], 'little') == VERSION
+
+
+def test_cambiar_la_version_invalida_las_caches(niveles, lecturas_json, monkeypatch):
+    cargar(niveles)
+    monkeypatch.setattr(cargador_niveles, 'VERSION', VERSION + 1)
+    cargar(niveles)
+    assert len(lecturas_json) == 2
+
+
+def test_sin_permiso_de_escritura_funciona_sin_cache(niveles, lecturas_json, monkeypatch):
+    def fallar(*_):
+        raise OSError("solo lectura")
+
+    monkeypatch.setattr(cargador_niveles, '_escribir_cache', fallar)
+    assert cargar(niveles).ancho_mapa == 3200
+    assert cargar(niveles).ancho_mapa == 3200
+    assert len(lecturas_json) == 2
@@ -0,0 +1,158 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.utils.preguntas import BancoPreguntas, CursorPermutacion, Palabra
+from src.utils.quiz_manager import NIVELES, GestorQuiz
+
+
+def vocabulario():
+    # Nivel 1: 'animales' con 12 palabras, 'colores' con 2 y 'numeros' con 1.
+    # Nivel 2: una sola categoría de 3 palabras, menos que sus opciones.
+    palabras = [Palabra(f"animal{i}", '🐾', 'animales', 1) for i in range(12)]
+    palabras += [Palabra('red', '🟥', 'colores', 1), Palabra('blue', '🟦', 'colores', 1),
+                 Palabra('one', '1️⃣', 'numeros', 1)]
+    palabras += [Palabra(f"fruta{i}", '🍎', 'frutas', 2) for i in range(3)]
+    return palabras
+
+
+@pytest.fixture
+def banco():
+    return BancoPreguntas(vocabulario(), semilla=0)
+
+
+# -- CursorPermutacion ------------------------------------------------------
+
+@pytest.mark.parametrize('total', [1, 2, 7, 100])
+def test_cursor_recorre_una_vuelta_sin_repetir(total):
+    cursor = CursorPermutacion(total, random.Random(total))
+    vuelta = [cursor.siguiente() for _ in range(total)]
+    assert sorted(vuelta) == list(range(total))
+    assert cursor.restantes == 0
+    assert cursor.vueltas == 0
+
+
+def test_cursor_segunda_vuelta_sin_repetir():
+    total = 50
+    cursor = CursorPermutacion(total, random.Random(3))
+    primera = [cursor.siguiente() for _ in range(total)]
+    segunda = [cursor.siguiente() for _ in range(total)]
+    assert cursor.vueltas == 1
+    assert sorted(segunda) == list(range(total))
+    # Cada vuelta sale en otro orden
+    assert segunda != primera
+
+
+def test_cursor_restantes_cuenta_hacia_atras():
+    cursor = CursorPermutacion(5, random.Random(0))
+    restantes = []
+    for _ in range(6):
+        cursor.siguiente()
+        restantes.append(cursor.restantes)
+    assert restantes == [4, 3, 2, 1, 0, 4]
+
+
+def test_cursor_rechaza_grupos_vacios():
+    with pytest.raises(ValueError):
+        CursorPermutacion(0, random.Random(0))
+
+
+# -- BancoPreguntas.distractores --------------------------------------------
+
+def test_grupos_indexados(banco):
+    assert len(banco.grupo(1)) == 15
+    assert len(banco.grupo(1, 'colores')) == 2
+    assert len(banco.grupo(3)) == 0
+    assert sorted(banco.categorias(1)) == ['animales', 'colores', 'numeros']
+
+
+def test_palabras_repetidas_se_descartan():
+    banco = BancoPreguntas([Palabra('cat', '🐱', 'animales', 1), Palabra('cat', '🐈', 'animales', 2)])
+    assert len(banco) == 1
+
+
+@pytest.mark.parametrize('cantidad', [1, 2, 4, 7])
+def test_distractores_sin_la_respuesta_ni_duplicados(banco, cantidad):
+    for identificador in banco.grupo(1):
+        distractores = banco.distractores(identificador, cantidad)
+        assert len(distractores) == cantidad
+        assert identificador not in distractores
+        assert len(set(distractores)) == cantidad
+        assert all(banco.palabras[i].nivel == 1 for i in distractores)
+
+
+def test_distractores_prefieren_la_misma_categoria(banco):
+    for identificador in banco.grupo(1, 'animales'):
+        distractores = banco.distractores(identificador, 4)
+        assert {banco.palabras[i].categoria for i in distractores} == {'animales'}
+
+
+def test_categoria_menor_que_las_opciones_completa_con_el_nivel(banco):
+    # 'colores' sólo tiene otra palabra: el resto sale de todo el nivel 1
+    for identificador in banco.grupo(1, 'colores'):
+        distractores = banco.distractores(identificador, 5)
+        assert len(distractores) == 5
+        assert identificador not in distractores
+        assert len(set(distractores)) == 5
+        categorias = Counter(banco.palabras[i].categoria for i in distractores)
+        assert categorias['colores'] == 1
+        # La otra palabra de la categoría va primero
+        assert banco.palabras[distractores[0]].categoria == 'colores'
+
+    # 'numeros' no tiene ninguna otra palabra
+    (uno,) = banco.grupo(1, 'numeros')
+    distractores = banco.distractores(uno, 3)
+    assert len(set(distractores)) == 3 and uno not in distractores
+
+
+def test_nivel_menor_que_las_opciones_devuelve_los_que_hay(banco):
+    for identificador in banco.grupo(2):
+        distractores = banco.distractores(identificador, NIVELES[2].opciones - 1)
+        assert sorted(distractores) == sorted(set(banco.grupo(2)) - {identificador})
+
+
+# -- GestorQuiz --------------------------------------------------------------
+
+def test_gestor_no_repite_hasta_agotar_y_sigue_otra_vuelta(banco):
+    gestor = GestorQuiz(banco, nivel=1, semilla=0)
+    total = len(banco.grupo(1))
+    primera = [gestor.nueva_pregunta().palabra.ingles for _ in range(total)]
+    assert len(set(primera)) == total
+    assert gestor.restantes() == 0
+    segunda = [gestor.nueva_pregunta().palabra.ingles for _ in range(total)]
+    assert sorted(segunda) == sorted(primera)
+
+
+def test_gestor_opciones_validas(banco):
+    gestor = GestorQuiz(banco, nivel=1, categoria='colores', semilla=0)
+    for _ in range(10):
+        pregunta = gestor.nueva_pregunta()
+        assert len(pregunta.opciones) == NIVELES[1].opciones
+        assert len(set(pregunta.opciones)) == len(pregunta.opciones)
+        assert pregunta.opciones[pregunta.correcta] == pregunta.palabra.ingles
+        assert pregunta.palabra.categoria == 'colores'
+
+
+def test_gestor_nivel_con_menos_palabras_que_opciones(banco):
+    gestor = GestorQuiz(banco, nivel=2, semilla=0)
+    pregunta = gestor.nueva_pregunta()
+    assert sorted(pregunta.opciones) == ['fruta0', 'fruta1', 'fruta2']
+    assert pregunta.opciones[pregunta.correcta] == pregunta.palabra.ingles
+
+
+def test_gestor_conserva_la_vuelta_al_cambiar_de_nivel(banco):
+    gestor = GestorQuiz(banco, nivel=1, semilla=0)
+    vistas = {gestor.nueva_pregunta().palabra.ingles for _ in range(5)}
+    gestor.cambiar_nivel(2)
+    gestor.nueva_pregunta()
+    gestor.cambiar_nivel(1)
+    resto = {gestor.nueva_pregunta().palabra.ingles for _ in range(len(banco.grupo(1)) - 5)}
+    assert not vistas & resto
+    assert len(vistas | resto) == len(banco.grupo(1))
+
+
+def test_gestor_sin_palabras_en_el_grupo(banco):
+    gestor = GestorQuiz(banco, nivel=3)
+    with pytest.raises(ValueError):
+        gestor.nueva_pregunta()
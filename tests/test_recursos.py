@@ -0,0 +1,60 @@
+import pygame
+import pytest
+
+from src.utils.recursos import GestorRecursos
+
+
+@pytest.fixture
+def carpetas(tmp_path):
+    sprites = tmp_path / 'sprites'
+    sprites.mkdir()
+    imagen = pygame.Surface((8, 4), pygame.SRCALPHA)
+    imagen.fill((10, 20, 30, 255))
+    pygame.image.save(imagen, str(sprites / 'bloque.png'))
+    return {'imagen': str(sprites)}, tmp_path / 'cache'
+
+
+def cargar(carpetas):
+    directorios, cache = carpetas
+    gestor = GestorRecursos(str(cache), hilos=1, directorios=directorios)
+    imagen = gestor.obtener('imagen', 'bloque.png')
+    gestor.cerrar()
+    return gestor, imagen
+
+
+def convertidos(carpetas):
+    return [ruta for ruta in carpetas[1].iterdir() if ruta.suffix == '.bin']
+
+
+def test_segunda_carga_sale_del_convertido(carpetas):
+    primero, _ = cargar(carpetas)
+    segundo, imagen = cargar(carpetas)
+    assert primero.desde_cache == 0
+    assert segundo.desde_cache == 1
+    assert imagen.get_at((0, 0)) == (10, 20, 30, 255)
+
+
+@pytest.mark.parametrize('datos', [b'', b'\x00' * 5])
+def test_convertido_danado_vuelve_al_original(carpetas, capsys, datos):
+    cargar(carpetas)
+    convertido, = convertidos(carpetas)
+    contenido = convertido.read_bytes()
+    convertido.write_bytes(datos)
+
+    gestor, imagen = cargar(carpetas)
+    assert capsys.readouterr().out == ''
+    assert gestor.desde_cache == 0
+    assert gestor.ausentes == 0
+    assert imagen.get_size() == (8, 4)
+    # Y lo deja reescrito para la siguiente carga
+    assert convertido.read_bytes() == contenido
+    assert cargar(carpetas)[0].desde_cache == 1
+
+
+def test_archivo_que_falta_se_cuenta_sin_avisar(carpetas, capsys):
+    directorios, cache = carpetas
+    gestor = GestorRecursos(str(cache), hilos=1, directorios=directorios)
+    assert gestor.obtener('imagen', 'no_existe.png') is None
+    gestor.cerrar()
+    assert capsys.readouterr().out == ''
+    assert gestor.ausentes == 1
@@ -0,0 +1,134 @@
+import struct
+
+import pytest
+
+from Game1 import Simulacion, step
+from src.core import entrada as ent
+from src.core.repeticion import (
+    FIRMA, VERSION, DivergenciaRepeticion, Grabador, Repeticion, verificar,
+)
+
+SEMILLA = 7
+TICKS = 120
+INTERVALO = 30
+
+
+def entrada_tick(tick):
+    return ent.DERECHA | (ent.SALTO if tick % 40 == 5 else 0)
+
+
+def grabar(semilla=SEMILLA, ticks=TICKS, intervalo=INTERVALO):
+    estado = Simulacion(semilla)
+    grabador = Grabador(semilla, intervalo_hash=intervalo)
+    for tick in range(ticks):
+        entrada = entrada_tick(tick)
+        step(estado, entrada)
+        grabador.registrar(entrada, estado)
+    return grabador.repeticion
+
+
+def test_guardar_y_cargar_conserva_todo(tmp_path):
+    repeticion = Repeticion(123456, nivel_inicial=2, intervalo_hash=4, mascaras=True)
+    repeticion.entradas.extend([0, 2, 6, 1, 5, 8, 16, 0, 2])
+    repeticion.hashes.extend([0xDEADBEEF, 1])
+    ruta = tmp_path / 'partida.mrep'
+    repeticion.guardar(str(ruta))
+
+    cargada = Repeticion.cargar(str(ruta))
+    assert cargada.semilla == 123456
+    assert cargada.nivel_inicial == 2
+    assert cargada.intervalo_hash == 4
+    assert cargada.mascaras is True
+    assert cargada.entradas == repeticion.entradas
+    assert list(cargada.hashes) == [0xDEADBEEF, 1]
+
+
+def test_formato_de_la_cabecera(tmp_path):
+    # Cambiar este formato deja de leer las repeticiones ya grabadas
+    repeticion = Repeticion(0x01020304, nivel_inicial=3, intervalo_hash=2)
+    repeticion.entradas.extend([2, 6])
+    repeticion.hashes.append(0xAABBCCDD)
+    ruta = tmp_path / 'partida.mrep'
+    repeticion.guardar(str(ruta))
+
+    assert ruta.read_bytes() == (
+        b'MREP'
+        + VERSION.to_bytes(2, 'little')
+        + bytes([3, 0])
+        + bytes([4, 3, 2, 1])
+        + (2).to_bytes(4, 'little')
+        + (2).to_bytes(2, 'little')
+        + bytes([2, 6])
+        + bytes([0xDD, 0xCC, 0xBB, 0xAA])
+    )
+
+
+def test_cargar_repeticion_sin_opciones(tmp_path):
+    # Las repeticiones anteriores al byte de opciones lo tenían a cero
+    ruta = tmp_path / 'antigua.mrep'
+    ruta.write_bytes(struct.pack('<4sHBBIIH', FIRMA, VERSION, 1, 0, 42, 0, 60))
+    repeticion = Repeticion.cargar(str(ruta))
+    assert repeticion.semilla == 42
+    assert repeticion.mascaras is False
+    assert len(repeticion) == 0
+
+
+def test_cargar_rechaza_ficheros_invalidos(tmp_path):
+    repeticion = grabar()
+    ruta = tmp_path / 'partida.mrep'
+    repeticion.guardar(str(ruta))
+    datos = ruta.read_bytes()
+
+    truncada = tmp_path / 'truncada.mrep'
+    truncada.write_bytes(datos[:-3])
+    with pytest.raises(ValueError):
+        Repeticion.cargar(str(truncada))
+
+    cabecera = tmp_path / 'cabecera.mrep'
+    cabecera.write_bytes(datos[:10])
+    with pytest.raises(ValueError):
+        Repeticion.cargar(str(cabecera))
+
+    ajena = tmp_path / 'ajena.mrep'
+    ajena.write_bytes(b'XREP' + datos[4:])
+    with pytest.raises(ValueError):
+        Repeticion.cargar(str(ajena))
+
+
+def test_cargar_rechaza_intervalo_cero(tmp_path):
+    ruta = tmp_path / 'intervalo.mrep'
+    ruta.write_bytes(struct.pack('<4sHBBIIH', FIRMA, VERSION, 1, 0, 42, 3, 0) + bytes(3))
+    with pytest.raises(ValueError, match="intervalo"):
+        Repeticion.cargar(str(ruta))
+
+
+@pytest.mark.parametrize('intervalo', [0, -1])
+def test_grabador_rechaza_intervalo_no_positivo(intervalo):
+    with pytest.raises(ValueError):
+        Grabador(SEMILLA, intervalo_hash=intervalo)
+
+
+def test_hashes_de_una_partida_conocida():
+    # Si cambia hash_estado (o la simulación) las repeticiones grabadas
+    # dejarán de verificarse: este test lo hace visible
+    repeticion = grabar()
+    assert list(repeticion.hashes) == [1589496760, 1970485251, 934021983, 789320789]
+
+
+def test_verificar_una_partida_grabada(tmp_path):
+    ruta = tmp_path / 'partida.mrep'
+    grabar().guardar(str(ruta))
+    repeticion = Repeticion.cargar(str(ruta))
+    assert verificar(Simulacion(repeticion.semilla), repeticion, step) == TICKS
+
+
+def test_verificar_detecta_una_entrada_alterada():
+    repeticion = grabar()
+    # Pausar en el tick 35 congela la partida antes del hash del tick 60
+    repeticion.entradas[35] |= ent.PAUSA
+    with pytest.raises(DivergenciaRepeticion) as error:
+        verificar(Simulacion(repeticion.semilla), repeticion, step)
+    assert error.value.tick == 2 * INTERVALO
+    assert error.value.esperado == repeticion.hashes[1]
+    assert error.value.obtenido != error.value.esperado
+
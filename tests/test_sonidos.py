@@ -0,0 +1,31 @@
+import pytest
+
+from src.utils.sonidos import BancoSonidos
+
+
+@pytest.fixture
+def banco(tmp_path):
+    banco = BancoSonidos(directorio=str(tmp_path))
+    if not banco.disponible:
+        pytest.skip("sin mezclador de audio")
+    return banco
+
+
+def test_musica_que_falta_se_cuenta_sin_avisar(banco, capsys):
+    banco.musica('nivel.mp3')
+    banco.musica('nivel.mp3')
+    assert capsys.readouterr().out == ''
+    assert banco.estadisticas()['ausentes'] == 1
+
+
+def test_musica_que_no_se_puede_decodificar_avisa(banco, tmp_path, capsys):
+    (tmp_path / 'nivel.mp3').write_bytes(b'no es audio')
+    banco.musica('nivel.mp3')
+    assert 'No se pudo cargar la música' in capsys.readouterr().out
+    assert banco.estadisticas()['ausentes'] == 0
+
+
+def test_efecto_que_falta_se_cuenta_sin_avisar(banco, capsys):
+    assert banco.reproducir('salto') is False
+    assert capsys.readouterr().out == ''
+    assert banco.estadisticas()['ausentes'] == 1
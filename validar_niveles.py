@@ -0,0 +1,366 @@
+"""
+Valida todos los niveles sin ventana.
+
+Para cada nivel hace cuatro cosas:
+
+1. Comprobaciones estáticas de la geometría: enemigos o monedas que
+   aparecen dentro de una plataforma y bandera fuera del mapa (errores), y
+   enemigos con sólo los pies hundidos en la plataforma sobre la que están,
+   plataformas que se solapan (salvo tubos plantados en el suelo) o
+   power-ups que ningún bloque suelta (avisos).
+2. Alcanzabilidad: desde la posición inicial explora en anchura todas las
+   posiciones en las que Mario puede quedar de pie, probando saltos y pasos
+   con la física real del juego (``GRAVEDAD``, ``FUERZA_SALTO``, colisiones
+   con las plataformas; sin enemigos). Las monedas que no toca ninguna
+   trayectoria son inalcanzables, y si ninguna toca la bandera el nivel no
+   se puede completar.
+3. Recorrido guiado: si la bandera se alcanza, la cadena de maniobras que
+   lleva hasta ella se reproduce en la simulación completa (bloques,
+   power-ups, carga por chunks, tiempo). Sin enemigos debe terminar el nivel,
+   o la exploración no se corresponde con el juego (error); con enemigos se
+   anota dónde muere, porque la ruta no los esquiva (aviso).
+4. Partidas automáticas con entradas aleatorias (sesgadas hacia la derecha y
+   con saltos), una por semilla, que miden qué parte del mapa recorren de
+   media.
+
+Cada análisis y cada partida es una tarea independiente que se reparte en un
+``multiprocessing.Pool``. Sale con código 1 si algún nivel tiene errores
+(geometría inválida o bandera inalcanzable), para poder usarlo en CI.
+
+Uso:
+    python validar_niveles.py [--niveles 1 3] [--semillas N] [--ticks N]
+                              [--procesos N] [--json RUTA]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from Game1 import ALTO, Mario, Nivel, Simulacion
+from src.core import entrada as ent
+from src.core import eventos as ev
+from src.core.cargador_niveles import contar_niveles
+
+# Posición inicial de Mario en todos los niveles
+INICIO = (50, 400)
+# Las posiciones de pie se agrupan en columnas de este ancho al explorar
+RESOLUCION = 16
+# Profundidad máxima, en píxeles, a la que un enemigo puede tener los pies
+# dentro de la plataforma en la que está de pie para contar como aviso
+HUNDIMIENTO_TOLERADO = 16
+# Ticks máximos de una maniobra antes de darla por perdida
+LIMITE_MANIOBRA = 120
+# (entrada, tick en que se empieza a mantener, tick en que se suelta o None
+# para mantenerla hasta aterrizar, salta). Los saltos con la dirección
+# retrasada suben en vertical antes de avanzar, para no golpear con la cabeza
+# los bloques que haya justo encima.
+MANIOBRAS = (
+    (ent.DERECHA, 0, None, True),
+    (ent.IZQUIERDA, 0, None, True),
+    (0, 0, None, True),
+    (ent.DERECHA, 0, 8, True),
+    (ent.IZQUIERDA, 0, 8, True),
+    (ent.DERECHA, 12, None, True),
+    (ent.IZQUIERDA, 12, None, True),
+    (ent.DERECHA, 0, 4, False),
+    (ent.IZQUIERDA, 0, 4, False),
+)
+# Maniobra con la que se llega al suelo desde la posición inicial
+CAIDA = (0, 0, None, False)
+
+
+def solapes(rects_a, rects_b, misma_lista=False):
+    # Parejas (i, j) de rectángulos que se solapan; con misma_lista sólo i < j
+    parejas = []
+    for i, rect in enumerate(rects_a):
+        for j in rect.collidelistall(rects_b):
+            if not misma_lista or i < j:
+                parejas.append((i, j))
+    return parejas
+
+
+def comprobar_geometria(nivel):
+    plataformas = [p.rect for p in nivel.plataformas]
+    errores = []
+    avisos = []
+    for i, j in solapes(plataformas, plataformas, misma_lista=True):
+        # Los tubos se plantan dentro del suelo a propósito
+        if {nivel.plataformas[i].tipo, nivel.plataformas[j].tipo} != {'tubo', 'suelo'}:
+            avisos.append(f"las plataformas {i} y {j} se solapan")
+    enemigos = [e.rect for e in nivel.reserva_enemigos]
+    for i, j in solapes(enemigos, plataformas):
+        hundido = enemigos[i].bottom - plataformas[j].top
+        if enemigos[i].top < plataformas[j].top and hundido <= HUNDIMIENTO_TOLERADO:
+            # Los enemigos no tienen gravedad: el primer update no lo asienta,
+            # lo empuja de lado hasta el borde de la plataforma
+            avisos.append(f"el enemigo {i} tiene los pies {hundido} px dentro de la plataforma {j}")
+        else:
+            errores.append(f"el enemigo {i} aparece dentro de la plataforma {j}")
+    for i, j in solapes([m.rect for m in nivel.reserva_monedas], plataformas):
+        errores.append(f"la moneda {i} está dentro de la plataforma {j}")
+
+    enlazados = {p for powerups in nivel.powerups_bloque.values() for p in powerups}
+    for i, powerup in enumerate(nivel.reserva_powerups):
+        if powerup not in enlazados:
+            avisos.append(f"ningún bloque suelta el power-up {i}")
+
+    if nivel.bandera is None:
+        errores.append("el nivel no tiene bandera")
+    elif not 0 <= nivel.bandera.rect.x < nivel.ancho_mapa:
+        errores.append("la bandera está fuera del mapa")
+    return errores, avisos
+
+
+def entrada_maniobra(tick, entrada, desde, hasta, salta):
+    # Máscara de entrada del tick dado de una maniobra
+    mantenida = entrada if desde <= tick and (hasta is None or tick < hasta) else 0
+    return mantenida | (ent.SALTO if salta and tick == 0 else 0)
+
+
+def maniobra_terminada(mario, tick, desde, hasta):
+    # Una maniobra termina al aterrizar después de soltar la entrada
+    return not mario.saltando and tick >= desde and (hasta is None or tick >= hasta)
+
+
+def maniobra(mario, rejilla, x, y, entrada, desde, hasta, salta, monedas, alcanzadas, bandera):
+    # Ejecuta una maniobra desde una posición de pie. Anota las monedas que toca
+    # y devuelve (posición de pie final o None, si ha tocado la bandera).
+    mario.reiniciar(x, y)
+    if salta:
+        mario.saltar()
+    toca_bandera = False
+    for tick in range(LIMITE_MANIOBRA):
+        mario.update(rejilla, entrada_maniobra(tick, entrada, desde, hasta, salta))
+        rect = mario.rect
+        for indice in rect.collidelistall(monedas):
+            alcanzadas.add(indice)
+        if bandera is not None and rect.colliderect(bandera):
+            toca_bandera = True
+        if rect.y > ALTO:
+            return None, toca_bandera
+        if maniobra_terminada(mario, tick, desde, hasta):
+            return (rect.x, rect.y), toca_bandera
+    return None, toca_bandera
+
+
+def reconstruir_ruta(padres, posicion):
+    # Maniobras desde la posición inicial hasta la dada, en orden
+    ruta = []
+    while padres[posicion] is not None:
+        posicion, indice = padres[posicion]
+        ruta.append(MANIOBRAS[indice])
+    ruta.append(CAIDA)
+    ruta.reverse()
+    return ruta
+
+
+def analizar_alcance(nivel):
+    # Búsqueda en anchura sobre las posiciones de pie alcanzables
+    mario = Mario(*INICIO)
+    rejilla = nivel.rejilla
+    monedas = [m.rect for m in nivel.reserva_monedas]
+    bandera = nivel.bandera.rect if nivel.bandera else None
+    alcanzadas = set()
+    bandera_alcanzada = False
+
+    # Primero cae desde la posición inicial hasta el suelo
+    inicio, _ = maniobra(mario, rejilla, *INICIO, *CAIDA, monedas, alcanzadas, bandera)
+    if inicio is None:
+        return {'posiciones': 0, 'monedas_inalcanzables': list(range(len(monedas))),
+                'bandera_alcanzable': False, 'x_maxima': INICIO[0], 'ruta': None}
+
+    vistas = {(inicio[0] // RESOLUCION, inicio[1])}
+    # De qué posición y con qué maniobra se llegó por primera vez a cada una
+    padres = {inicio: None}
+    ruta = None
+    pendientes = deque([inicio])
+    x_maxima = inicio[0]
+    while pendientes:
+        x, y = pendientes.popleft()
+        for indice, (entrada, desde, hasta, salta) in enumerate(MANIOBRAS):
+            destino, toca = maniobra(mario, rejilla, x, y, entrada, desde, hasta, salta,
+                                     monedas, alcanzadas, bandera)
+            if toca and ruta is None:
+                # La búsqueda es en anchura: es la ruta con menos maniobras
+                ruta = reconstruir_ruta(padres, (x, y)) + [MANIOBRAS[indice]]
+            bandera_alcanzada |= toca
+            if destino is None or not -mario.ancho < destino[0] < nivel.ancho_mapa:
+                continue
+            clave = (destino[0] // RESOLUCION, destino[1])
+            if clave not in vistas:
+                vistas.add(clave)
+                padres[destino] = ((x, y), indice)
+                pendientes.append(destino)
+                x_maxima = max(x_maxima, destino[0])
+
+    return {
+        'posiciones': len(vistas),
+        'monedas_inalcanzables': sorted(set(range(len(monedas))) - alcanzadas),
+        'bandera_alcanzable': bandera_alcanzada,
+        'x_maxima': x_maxima,
+        'ruta': ruta,
+    }
+
+
+def recorrido_guiado(numero, ruta, enemigos=True):
+    # Reproduce la ruta de maniobras en la simulación completa. Cada maniobra
+    # dura lo mismo que en el análisis porque termina con la misma condición.
+    simulacion = Simulacion(semilla=0, nivel_inicial=numero)
+    if not enemigos:
+        for enemigo in simulacion.nivel.reserva_enemigos:
+            enemigo.vivo = False
+    mario = simulacion.mario
+    ticks = 0
+    for paso, (entrada, desde, hasta, salta) in enumerate(ruta):
+        for tick in range(LIMITE_MANIOBRA):
+            # Al morir el nivel se reinicia: se anota dónde estaba antes
+            x = mario.rect.x
+            simulacion.paso(entrada_maniobra(tick, entrada, desde, hasta, salta))
+            ticks += 1
+            if simulacion.nivel.completado:
+                return {'completado': True, 'ticks': ticks, 'maniobra': paso, 'x': mario.rect.x}
+            for tipo, causa in simulacion.eventos:
+                if tipo == ev.MARIO_MUERTO:
+                    return {'completado': False, 'ticks': ticks, 'maniobra': paso, 'x': x,
+                            'causa': getattr(causa, 'tipo', 'caída o tiempo')}
+            if maniobra_terminada(mario, tick, desde, hasta):
+                break
+    # Sin morir, pero la ruta se ha desviado (al crecer Mario, por ejemplo)
+    return {'completado': False, 'ticks': ticks, 'maniobra': len(ruta), 'x': mario.rect.x,
+            'causa': 'ruta desviada'}
+
+
+def describir_recorrido(recorrido, ruta):
+    return (f"{recorrido['causa']} en x={recorrido['x']}, "
+            f"maniobra {recorrido['maniobra']} de {len(ruta)}")
+
+
+def tarea_analisis(numero):
+    inicio = time.perf_counter()
+    nivel = Nivel(numero)
+    errores, avisos = comprobar_geometria(nivel)
+    alcance = analizar_alcance(nivel)
+    guiado = None
+    if not alcance['bandera_alcanzable']:
+        errores.append("la bandera no se puede alcanzar")
+    else:
+        ruta = alcance['ruta']
+        guiado = {'sin_enemigos': recorrido_guiado(numero, ruta, enemigos=False),
+                  'con_enemigos': recorrido_guiado(numero, ruta)}
+        if not guiado['sin_enemigos']['completado']:
+            errores.append("la ruta a la bandera no termina el nivel en el juego: "
+                           + describir_recorrido(guiado['sin_enemigos'], ruta))
+        if not guiado['con_enemigos']['completado']:
+            # Los enemigos se pueden esquivar, pero esta ruta no lo intenta
+            avisos.append("la ruta a la bandera no sobrevive a los enemigos: "
+                          + describir_recorrido(guiado['con_enemigos'], ruta))
+    for indice in alcance['monedas_inalcanzables']:
+        avisos.append(f"la moneda {indice} no se puede alcanzar")
+    return numero, {'errores': errores, 'avisos': avisos, 'alcance': alcance, 'guiado': guiado,
+                    'segundos': time.perf_counter() - inicio}
+
+
+def tarea_partida(argumentos):
+    numero, semilla, ticks = argumentos
+    simulacion = Simulacion(semilla=semilla, nivel_inicial=numero)
+    rng = random.Random(semilla)
+    x_maxima = simulacion.mario.rect.x
+    entrada = ent.DERECHA
+    for tick in range(ticks):
+        # Cambia de intención cada pocos ticks, casi siempre hacia la derecha
+        if tick % 10 == 0:
+            entrada = ent.DERECHA if rng.random() < 0.8 else (ent.IZQUIERDA if rng.random() < 0.5 else 0)
+        simulacion.paso(entrada | (ent.SALTO if rng.random() < 0.1 else 0))
+        if simulacion.nivel_actual != numero or simulacion.game_over:
+            break
+        x_maxima = max(x_maxima, simulacion.mario.rect.x)
+        if simulacion.nivel.completado:
+            break
+    return numero, {
+        'cobertura': min(1.0, x_maxima / simulacion.nivel.ancho_mapa),
+        'muertes': 3 - simulacion.vidas,
+        'ticks': tick + 1,
+    }
+
+
+def validar(niveles, semillas, ticks, procesos):
+    partidas = [(numero, semilla, ticks) for numero in niveles for semilla in range(semillas)]
+    resultados = {numero: {'partidas': []} for numero in niveles}
+    with Pool(procesos) as pool:
+        # Los análisis son las tareas largas: se encolan primero
+        analisis = pool.imap_unordered(tarea_analisis, niveles)
+        for numero, partida in pool.imap_unordered(tarea_partida, partidas, chunksize=4):
+            resultados[numero]['partidas'].append(partida)
+        for numero, resultado in analisis:
+            resultados[numero].update(resultado)
+        # Cierre ordenado: SDL captura SIGTERM en los procesos hijos, así que el
+        # terminate() de salir del with los dejaría colgados
+        pool.close()
+        pool.join()
+    return resultados
+
+
+def terminado(guiado, modo):
+    if guiado is None:
+        return '-'
+    return 'sí' if guiado[modo]['completado'] else 'NO'
+
+
+def imprimir(resultados):
+    print(f"{'nivel':>5} {'errores':>8} {'avisos':>7} {'posiciones':>10} {'bandera':>8} "
+          f"{'guiado':>7} {'enemigos':>9} {'cobertura':>10} {'análisis (s)':>13}")
+    for numero, resultado in sorted(resultados.items()):
+        partidas = resultado['partidas']
+        guiado = resultado['guiado']
+        cobertura = sum(p['cobertura'] for p in partidas) / max(1, len(partidas))
+        print(f"{numero:>5} {len(resultado['errores']):>8} {len(resultado['avisos']):>7} "
+              f"{resultado['alcance']['posiciones']:>10} "
+              f"{'sí' if resultado['alcance']['bandera_alcanzable'] else 'NO':>8} "
+              f"{terminado(guiado, 'sin_enemigos'):>7} {terminado(guiado, 'con_enemigos'):>9} "
+              f"{cobertura:>10.0%} {resultado['segundos']:>13.2f}")
+    for numero, resultado in sorted(resultados.items()):
+        for mensaje in resultado['errores']:
+            print(f"nivel {numero}: ERROR: {mensaje}")
+        for mensaje in resultado['avisos']:
+            print(f"nivel {numero}: aviso: {mensaje}")
+
+
+def entero_positivo(texto):
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1: {texto}")
+    return valor
+
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--niveles', type=int, nargs='+',
+                        help="números de nivel a validar (por defecto, todos)")
+    parser.add_argument('--semillas', type=entero_positivo, default=16,
+                        help="partidas aleatorias por nivel")
+    parser.add_argument('--ticks', type=entero_positivo, default=3600,
+                        help="duración máxima de cada partida")
+    parser.add_argument('--procesos', type=entero_positivo, default=None,
+                        help="procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument('--json', metavar='RUTA', help="guarda el informe completo en JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parsear_argumentos()
+    niveles = args.niveles or list(range(1, contar_niveles() + 1))
+    inicio = time.perf_counter()
+    resultados = validar(niveles, args.semillas, args.ticks, args.procesos)
+    imprimir(resultados)
+    print(f"{len(niveles)} niveles validados en {time.perf_counter() - inicio:.1f} s")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fichero:
+            json.dump(resultados, fichero, indent=1, ensure_ascii=False)
+    sys.exit(1 if any(resultado['errores'] for resultado in resultados.values()) else 0)